@@ -1,17 +1,21 @@
 import json
 import os
+import re
+import time
 from abc import abstractmethod
 from copy import deepcopy
-from typing import Callable, List, Optional, Protocol, Tuple
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
+import torch
 from multiprocess.pool import Pool
 from tqdm import tqdm
 
 import bofire.strategies.api as strategies
 from bofire.data_models.domain.api import Domain
 from bofire.data_models.strategies.api import AnyStrategy
+from bofire.strategies.strategy import Strategy
 
 
 class Benchmark:
@@ -42,6 +46,120 @@ class StrategyFactory(Protocol):
         ...
 
 
+def _load_checkpoint(log_file: str) -> List[Dict[str, Any]]:
+    """Loads the records of a run from its log file.
+
+    A last line which was only partially written, e.g. due to a crash, is dropped and the
+    log file is rewritten without it, so that new records can be appended.
+
+    Args:
+        log_file (str): Path to the JSONL log file of the run.
+
+    Returns:
+        List[Dict[str, Any]]: One record per logged iteration.
+    """
+    if not os.path.exists(log_file):
+        return []
+    records = []
+    with open(log_file, "r") as f:
+        lines = f.readlines()
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            break
+    if len(records) < len(lines):
+        with open(log_file, "w") as f:
+            f.writelines(lines[: len(records)])
+    return records
+
+
+def _append_record(log_file: str, record: Dict[str, Any]):
+    """Appends a record as one line to the JSONL log file of a run.
+
+    Args:
+        log_file (str): Path to the JSONL log file of the run.
+        record (Dict[str, Any]): Record to be appended.
+    """
+    # floats are written with their shortest exact representation, so that a resumed
+    # run continues from exactly the same experiments
+    with open(log_file, "a") as f:
+        f.write(json.dumps(record, default=str) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_log(log_file: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Reads the log file of a benchmark run.
+
+    Args:
+        log_file (str): Path to the JSONL log file of the run.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The experiments of the run and a dataframe with the
+            metric value and the wall times of ask and tell per iteration.
+    """
+    records = _load_checkpoint(log_file)
+    experiments = pd.concat(
+        [pd.DataFrame.from_records(r["experiments"]) for r in records],
+        ignore_index=True,
+    )
+    iterations = pd.DataFrame.from_records(
+        [
+            {k: v for k, v in r.items() if k != "experiments"}
+            for r in records
+            if r["iteration"] >= 0
+        ],
+        columns=["iteration", "metric", "ask_time", "tell_time"],
+    )
+    return experiments, iterations
+
+
+def _seed_iteration(strategy: Strategy, seed: int, iteration: int, tell: bool):
+    """Seeds numpy, torch and the random number generators of the strategy.
+
+    The seed is derived from the seed of the run, the iteration and whether it is
+    the ask or the tell of the iteration, so that the proposals of an iteration do not
+    depend on whether the run was resumed from its log file.
+
+    Args:
+        strategy (Strategy): Strategy of the run, nested strategies like the sampler of
+            a `RandomStrategy` are seeded as well.
+        seed (int): Seed of the run.
+        iteration (int): Iteration which is seeded, -1 for the initial samples.
+        tell (bool): If True, the tell of the iteration is seeded, else its ask.
+    """
+    iteration_seed = int(
+        np.random.SeedSequence([seed, iteration + 1, int(tell)]).generate_state(1)[0]
+    )
+    np.random.seed(iteration_seed)
+    torch.manual_seed(iteration_seed)
+    for s in [strategy] + [
+        v for v in vars(strategy).values() if isinstance(v, Strategy)
+    ]:
+        s.rng = np.random.default_rng(iteration_seed)
+
+
+def _autosafe_results(benchmark: Benchmark, run_idx: int):
+    """Safes results into a .json file to prevent data loss during time-expensive optimization runs.
+    Autosave should operate every 10 iterations.
+
+    Args:
+        benchmark: Benchmark function that is suposed be evaluated.
+        run_idx: Index of the run.
+    """
+
+    benchmark_name = benchmark.__class__.__name__
+    # Create a folder for autosaves, if not already exists.
+    if not os.path.exists("bofire_autosaves/" + benchmark_name):
+        os.makedirs("bofire_autosaves/" + benchmark_name)
+
+    filename = "bofire_autosaves/" + benchmark_name + "/run" + str(run_idx) + ".json"
+    parsed_domain = benchmark.domain.json()
+    with open(filename, "w") as file:
+        json.dump(parsed_domain, file)
+
+
 def _single_run(
     run_idx: int,
     benchmark: Benchmark,
@@ -51,56 +169,132 @@ def _single_run(
     n_candidates_per_proposals: int,
     safe_intervall: int,
     initial_sampler: Optional[Callable[[Domain], pd.DataFrame]] = None,
+    seed: Optional[int] = None,
+    log_file: Optional[str] = None,
+    flush_interval: int = 1,
 ) -> Tuple[pd.DataFrame, pd.Series]:
-    def autosafe_results(benchmark):
-        """Safes results into a .json file to prevent data loss during time-expensive optimization runs.
-        Autosave should operate every 10 iterations.
+    # load the checkpoint of the run if available
+    records = _load_checkpoint(log_file) if log_file is not None else []
+    buffer = []
 
-        Args:
-            benchmark: Benchmark function that is suposed be evaluated.
-        """
+    def log(record: Dict[str, Any], force: bool = False):
+        if log_file is None:
+            return
+        buffer.append(record)
+        if force or len(buffer) >= flush_interval:
+            for r in buffer:
+                _append_record(log_file, r)
+            buffer.clear()
 
-        benchmark_name = benchmark.__class__.__name__
-        # Create a folder for autosaves, if not already exists.
-        if not os.path.exists("bofire_autosaves/" + benchmark_name):
-            os.makedirs("bofire_autosaves/" + benchmark_name)
-
-        filename = (
-            "bofire_autosaves/" + benchmark_name + "/run" + str(run_idx) + ".json"
-        )
-        parsed_domain = benchmark.domain.json()
-        with open(filename, "w") as file:
-            json.dump(parsed_domain, file)
-
-    # sample initial values
-    if initial_sampler is not None:
-        X = initial_sampler(benchmark.domain)
-        XY = benchmark.f(X, return_complete=True)
     strategy_data = strategy_factory(domain=benchmark.domain)
+    if seed is not None:
+        strategy_data.seed = seed
     # map it
     strategy = strategies.map(strategy_data)
-    # tell it
-    if initial_sampler is not None:
-        strategy.tell(XY)  # type: ignore
     metric_values = np.zeros(n_iterations)
-    pbar = tqdm(range(n_iterations), position=run_idx)
+    if len(records) > 0:
+        # resume from the checkpoint
+        XY = pd.concat(
+            [pd.DataFrame.from_records(r["experiments"]) for r in records],
+            ignore_index=True,
+        )
+        if seed is not None:
+            _seed_iteration(strategy, seed, records[-1]["iteration"], tell=True)
+        strategy.tell(XY)  # type: ignore
+        for r in records:
+            if 0 <= r["iteration"] < n_iterations:
+                metric_values[r["iteration"]] = r["metric"]
+        start = records[-1]["iteration"] + 1
+    else:
+        # sample initial values
+        if initial_sampler is not None:
+            if seed is not None:
+                _seed_iteration(strategy, seed, -1, tell=False)
+            X = initial_sampler(benchmark.domain)
+            XY = benchmark.f(X, return_complete=True)
+            # tell it
+            if seed is not None:
+                _seed_iteration(strategy, seed, -1, tell=True)
+            strategy.tell(XY)  # type: ignore
+            log(
+                {
+                    "iteration": -1,
+                    "experiments": XY.to_dict(orient="records"),
+                },
+                force=True,
+            )
+        start = 0
+    pbar = tqdm(range(start, n_iterations), position=run_idx)
     for i in pbar:
+        if seed is not None:
+            _seed_iteration(strategy, seed, i, tell=False)
+        t0 = time.perf_counter()
         X = strategy.ask(candidate_count=n_candidates_per_proposals)
+        ask_time = time.perf_counter() - t0
         X = X[benchmark.domain.inputs.get_keys()]
         Y = benchmark.f(X)
         XY = pd.concat([X, Y], axis=1)
         # pd.concat() changes datatype of str to np.int32 if column contains whole numbers.
         # colum needs to be converted back to str to be added to the benchmark domain.
+        if seed is not None:
+            _seed_iteration(strategy, seed, i, tell=True)
+        t0 = time.perf_counter()
         strategy.tell(XY)
+        tell_time = time.perf_counter() - t0
         metric_values[i] = metric(strategy.domain, strategy.experiments)  # type: ignore
         pbar.set_description(
             f"run {run_idx:02d} with current best {metric_values[i]:0.3f}"
         )
+        log(
+            {
+                "iteration": i,
+                "metric": float(metric_values[i]),
+                "ask_time": ask_time,
+                "tell_time": tell_time,
+                "experiments": XY.to_dict(orient="records"),
+            },
+            force=i == n_iterations - 1,
+        )
         if (i + 1) % safe_intervall == 0:
-            autosafe_results(benchmark=benchmark)
+            _autosafe_results(benchmark=benchmark, run_idx=run_idx)
     return strategy.experiments, pd.Series(metric_values)  # type: ignore
 
 
+def _run_tasks(
+    tasks: List[Tuple], n_procs: int
+) -> List[Tuple[pd.DataFrame, pd.Series]]:
+    """Executes the runs, at most `n_procs` of them concurrently.
+
+    Args:
+        tasks (List[Tuple]): Arguments of `_single_run` per run.
+        n_procs (int): Number of parallel processes.
+
+    Returns:
+        List[Tuple[pd.DataFrame, pd.Series]]: Results of the runs in the order of the tasks.
+    """
+    if n_procs == 1 or len(tasks) <= 1:
+        return [_single_run(*task) for task in tasks]
+    with Pool(min(n_procs, len(tasks))) as pool:
+        return pool.starmap(_single_run, tasks)
+
+
+def _get_log_file(
+    save_dir: Optional[str], benchmark: Benchmark, name: str
+) -> Optional[str]:
+    if save_dir is None:
+        return None
+    folder = os.path.join(save_dir, benchmark.__class__.__name__)
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, f"{name}.jsonl")
+
+
+def _get_strategy_name(strategy_factory: StrategyFactory) -> str:
+    # partials expose the wrapped factory as `func`
+    factory = getattr(strategy_factory, "func", strategy_factory)
+    name = getattr(factory, "__name__", factory.__class__.__name__)
+    return re.sub(r"[^0-9a-zA-Z_\-]", "", name) or "strategy"
+
+
 def run(
     benchmark: Benchmark,
     strategy_factory: StrategyFactory,
@@ -111,6 +305,10 @@ def run(
     n_runs: int = 5,
     n_procs: int = 5,
     safe_intervall: int = 1000,
+    seeds: Optional[Sequence[int]] = None,
+    save_dir: Optional[str] = None,
+    flush_interval: int = 1,
+    strategy_name: Optional[str] = None,
 ) -> List[Tuple[pd.DataFrame, pd.Series]]:
     """Run a benchmark problem several times in parallel
 
@@ -124,10 +322,26 @@ def run(
         n_candidates: also known as batch size, number of proposals made at once by the strategy
         n_runs: number of runs
         n_procs: number of parallel processes to execute the runs
+        safe_intervall: number of iterations after which the domain of the benchmark is autosaved to
+                `bofire_autosaves/<benchmark>/run<idx>.json`
+        seeds: seeds of the runs, one per run. If provided, numpy, torch and the strategy are seeded before
+                every ask and tell with a seed derived from the seed of the run and the iteration, so that a
+                resumed run proposes the same candidates as an uninterrupted one.
+        save_dir: if provided, the experiments, metric values and wall times of ask and tell are written
+                per iteration into the JSONL file `<save_dir>/<benchmark>/<strategy>_run<idx>.jsonl`. If the file
+                already exists, the run is resumed from its last logged iteration.
+        flush_interval: number of iterations after which the logged iterations are written to the log file
+        strategy_name: name of the strategy used in the log file names, defaults to the name of the
+                strategy factory. Has to be provided to tell apart different factories of the same name,
+                e.g. lambdas or partials, sharing a `save_dir`.
 
     Returns:
         per run, a tuple with the benchmark object containing the proposed data and metric values
     """
+    if seeds is not None and len(seeds) != n_runs:
+        raise ValueError("Number of seeds has to match the number of runs.")
+    if strategy_name is None:
+        strategy_name = _get_strategy_name(strategy_factory)
 
     def make_args(run_idx: int):
         return (
@@ -139,12 +353,72 @@ def run(
             n_candidates_per_proposal,
             safe_intervall,
             initial_sampler,
+            seeds[run_idx] if seeds is not None else None,
+            _get_log_file(save_dir, benchmark, f"{strategy_name}_run{run_idx}"),
+            flush_interval,
         )
 
-    if n_procs == 1:
-        results = [_single_run(*make_args(i)) for i in range(n_runs)]
-    else:
-        p = Pool(min(n_procs, n_runs))
-        results = [p.apply_async(_single_run, make_args(i)) for i in range(n_runs)]
-        results = [r.get() for r in results]
-    return results
+    return _run_tasks([make_args(i) for i in range(n_runs)], n_procs=n_procs)
+
+
+def run_campaign(
+    benchmark: Benchmark,
+    strategy_factories: Dict[str, StrategyFactory],
+    n_iterations: int,
+    metric: Callable[[Domain, pd.DataFrame], float],
+    seeds: Sequence[int],
+    initial_sampler: Optional[Callable[[Domain], pd.DataFrame]] = None,
+    n_candidates_per_proposal: int = 1,
+    n_procs: int = 5,
+    safe_intervall: int = 1000,
+    save_dir: Optional[str] = None,
+    flush_interval: int = 1,
+) -> Dict[str, List[Tuple[pd.DataFrame, pd.Series]]]:
+    """Run several strategies on a benchmark problem, one run per strategy and seed.
+
+    All runs are scheduled on one process pool, so at most `n_procs` runs are executed
+    concurrently.
+
+    Args:
+        benchmark: problem to be benchmarked
+        strategy_factories: dictionary of named factories creating the strategies to be benchmarked
+        n_iterations: number of times the strategy is asked
+        metric: measure of success, e.g, best value found so far for single objective or
+                hypervolume for multi-objective
+        seeds: seeds of the runs, every strategy is run once per seed
+        initial_sampler: Creates initial data
+        n_candidates_per_proposal: also known as batch size, number of proposals made at once by the strategy
+        n_procs: number of parallel processes to execute the runs
+        safe_intervall: number of iterations after which the domain of the benchmark is autosaved to
+                `bofire_autosaves/<benchmark>/run<idx>.json`
+        save_dir: if provided, the experiments, metric values and wall times of ask and tell are written
+                per iteration into the JSONL file `<save_dir>/<benchmark>/<strategy>_seed<seed>.jsonl`. If the
+                file already exists, the run is resumed from its last logged iteration.
+        flush_interval: number of iterations after which the logged iterations are written to the log file
+
+    Returns:
+        per strategy name and in the order of the seeds, a tuple with the experiments and metric values
+    """
+    tasks = []
+    for name, strategy_factory in strategy_factories.items():
+        for seed in seeds:
+            tasks.append(
+                (
+                    len(tasks),
+                    deepcopy(benchmark),
+                    strategy_factory,
+                    n_iterations,
+                    metric,
+                    n_candidates_per_proposal,
+                    safe_intervall,
+                    initial_sampler,
+                    seed,
+                    _get_log_file(save_dir, benchmark, f"{name}_seed{seed}"),
+                    flush_interval,
+                )
+            )
+    results = _run_tasks(tasks, n_procs=n_procs)
+    return {
+        name: results[i * len(seeds) : (i + 1) * len(seeds)]
+        for i, name in enumerate(strategy_factories.keys())
+    }
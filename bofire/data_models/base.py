@@ -3,10 +3,14 @@ from typing import Any, Callable, List, Sequence, Type, Union, get_args, get_ori
 
 import pandas as pd
 from pydantic import BaseModel as PydanticBaseModel
-from pydantic import Extra
+from pydantic import Extra, PrivateAttr
 
 
 class BaseModel(PydanticBaseModel):
+    # incremented on every assignment to a field, so that objects compiled from a model
+    # can be cached and invalidated when the model is changed
+    _version: int = PrivateAttr(default=0)
+
     class Config:
         validate_assignment = True
         arbitrary_types_allowed = False
@@ -18,6 +22,11 @@ class BaseModel(PydanticBaseModel):
             pd.Series: lambda x: x.to_list(),
         }
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self.__fields__:
+            self._version += 1
+
 
 def filter_by_attribute(
     data: Sequence,
@@ -1,17 +1,20 @@
 import collections.abc
 from itertools import chain
-from typing import List, Literal, Sequence, Type, Union
+from typing import List, Literal, Optional, Sequence, Tuple, Type, Union
 
 import pandas as pd
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from bofire.data_models.base import BaseModel, filter_by_class
 from bofire.data_models.constraints.api import AnyConstraint, Constraint
+from bofire.data_models.domain.evaluator import ConstraintsEvaluator
 
 
 class Constraints(BaseModel):
     type: Literal["Constraints"] = "Constraints"
     constraints: Sequence[AnyConstraint] = Field(default_factory=lambda: [])
+    # compiled evaluator together with the state of the constraints it was compiled for
+    _evaluator: Optional[Tuple[Tuple, ConstraintsEvaluator]] = PrivateAttr(default=None)
 
     def __iter__(self):
         return iter(self.constraints)
@@ -41,7 +44,7 @@ class Constraints(BaseModel):
         Returns:
             pd.DataFrame: Constraint evaluation for each of the constraints
         """
-        return pd.concat([c(experiments) for c in self.constraints], axis=1)
+        return self.get_evaluator()(experiments)
 
     def jacobian(self, experiments: pd.DataFrame) -> list:
         """Numerically evaluate the jacobians of all constraints
@@ -67,9 +70,24 @@ class Constraints(BaseModel):
         """
         if len(self.constraints) == 0:
             return pd.Series([True] * len(experiments), index=experiments.index)
-        return pd.concat(
-            [c.is_fulfilled(experiments, tol) for c in self.constraints], axis=1
-        ).all(axis=1)
+        return self.get_evaluator().is_fulfilled(experiments, tol=tol)
+
+    def get_evaluator(self) -> ConstraintsEvaluator:
+        """Compiles a vectorized evaluator for the constraints.
+
+        The evaluator is cached and only compiled again when constraints were
+        replaced or attributes of them were assigned. It can be kept and reused to evaluate several dataframes, it also
+        provides the matrix of violated constraints per experiment.
+
+        Returns:
+            ConstraintsEvaluator: Compiled evaluator.
+        """
+        # the key covers replaced constraints as well as assignments to their attributes,
+        # the ids stay unique as the cached evaluator references the constraints
+        key = tuple((id(c), c._version) for c in self.constraints)
+        if self._evaluator is None or self._evaluator[0] != key:
+            self._evaluator = (key, ConstraintsEvaluator(constraints=self))
+        return self._evaluator[1]
 
     def get(
         self,
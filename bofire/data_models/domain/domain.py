@@ -462,22 +462,28 @@ class Domain(BaseModel):
         self,
         experiments: pd.DataFrame,
         strict: bool = False,
+        validated_rows: int = 0,
     ) -> pd.DataFrame:
         """checks the experimental data on validity
 
         Args:
             experiments (pd.DataFrame): Dataframe with experimental data
+            strict (bool, optional): If True, it is additionally checked that every
+                input feature shows variation in the experiments or can be varied in
+                the optimization. Defaults to False.
+            validated_rows (int, optional): Number of leading rows which were already
+                validated, e.g. the already known experiments of a strategy. Only the
+                values of the remaining rows are checked, checks across rows like the
+                uniqueness of the labcodes or `strict` still use all rows. Defaults to 0.
 
         Raises:
             ValueError: empty dataframe
             ValueError: the column for a specific feature is missing the provided data
             ValueError: there are labcodes with null value
-            ValueError: there are labcodes with nan value
             ValueError: labcodes are not unique
             ValueError: the provided columns do no match to the defined domain
             ValueError: the provided columns do no match to the defined domain
             ValueError: Input with null values
-            ValueError: Input with nan values
 
         Returns:
             pd.DataFrame: The provided dataframe with experimental data
@@ -503,16 +509,11 @@ class Domain(BaseModel):
         cols = list(experiments.columns)
         # we allow here for a column named labcode used to identify experiments
         if "labcode" in cols:
-            # test that labcodes are not na
-            if experiments.labcode.isnull().to_numpy().any():
+            # test that labcodes are not na, `isna` also covers null values
+            if experiments.labcode.iloc[validated_rows:].isna().to_numpy().any():
                 raise ValueError("there are labcodes with null value")
-            if experiments.labcode.isna().to_numpy().any():
-                raise ValueError("there are labcodes with nan value")
             # test that labcodes are distinct
-            if (
-                len(set(experiments.labcode.to_numpy().tolist()))
-                != experiments.shape[0]
-            ):
+            if not experiments.labcode.is_unique:
                 raise ValueError("labcodes are not unique")
             # we remove the labcode from the cols list to proceed as before
             cols.remove("labcode")
@@ -521,14 +522,13 @@ class Domain(BaseModel):
         if len(set(expected + cols)) != len(cols):
             raise ValueError(f"expected the following cols: `{expected}`, got `{cols}`")
         # check values of continuous input features
-        if experiments[self.get_feature_keys(Input)].isnull().to_numpy().any():
+        input_keys = self.get_feature_keys(Input)
+        if experiments.iloc[validated_rows:][input_keys].isna().to_numpy().any():
             raise ValueError("there are null values")
-        if experiments[self.get_feature_keys(Input)].isna().to_numpy().any():
-            raise ValueError("there are na values")
-        # run the individual validators
-        for feat in self.get_features(Input):
-            assert isinstance(feat, Input)
-            feat.validate_experimental(experiments[feat.key], strict=strict)
+        # run the vectorized validators of the input features
+        self.inputs.validate_experiments(
+            experiments, strict=strict, validated_rows=validated_rows
+        )
         return experiments
 
     def describe_experiments(self, experiments: pd.DataFrame) -> pd.DataFrame:
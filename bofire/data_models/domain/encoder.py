@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bofire.data_models.enum import CategoricalEncodingEnum
+from bofire.data_models.features.api import (
+    CategoricalDescriptorInput,
+    CategoricalInput,
+    DiscreteInput,
+    Input,
+    TInputTransformSpecs,
+)
+
+if TYPE_CHECKING:
+    from bofire.data_models.domain.features import Inputs
+
+
+class InputsEncoder:
+    """Vectorized encoder for the transformation of input features.
+
+    The encoder is compiled once from the input features and the transform specs.
+    It encodes the categorical features via integer category codes directly into a
+    preallocated float64 array and decodes them via argmax/argmin operations on arrays.
+    DataFrames are only created when the results are returned.
+
+    Attributes:
+        features2idx (Dict[str, Tuple[int]]): Dictionary mapping feature keys to column indices.
+        features2names (Dict[str, Tuple[str]]): Dictionary mapping feature keys to transformed
+            feature keys.
+        columns (List[str]): Keys of the transformed features in order.
+    """
+
+    def __init__(self, inputs: Inputs, specs: TInputTransformSpecs):
+        self.features2idx, self.features2names = inputs._get_transform_info(specs)
+        self.columns: List[str] = [
+            name for names in self.features2names.values() for name in names
+        ]
+        self._features: List[Tuple[Input, CategoricalEncodingEnum]] = [
+            (feat, specs.get(feat.key)) for feat in inputs.get()  # type: ignore
+        ]
+        # lookup tables for the categorical features, they are only computed once
+        self._categories: Dict[str, np.ndarray] = {}
+        self._descriptors: Dict[str, np.ndarray] = {}
+        self._allowed: Dict[str, np.ndarray] = {}
+        self._discrete_values: Dict[str, np.ndarray] = {}
+        for feat, enc in self._features:
+            if isinstance(feat, CategoricalInput):
+                self._categories[feat.key] = np.array(feat.categories, dtype=object)
+            if enc == CategoricalEncodingEnum.DESCRIPTOR:
+                assert isinstance(feat, CategoricalDescriptorInput)
+                self._descriptors[feat.key] = np.array(feat.values, dtype=np.float64)
+                self._allowed[feat.key] = np.array(feat.allowed, dtype=bool)
+            if isinstance(feat, DiscreteInput):
+                self._discrete_values[feat.key] = np.array(
+                    feat.values, dtype=np.float64
+                )
+
+    @property
+    def n_columns(self) -> int:
+        """Returns the number of columns of the transformed data."""
+        return len(self.columns)
+
+    def _get_codes(self, feat: CategoricalInput, values: pd.Series) -> np.ndarray:
+        """Returns the integer codes of the categories, -1 for unknown categories."""
+        return pd.Categorical(values, categories=feat.categories).codes.astype(np.intp)
+
+    def transform_array(self, experiments: pd.DataFrame) -> np.ndarray:
+        """Transforms the input features of a dataframe into a float64 array.
+
+        Input features which are not transformed are cast to float, i.e. all input
+        features have to be numeric or have to be part of the specs.
+
+        Args:
+            experiments (pd.DataFrame): Data dataframe to be transformed.
+
+        Returns:
+            np.ndarray: Transformed data with shape `(len(experiments), n_columns)`.
+        """
+        n = len(experiments)
+        rows = np.arange(n)
+        X = np.zeros((n, self.n_columns), dtype=np.float64)
+        for feat, enc in self._features:
+            idx = np.array(self.features2idx[feat.key], dtype=np.intp)
+            values = experiments[feat.key]
+            if enc is None:
+                X[:, idx[0]] = values.to_numpy(dtype=np.float64)
+                continue
+            assert isinstance(feat, CategoricalInput)
+            codes = self._get_codes(feat, values)
+            if enc == CategoricalEncodingEnum.ONE_HOT:
+                mask = codes >= 0
+                X[rows[mask], idx[codes[mask]]] = 1.0
+            elif enc == CategoricalEncodingEnum.DUMMY:
+                mask = codes >= 1
+                X[rows[mask], idx[codes[mask] - 1]] = 1.0
+            elif enc == CategoricalEncodingEnum.ORDINAL:
+                if np.any(codes < 0):
+                    raise KeyError(f"{feat.key}: Unknown categories in {values}.")
+                X[:, idx[0]] = codes
+            elif enc == CategoricalEncodingEnum.DESCRIPTOR:
+                descriptors = self._descriptors[feat.key][codes]
+                descriptors[codes < 0] = np.nan
+                X[:, idx] = descriptors
+        return X
+
+    def transform(self, experiments: pd.DataFrame) -> pd.DataFrame:
+        """Transforms the input features of a dataframe to the representation specified
+        in the specs.
+
+        Args:
+            experiments (pd.DataFrame): Data dataframe to be transformed.
+
+        Returns:
+            pd.DataFrame: Transformed dataframe. Only input features are included.
+        """
+        # categorical features without encoding are not numeric and cannot be
+        # written into the float buffer, they are passed through as they are
+        passthrough = [
+            feat.key
+            for feat, enc in self._features
+            if enc is None and isinstance(feat, CategoricalInput)
+        ]
+        if len(passthrough) == 0:
+            return pd.DataFrame(
+                data=self.transform_array(experiments),
+                columns=self.columns,
+                index=experiments.index,
+            )
+        numeric = experiments.copy()
+        numeric[passthrough] = 0.0
+        transformed = pd.DataFrame(
+            data=self.transform_array(numeric),
+            columns=self.columns,
+            index=experiments.index,
+        )
+        transformed[passthrough] = experiments[passthrough]
+        return transformed
+
+    def _get_columns(self, experiments: pd.DataFrame, key: str, names: List[str]):
+        # we allow here explicitly that the dataframe can have more columns than needed to have it
+        # easier in the backtransform.
+        if np.any([c not in experiments.columns for c in names]):
+            raise ValueError(
+                f"{key}: Column names don't match categorical levels: {experiments.columns}, {names}."
+            )
+        return experiments[names].to_numpy(dtype=np.float64)
+
+    def inverse_transform(self, experiments: pd.DataFrame) -> pd.DataFrame:
+        """Transforms a dataframe back to the original representation.
+
+        Args:
+            experiments (pd.DataFrame): Transformed data dataframe.
+
+        Returns:
+            pd.DataFrame: Back transformed dataframe. Only input features are included.
+        """
+        transformed = {}
+        for feat, enc in self._features:
+            names = list(self.features2names[feat.key])
+            if isinstance(feat, DiscreteInput):
+                discrete_values = self._discrete_values[feat.key]
+                values = experiments[feat.key].to_numpy(dtype=np.float64)
+                transformed[feat.key] = discrete_values[
+                    np.abs(values[:, np.newaxis] - discrete_values).argmin(axis=1)
+                ]
+            elif enc is None:
+                transformed[feat.key] = experiments[feat.key].to_numpy()
+            elif enc == CategoricalEncodingEnum.ONE_HOT:
+                values = self._get_columns(experiments, feat.key, names)
+                transformed[feat.key] = self._categories[feat.key][
+                    values.argmax(axis=1)
+                ]
+            elif enc == CategoricalEncodingEnum.DUMMY:
+                values = self._get_columns(experiments, feat.key, names)
+                values = np.hstack(
+                    (1 - values.sum(axis=1, keepdims=True), values),
+                )
+                transformed[feat.key] = self._categories[feat.key][
+                    values.argmax(axis=1)
+                ]
+            elif enc == CategoricalEncodingEnum.ORDINAL:
+                codes = np.round(experiments[feat.key].to_numpy(dtype=np.float64))
+                transformed[feat.key] = self._categories[feat.key][
+                    codes.astype(np.intp)
+                ]
+            elif enc == CategoricalEncodingEnum.DESCRIPTOR:
+                values = self._get_columns(experiments, feat.key, names)
+                allowed = self._allowed[feat.key]
+                distances = np.sum(
+                    (
+                        values[:, np.newaxis, :]
+                        - self._descriptors[feat.key][allowed][np.newaxis, :, :]
+                    )
+                    ** 2,
+                    axis=2,
+                )
+                transformed[feat.key] = self._categories[feat.key][allowed][
+                    distances.argmin(axis=1)
+                ]
+        return pd.DataFrame(transformed, index=experiments.index)
@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import ast
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from bofire.data_models.constraints.api import (
+    Constraint,
+    LinearConstraint,
+    LinearEqualityConstraint,
+    NChooseKConstraint,
+    NonlinearConstraint,
+    NonlinearEqualityConstraint,
+)
+
+try:
+    import numexpr  # type: ignore
+except ImportError:
+    numexpr = None
+
+if TYPE_CHECKING:
+    from bofire.data_models.domain.constraints import Constraints
+
+# functions which are supported in the expressions of `pandas.eval`
+_FUNCTIONS = {
+    name: getattr(np, name)
+    for name in [
+        "sin",
+        "cos",
+        "tan",
+        "exp",
+        "log",
+        "expm1",
+        "log1p",
+        "sqrt",
+        "sinh",
+        "cosh",
+        "tanh",
+        "arcsin",
+        "arccos",
+        "arctan",
+        "arccosh",
+        "arcsinh",
+        "arctanh",
+        "abs",
+        "arctan2",
+    ]
+}
+
+
+# syntax nodes which are allowed in compiled expressions, attribute access,
+# subscripts, lambdas etc. are not allowed
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Compare,
+    ast.BoolOp,
+    ast.Call,
+    ast.operator,
+    ast.unaryop,
+    ast.cmpop,
+    ast.boolop,
+)
+
+
+def _parse_expression(expression: str) -> Optional[ast.Expression]:
+    """Parses an expression which only consists of numbers, names, arithmetic,
+    comparisons and calls of the functions in `_FUNCTIONS`.
+
+    Returns:
+        Optional[ast.Expression]: The parsed expression, None if it contains other
+            syntax.
+    """
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError:
+        return None
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            return None
+        if isinstance(node, ast.Name) and node.id.startswith("__"):
+            return None
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            return None
+        if isinstance(node, ast.Call) and (
+            not isinstance(node.func, ast.Name)
+            or node.func.id not in _FUNCTIONS
+            or len(node.keywords) > 0
+        ):
+            return None
+    return tree
+
+
+class _CompiledExpression:
+    """Expression of a nonlinear constraint which is compiled once.
+
+    Expressions which only consist of numbers, feature keys, arithmetic, comparisons
+    and calls of the functions supported by `pandas.eval` are evaluated with numexpr if
+    it is installed, else as compiled python code on numpy arrays. All other
+    expressions are evaluated by `pandas.eval` as in `NonlinearConstraint.__call__`.
+    """
+
+    def __init__(self, constraint: NonlinearConstraint):
+        self.constraint = constraint
+        self._code = None
+        tree = _parse_expression(constraint.expression)
+        if tree is not None:
+            self._names = [
+                node.id
+                for node in ast.walk(tree)
+                if isinstance(node, ast.Name) and node.id not in _FUNCTIONS
+            ]
+            self._code = compile(tree, "<constraint>", "eval")
+
+    def __call__(self, experiments: pd.DataFrame) -> np.ndarray:
+        if self._code is not None:
+            columns = {
+                name: experiments[name].to_numpy()
+                for name in self._names
+                if name in experiments
+            }
+            try:
+                if numexpr is not None:
+                    values = numexpr.evaluate(
+                        self.constraint.expression, local_dict=columns, global_dict={}
+                    )
+                else:
+                    values = eval(
+                        self._code, {"__builtins__": {}, **_FUNCTIONS}, columns
+                    )
+                return np.broadcast_to(
+                    np.asarray(values, dtype=np.float64), (len(experiments),)
+                )
+            except Exception:
+                # fall back to pandas for the expressions which are not supported
+                self._code = None
+        return np.asarray(self.constraint(experiments), dtype=np.float64)
+
+
+class ConstraintsEvaluator:
+    """Vectorized evaluation of constraints.
+
+    The evaluator is compiled once from the constraints. All linear constraints are
+    combined into one sparse matrix of normalized coefficients and all NChooseK
+    constraints into one sparse incidence matrix, so that they are evaluated for all
+    experiments at once on a contiguous float array of the involved features. The
+    expressions of nonlinear constraints are compiled once.
+
+    The values and checks are the same as the ones of `Constraint.__call__` and
+    `Constraint.is_fulfilled`.
+
+    Attributes:
+        constraints (List[Constraint]): The compiled constraints.
+        keys (List[str]): Keys of the features of the linear and NChooseK constraints,
+            the columns of the array on which they are evaluated.
+    """
+
+    def __init__(self, constraints: Constraints):
+        self.constraints: List[Constraint] = list(constraints)
+        self.keys: List[str] = []
+        key2idx: Dict[str, int] = {}
+        for c in self.constraints:
+            if isinstance(c, (LinearConstraint, NChooseKConstraint)):
+                for key in c.features:
+                    if key not in key2idx:
+                        key2idx[key] = len(self.keys)
+                        self.keys.append(key)
+        # linear constraints as rows of a sparse matrix with normalized coefficients
+        self._linear = np.array(
+            [
+                i
+                for i, c in enumerate(self.constraints)
+                if isinstance(c, LinearConstraint)
+            ],
+            dtype=np.int64,
+        )
+        linear: List[LinearConstraint] = [
+            self.constraints[i] for i in self._linear  # type: ignore
+        ]
+        norms = np.array([np.linalg.norm(c.coefficients) for c in linear])
+        self._A = self._to_sparse(
+            [[key2idx[key] for key in c.features] for c in linear],
+            [np.array(c.coefficients) / norm for c, norm in zip(linear, norms)],
+        )
+        self._b = np.array([c.rhs for c in linear], dtype=np.float64) / norms
+        self._linear_equality = np.array(
+            [isinstance(c, LinearEqualityConstraint) for c in linear], dtype=bool
+        )
+        # NChooseK constraints as rows of a sparse incidence matrix
+        self._nchoosek = np.array(
+            [
+                i
+                for i, c in enumerate(self.constraints)
+                if isinstance(c, NChooseKConstraint)
+            ],
+            dtype=np.int64,
+        )
+        nchooseks: List[NChooseKConstraint] = [
+            self.constraints[i] for i in self._nchoosek  # type: ignore
+        ]
+        self._M = self._to_sparse(
+            [[key2idx[key] for key in c.features] for c in nchooseks],
+            [np.ones(len(c.features)) for c in nchooseks],
+        )
+        self._n_features = np.array([len(c.features) for c in nchooseks])
+        self._min_count = np.array([c.min_count for c in nchooseks])
+        self._max_count = np.array([c.max_count for c in nchooseks])
+        self._none_also_valid = np.array(
+            [c.none_also_valid for c in nchooseks], dtype=bool
+        )
+        # nonlinear constraints are compiled one by one
+        self._nonlinear = np.array(
+            [
+                i
+                for i, c in enumerate(self.constraints)
+                if isinstance(c, NonlinearConstraint)
+            ],
+            dtype=np.int64,
+        )
+        self._expressions = [
+            _CompiledExpression(self.constraints[i]) for i in self._nonlinear  # type: ignore
+        ]
+        self._nonlinear_equality = np.array(
+            [
+                isinstance(self.constraints[i], NonlinearEqualityConstraint)
+                for i in self._nonlinear
+            ],
+            dtype=bool,
+        )
+        # constraints of other types are evaluated by their own methods
+        compiled = set(self._linear) | set(self._nchoosek) | set(self._nonlinear)
+        self._other = [i for i in range(len(self.constraints)) if i not in compiled]
+
+    def _to_sparse(
+        self, indices: List[List[int]], values: List[np.ndarray]
+    ) -> sparse.csr_matrix:
+        return sparse.csr_matrix(
+            (
+                np.concatenate(values) if len(values) > 0 else np.zeros(0),
+                np.concatenate(indices).astype(np.int64)
+                if len(indices) > 0
+                else np.zeros(0, dtype=np.int64),
+                np.cumsum([0] + [len(idx) for idx in indices]),
+            ),
+            shape=(len(indices), len(self.keys)),
+        )
+
+    def _to_array(self, experiments: pd.DataFrame) -> np.ndarray:
+        return experiments[self.keys].to_numpy(dtype=np.float64)
+
+    def __call__(self, experiments: pd.DataFrame) -> pd.DataFrame:
+        """Numerically evaluates all constraints.
+
+        Args:
+            experiments (pd.DataFrame): Data to evaluate the constraints on.
+
+        Returns:
+            pd.DataFrame: Constraint evaluation with one column per constraint.
+        """
+        return pd.DataFrame(self.evaluate(experiments), index=experiments.index)
+
+    def evaluate(self, experiments: pd.DataFrame) -> np.ndarray:
+        """Numerically evaluates all constraints.
+
+        Args:
+            experiments (pd.DataFrame): Data to evaluate the constraints on.
+
+        Returns:
+            np.ndarray: Array of shape (n_experiments, n_constraints), the values are
+                the ones of `Constraint.__call__`.
+        """
+        values = np.empty((len(experiments), len(self.constraints)))
+        X = self._to_array(experiments)
+        if len(self._linear) > 0:
+            values[:, self._linear] = self._linear_values(X)
+        if len(self._nchoosek) > 0:
+            # smooth relaxation by counting the zeros by narrow gaussians
+            zeros = (self._M @ np.exp(-0.5 * (X / 1e-3) ** 2).T).T
+            max_violation = np.maximum(0, -zeros + self._n_features - self._max_count)
+            max_violation[:, self._max_count == self._n_features] = 0
+            min_violation = np.maximum(0, zeros - (self._n_features - self._min_count))
+            min_violation[:, self._min_count == 0] = 0
+            values[:, self._nchoosek] = max_violation + min_violation
+        for i, expression in zip(self._nonlinear, self._expressions):
+            values[:, i] = expression(experiments)
+        for i in self._other:
+            values[:, i] = self.constraints[i](experiments)
+        return values
+
+    def _linear_values(self, X: np.ndarray) -> np.ndarray:
+        return (self._A @ X.T).T - self._b
+
+    def get_violations(
+        self, experiments: pd.DataFrame, tol: Optional[float] = 1e-6
+    ) -> np.ndarray:
+        """Checks which constraints are violated by which experiments.
+
+        Args:
+            experiments (pd.DataFrame): Data to check the constraints on.
+            tol (float, optional): tolerance parameter. A constraint is considered as not
+                fulfilled if the violation is larger than tol. Defaults to 1e-6.
+
+        Returns:
+            np.ndarray: Boolean array of shape (n_experiments, n_constraints) which is True
+                where a constraint is not fulfilled.
+        """
+        tol = 0 if tol is None else tol
+        violated = np.empty((len(experiments), len(self.constraints)), dtype=bool)
+        X = self._to_array(experiments)
+        if len(self._linear) > 0:
+            values = self._linear_values(X)
+            # nan values are never fulfilled
+            violated[:, self._linear] = ~np.where(
+                self._linear_equality, np.abs(values) <= tol, values <= tol
+            )
+        if len(self._nchoosek) > 0:
+            counts = (self._M @ (np.abs(X) > tol).T.astype(np.float64)).T
+            fulfilled = (counts >= self._min_count) & (counts <= self._max_count)
+            fulfilled |= self._none_also_valid & (counts == 0)
+            violated[:, self._nchoosek] = ~fulfilled
+        if len(self._nonlinear) > 0:
+            values = np.column_stack(
+                [expression(experiments) for expression in self._expressions]
+            ).reshape((len(experiments), len(self._nonlinear)))
+            violated[:, self._nonlinear] = ~np.where(
+                self._nonlinear_equality, np.abs(values) <= tol, values <= tol
+            )
+        for i in self._other:
+            violated[:, i] = ~self.constraints[i].is_fulfilled(experiments, tol=tol)
+        return violated
+
+    def is_fulfilled(
+        self, experiments: pd.DataFrame, tol: Optional[float] = 1e-6
+    ) -> pd.Series:
+        """Checks if all constraints are fulfilled on all rows of the provided dataframe.
+
+        Args:
+            experiments (pd.DataFrame): Data to check the constraints on.
+            tol (float, optional): tolerance parameter. A constraint is considered as not
+                fulfilled if the violation is larger than tol. Defaults to 1e-6.
+
+        Returns:
+            pd.Series: Boolean series which is True for the rows fulfilling all constraints.
+        """
+        return pd.Series(
+            ~self.get_violations(experiments, tol=tol).any(axis=1),
+            index=experiments.index,
+        )
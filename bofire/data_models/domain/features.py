@@ -2,14 +2,27 @@ from __future__ import annotations
 
 import itertools
 import warnings
-from typing import Dict, List, Literal, Optional, Sequence, Tuple, Type, Union, cast
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 import numpy as np
 import pandas as pd
-from pydantic import Field, validate_arguments
+from pydantic import Field, PrivateAttr, validate_arguments
 from scipy.stats.qmc import LatinHypercube, Sobol
 
 from bofire.data_models.base import BaseModel, filter_by_attribute, filter_by_class
+from bofire.data_models.domain.encoder import InputsEncoder
+from bofire.data_models.domain.validator import InputsValidator
 from bofire.data_models.enum import CategoricalEncodingEnum, SamplingMethodEnum
 from bofire.data_models.features.api import (
     _CAT_SEP,
@@ -160,6 +173,10 @@ class Inputs(Features):
 
     type: Literal["Inputs"] = "Inputs"
     features: Sequence[AnyInput] = Field(default_factory=lambda: [])
+    _validator: Optional[Tuple[Tuple, InputsValidator]] = PrivateAttr(default=None)
+    _encoders: Dict[Tuple, Tuple[Tuple, InputsEncoder]] = PrivateAttr(
+        default_factory=dict
+    )
 
     def get_fixed(self) -> "Inputs":
         """Gets all features in `self` that are fixed and returns them as new `Inputs` object.
@@ -241,20 +258,45 @@ class Inputs(Features):
         Returns:
             pd.Dataframe: Validated dataframe
         """
-        for feature in self:
-            if feature.key not in inputs:
-                raise ValueError(f"no col for input feature `{feature.key}`")
-            feature.validate_candidental(inputs[feature.key])  # type: ignore
-        return inputs
+        return self.get_validator().validate_candidates(inputs)
 
     def validate_experiments(
-        self, experiments: pd.DataFrame, strict=False
+        self, experiments: pd.DataFrame, strict=False, validated_rows: int = 0
     ) -> pd.DataFrame:
-        for feature in self:
-            if feature.key not in experiments:
-                raise ValueError(f"no col for input feature `{feature.key}`")
-            feature.validate_experimental(experiments[feature.key], strict=strict)  # type: ignore
-        return experiments
+        """Validate the input features of a dataframe with experiments.
+
+        Args:
+            experiments (pd.DataFrame): Experiments to validate.
+            strict (bool, optional): If True, it is additionally checked that every
+                feature shows variation in the experiments or can be varied in the
+                optimization. Defaults to False.
+            validated_rows (int, optional): Number of leading rows which were already
+                validated, only the values of the remaining rows are checked.
+                Defaults to 0.
+
+        Returns:
+            pd.DataFrame: The passed dataframe with experiments.
+        """
+        return self.get_validator().validate_experiments(
+            experiments, strict=strict, validated_rows=validated_rows
+        )
+
+    def get_validator(self) -> InputsValidator:
+        """Compiles a vectorized validator for experiments and candidates.
+
+        The validator is cached and only compiled again when features were replaced or
+        attributes of them were assigned. It can be kept and reused to validate several
+        dataframes with the same features.
+
+        Returns:
+            InputsValidator: Compiled validator.
+        """
+        # the key covers replaced features as well as assignments to their attributes,
+        # the ids stay unique as the cached validator references the features
+        key = tuple((id(feat), feat._version) for feat in self.features)
+        if self._validator is None or self._validator[0] != key:
+            self._validator = (key, InputsValidator(inputs=self))
+        return self._validator[1]
 
     def get_categorical_combinations(
         self,
@@ -270,6 +312,71 @@ class Inputs(Features):
         Returns:
             List[(str, List[str])]: Returns a list of tuples pairing the feature keys with a list of valid categories (str)
         """
+        return list(
+            self.iter_categorical_combinations(include=include, exclude=exclude)
+        )
+
+    def iter_categorical_combinations(
+        self,
+        include: Union[Type, List[Type]] = Input,
+        exclude: Union[Type, List[Type]] = None,
+    ) -> Iterator[Tuple[Tuple[str, Union[str, float]], ...]]:
+        """Lazily generates the combinations returned by `get_categorical_combinations`
+        without materializing them.
+
+        Args:
+            include (Feature, optional): Features to be included. Defaults to Input.
+            exclude (Feature, optional): Features to be excluded, e.g. subclasses of the included features. Defaults to None.
+
+        Returns:
+            Iterator[Tuple[Tuple[str, Union[str, float]], ...]]: Iterator over the combinations,
+                each combination is a tuple of pairs of feature keys and values.
+        """
+        return itertools.product(
+            *self._get_categorical_levels(include=include, exclude=exclude)
+        )
+
+    def get_number_of_categorical_combinations(
+        self,
+        include: Union[Type, List[Type]] = Input,
+        exclude: Union[Type, List[Type]] = None,
+    ) -> int:
+        """Returns the number of combinations returned by `get_categorical_combinations`
+        without enumerating them.
+
+        Args:
+            include (Feature, optional): Features to be included. Defaults to Input.
+            exclude (Feature, optional): Features to be excluded, e.g. subclasses of the included features. Defaults to None.
+
+        Returns:
+            int: Number of combinations.
+        """
+        return int(
+            np.prod(
+                [
+                    len(levels)
+                    for levels in self._get_categorical_levels(
+                        include=include, exclude=exclude
+                    )
+                ]
+            )
+        )
+
+    def _get_categorical_levels(
+        self,
+        include: Union[Type, List[Type]] = Input,
+        exclude: Union[Type, List[Type]] = None,
+    ) -> List[List[Tuple[str, Union[str, float]]]]:
+        """Returns for every non-fixed categorical and discrete feature the list of pairs
+        of its key and its possible values.
+
+        Args:
+            include (Feature, optional): Features to be included. Defaults to Input.
+            exclude (Feature, optional): Features to be excluded, e.g. subclasses of the included features. Defaults to None.
+
+        Returns:
+            List[List[Tuple[str, Union[str, float]]]]: One list of (key, value) pairs per feature.
+        """
         features = [
             f
             for f in self.get(includes=include, excludes=exclude)
@@ -287,9 +394,7 @@ class Inputs(Features):
 
         list_of_lists_2 = [[(d.key, v) for v in d.values] for d in discretes]
 
-        list_of_lists = list_of_lists + list_of_lists_2
-
-        return list(itertools.product(*list_of_lists))
+        return list_of_lists + list_of_lists_2
 
     # transformation related methods
     def _get_transform_info(
@@ -365,25 +470,7 @@ class Inputs(Features):
         Returns:
             pd.DataFrame: Transformed dataframe. Only input features are included.
         """
-        specs = self._validate_transform_specs(specs)
-        transformed = []
-        for feat in self.get():
-            s = experiments[feat.key]
-            if feat.key not in specs.keys():
-                transformed.append(s)
-            elif specs[feat.key] == CategoricalEncodingEnum.ONE_HOT:
-                assert isinstance(feat, CategoricalInput)
-                transformed.append(feat.to_onehot_encoding(s))
-            elif specs[feat.key] == CategoricalEncodingEnum.ORDINAL:
-                assert isinstance(feat, CategoricalInput)
-                transformed.append(feat.to_ordinal_encoding(s))
-            elif specs[feat.key] == CategoricalEncodingEnum.DUMMY:
-                assert isinstance(feat, CategoricalInput)
-                transformed.append(feat.to_dummy_encoding(s))
-            elif specs[feat.key] == CategoricalEncodingEnum.DESCRIPTOR:
-                assert isinstance(feat, CategoricalDescriptorInput)
-                transformed.append(feat.to_descriptor_encoding(s))
-        return pd.concat(transformed, axis=1)
+        return self.get_encoder(specs).transform(experiments)
 
     def inverse_transform(
         self, experiments: pd.DataFrame, specs: TInputTransformSpecs
@@ -401,26 +488,30 @@ class Inputs(Features):
         Returns:
             pd.DataFrame: Back transformed dataframe. Only input features are included.
         """
-        self._validate_transform_specs(specs=specs)
-        transformed = []
-        for feat in self.get():
-            if isinstance(feat, DiscreteInput):
-                transformed.append(feat.from_continuous(experiments))
-            elif feat.key not in specs.keys():
-                transformed.append(experiments[feat.key])
-            elif specs[feat.key] == CategoricalEncodingEnum.ONE_HOT:
-                assert isinstance(feat, CategoricalInput)
-                transformed.append(feat.from_onehot_encoding(experiments))
-            elif specs[feat.key] == CategoricalEncodingEnum.ORDINAL:
-                assert isinstance(feat, CategoricalInput)
-                transformed.append(feat.from_ordinal_encoding(experiments[feat.key]))
-            elif specs[feat.key] == CategoricalEncodingEnum.DUMMY:
-                assert isinstance(feat, CategoricalInput)
-                transformed.append(feat.from_dummy_encoding(experiments))
-            elif specs[feat.key] == CategoricalEncodingEnum.DESCRIPTOR:
-                assert isinstance(feat, CategoricalDescriptorInput)
-                transformed.append(feat.from_descriptor_encoding(experiments))
-        return pd.concat(transformed, axis=1)
+        return self.get_encoder(specs).inverse_transform(experiments)
+
+    def get_encoder(self, specs: TInputTransformSpecs) -> InputsEncoder:
+        """Compiles an encoder for the transformation specified in `specs`.
+
+        The encoder is cached per specs and only compiled again when features were
+        replaced or attributes of them were assigned. It can be kept and reused to
+        transform several dataframes with the same features and specs.
+
+        Args:
+            specs (TInputTransformSpecs): Dictionary specifying which
+                input feature is transformed by which encoder.
+
+        Returns:
+            InputsEncoder: Compiled encoder.
+        """
+        # the ids stay unique as the cached encoders reference the features
+        key = tuple((id(feat), feat._version) for feat in self.features)
+        specs_key = tuple(sorted(specs.items()))
+        cached = self._encoders.get(specs_key)
+        if cached is None or cached[0] != key:
+            cached = (key, InputsEncoder(inputs=self, specs=specs))
+            self._encoders[specs_key] = cached
+        return cached[1]
 
     def _validate_transform_specs(self, specs: TInputTransformSpecs):
         """Checks the validity of the transform specs .
@@ -486,6 +577,17 @@ class Inputs(Features):
         return lower, upper
 
 
+def _is_valid(experiments: pd.DataFrame, key: str) -> np.ndarray:
+    """Returns a boolean array which is True where the output `key` is valid."""
+    valid = experiments[f"valid_{key}"]
+    if isinstance(valid.dtype, np.dtype) and valid.dtype.kind in "biuf":
+        mask = valid.to_numpy() > 0
+    else:
+        mask = valid.gt(0).to_numpy(dtype=bool, na_value=False)
+    mask &= pd.notna(experiments[key].to_numpy())
+    return mask
+
+
 class Outputs(Features):
     """Container of output features, only output features are allowed.
 
@@ -626,15 +728,11 @@ class Outputs(Features):
         Returns:
             pd.DataFrame: Dataframe with all experiments where only valid entries of the selected features are included
         """
-        if (output_feature_keys is None) or (len(output_feature_keys) == 0):
-            output_feature_keys = self.get_keys(Output)
-
-        clean_exp = experiments.query(
-            " & ".join(["(`valid_%s` > 0)" % key for key in output_feature_keys])
-        )
-        clean_exp = clean_exp.dropna(subset=output_feature_keys)
-
-        return clean_exp
+        return experiments.loc[
+            self.get_valid_outputs_mask(
+                experiments, output_feature_keys=output_feature_keys, how="all"
+            )
+        ]
 
     def preprocess_experiments_any_valid_output(
         self, experiments: pd.DataFrame
@@ -648,19 +746,34 @@ class Outputs(Features):
             pd.DataFrame: Dataframe with all experiments where at least one output feature has a valid entry
         """
 
-        output_feature_keys = self.get_keys(Output)
+        assert experiments is not None
+        return experiments.loc[self.get_valid_outputs_mask(experiments, how="any")]
 
-        # clean_exp = experiments.query(" or ".join(["(valid_%s > 0)" % key for key in output_feature_keys]))
-        # clean_exp = clean_exp.query(" or ".join(["%s.notna()" % key for key in output_feature_keys]))
+    def get_valid_outputs_mask(
+        self,
+        experiments: pd.DataFrame,
+        output_feature_keys: Optional[List] = None,
+        how: Literal["all", "any"] = "all",
+    ) -> np.ndarray:
+        """Method to get a boolean mask of the experiments with valid output values.
 
-        assert experiments is not None
-        clean_exp = experiments.query(
-            " or ".join(
-                [
-                    "((`valid_%s` >0) & `%s`.notna())" % (key, key)
-                    for key in output_feature_keys
-                ]
-            )
-        )
+        An entry of an output feature is valid if its value is not missing and the
+        corresponding `valid_` column is larger than zero. The mask is computed on the
+        underlying arrays, no rows are copied.
 
-        return clean_exp
+        Args:
+            experiments (pd.DataFrame): Dataframe with experimental data
+            output_feature_keys (Optional[List], optional): List of output feature keys which should be considered. Defaults to None.
+            how (Literal["all", "any"], optional): If "all", all entries of a row have to be valid,
+                if "any", at least one. Defaults to "all".
+
+        Returns:
+            np.ndarray: Boolean mask with one entry per experiment.
+        """
+        if (output_feature_keys is None) or (len(output_feature_keys) == 0):
+            output_feature_keys = self.get_keys(Output)
+        reduce = np.logical_and if how == "all" else np.logical_or
+        mask = np.full(len(experiments), how == "all")
+        for key in output_feature_keys:
+            reduce(mask, _is_valid(experiments, key), out=mask)
+        return mask
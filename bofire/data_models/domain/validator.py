@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List
+
+import numpy as np
+import pandas as pd
+
+from bofire.data_models.features.api import (
+    CategoricalInput,
+    ContinuousInput,
+    DiscreteInput,
+    Input,
+    NumericalInput,
+)
+
+if TYPE_CHECKING:
+    from bofire.data_models.domain.features import Inputs
+
+# tolerance for the bound checks of candidates
+BOUNDS_NOISE = 10e-6
+
+
+class InputsValidator:
+    """Vectorized validation of experiments and candidates.
+
+    The validator is compiled once from the input features. It checks all numerical
+    features at once on a float array against a bounds array and the categorical
+    features via integer category codes and masks of the allowed categories. Features
+    with custom validation logic, like molecular or categorical descriptor features, are
+    validated by their own methods.
+
+    The checks and error messages are the same as the ones of
+    `Input.validate_experimental` and `Input.validate_candidental`.
+    """
+
+    def __init__(self, inputs: Inputs):
+        self.keys: List[str] = inputs.get_keys()
+        features = inputs.get()
+        # features whose validation is fully covered by the vectorized checks
+        self._numerical: List[NumericalInput] = [
+            feat  # type: ignore
+            for feat in features
+            if type(feat).validate_experimental is NumericalInput.validate_experimental
+        ]
+        self._lower = np.array(
+            [feat.lower_bound for feat in self._numerical], dtype=np.float64
+        )
+        self._upper = np.array(
+            [feat.upper_bound for feat in self._numerical], dtype=np.float64
+        )
+        self._categorical: List[CategoricalInput] = [
+            feat  # type: ignore
+            for feat in features
+            if isinstance(feat, CategoricalInput)
+            and type(feat).validate_experimental
+            is CategoricalInput.validate_experimental
+        ]
+        # membership by identity, comparing the features by value is expensive
+        covered = {id(feat) for feat in self._numerical + self._categorical}
+        self._other: List[Input] = [
+            feat for feat in features if id(feat) not in covered
+        ]
+        candidental = {
+            NumericalInput.validate_candidental,
+            ContinuousInput.validate_candidental,
+            DiscreteInput.validate_candidental,
+        }
+        self._numerical_candidates: List[NumericalInput] = [
+            feat  # type: ignore
+            for feat in features
+            if type(feat).validate_candidental in candidental
+        ]
+        # continuous features are checked against their bounds, the other ones
+        # get infinite bounds
+        bounded = [
+            type(feat).validate_candidental is ContinuousInput.validate_candidental
+            for feat in self._numerical_candidates
+        ]
+        self._candidate_lower = np.array(
+            [
+                feat.lower_bound - BOUNDS_NOISE if b else -np.inf
+                for feat, b in zip(self._numerical_candidates, bounded)
+            ],
+            dtype=np.float64,
+        )
+        self._candidate_upper = np.array(
+            [
+                feat.upper_bound + BOUNDS_NOISE if b else np.inf
+                for feat, b in zip(self._numerical_candidates, bounded)
+            ],
+            dtype=np.float64,
+        )
+        self._categorical_candidates: List[CategoricalInput] = [
+            feat  # type: ignore
+            for feat in features
+            if isinstance(feat, CategoricalInput)
+            and type(feat).validate_candidental is CategoricalInput.validate_candidental
+        ]
+        self._allowed = {
+            feat.key: np.array(feat.allowed, dtype=bool)
+            for feat in self._categorical_candidates
+        }
+        covered = {
+            id(feat)
+            for feat in self._numerical_candidates + self._categorical_candidates
+        }
+        self._other_candidates: List[Input] = [
+            feat for feat in features if id(feat) not in covered
+        ]
+
+    def _check_columns(self, data: pd.DataFrame):
+        for key in self.keys:
+            if key not in data:
+                raise ValueError(f"no col for input feature `{key}`")
+
+    @staticmethod
+    def _to_array(data: pd.DataFrame, features: List[NumericalInput]) -> np.ndarray:
+        """Converts the numerical columns into a float array, in one pass if all of
+        them have a numeric dtype. Non numerical values and missing values are nan.
+
+        Raises:
+            ValueError: when a value is not numerical.
+        """
+        keys = [feat.key for feat in features]
+        block = data[keys]
+        if all(pd.api.types.is_numeric_dtype(dtype) for dtype in block.dtypes):
+            X = block.to_numpy(dtype=np.float64)
+        else:
+            X = np.column_stack(
+                [
+                    pd.to_numeric(block[key], errors="coerce").to_numpy(
+                        dtype=np.float64
+                    )
+                    for key in keys
+                ]
+            ).reshape((len(block), len(keys)))
+        invalid = np.isnan(X).any(axis=0)
+        if invalid.any():
+            raise ValueError(
+                f"not all values of input feature `{keys[int(np.argmax(invalid))]}` are numerical"
+            )
+        return X
+
+    @staticmethod
+    def _get_codes(feat: CategoricalInput, values: pd.Series) -> np.ndarray:
+        """Returns the integer codes of the categories, -1 for unknown categories."""
+        return pd.Categorical(values, categories=feat.categories).codes
+
+    def validate_experiments(
+        self,
+        experiments: pd.DataFrame,
+        strict: bool = False,
+        validated_rows: int = 0,
+    ) -> pd.DataFrame:
+        """Validates the input features of experiments.
+
+        Args:
+            experiments (pd.DataFrame): Dataframe with experiments.
+            strict (bool, optional): If True, it is additionally checked that every
+                feature shows variation in the experiments or can be varied in the
+                optimization. Defaults to False.
+            validated_rows (int, optional): Number of leading rows which were already
+                validated, only the values of the remaining rows are checked. The checks
+                of `strict` are always based on all rows. Defaults to 0.
+
+        Raises:
+            ValueError: when a column of an input feature is missing.
+            ValueError: when a value of a numerical feature is not numerical.
+            ValueError: when a value of a categorical feature is not a category.
+            ValueError: when `strict` is set and a feature shows no variation.
+
+        Returns:
+            pd.DataFrame: The passed dataframe with experiments.
+        """
+        self._check_columns(experiments)
+        new = experiments.iloc[validated_rows:] if validated_rows > 0 else experiments
+        if len(self._numerical) > 0:
+            X = self._to_array(new, self._numerical)
+            if strict:
+                if validated_rows > 0:
+                    X = self._to_array(experiments, self._numerical)
+                lower = np.minimum(self._lower, X.min(axis=0, initial=np.inf))
+                upper = np.maximum(self._upper, X.max(axis=0, initial=-np.inf))
+                invariant = lower == upper
+                if invariant.any():
+                    key = self._numerical[int(np.argmax(invariant))].key
+                    raise ValueError(
+                        f"No variation present or planned for feature {key}. Remove it."
+                    )
+        for feat in self._categorical:
+            codes = self._get_codes(feat, new[feat.key])
+            if (codes < 0).any():
+                raise ValueError(
+                    f"invalid values for `{feat.key}`, allowed are: `{feat.categories}`"
+                )
+            if strict:
+                if validated_rows > 0:
+                    codes = self._get_codes(feat, experiments[feat.key])
+                possible = np.array(feat.allowed, dtype=bool)
+                possible[codes] = True
+                if not possible.all():
+                    unused = [c for c, p in zip(feat.categories, possible) if not p]
+                    raise ValueError(
+                        f"Categories {unused} of feature {feat.key} not used. Remove them."
+                    )
+        for feat in self._other:
+            feat.validate_experimental(
+                experiments[feat.key] if strict else new[feat.key], strict=strict
+            )
+        return experiments
+
+    def validate_candidates(self, candidates: pd.DataFrame) -> pd.DataFrame:
+        """Validates the input features of candidates.
+
+        Args:
+            candidates (pd.DataFrame): Dataframe with candidates.
+
+        Raises:
+            ValueError: when a column of an input feature is missing.
+            ValueError: when a value of a numerical feature is not numerical.
+            ValueError: when a value of a continuous feature violates its bounds.
+            ValueError: when a value of a discrete feature is not allowed.
+            ValueError: when a value of a categorical feature is not an allowed category.
+
+        Returns:
+            pd.DataFrame: The passed dataframe with candidates.
+        """
+        self._check_columns(candidates)
+        if len(self._numerical_candidates) > 0:
+            X = self._to_array(candidates, self._numerical_candidates)
+            below = (X < self._candidate_lower).any(axis=0)
+            if below.any():
+                feat = self._numerical_candidates[int(np.argmax(below))]
+                raise ValueError(
+                    f"not all values of input feature `{feat.key}`are larger than lower bound `{feat.lower_bound}` "
+                )
+            above = (X > self._candidate_upper).any(axis=0)
+            if above.any():
+                feat = self._numerical_candidates[int(np.argmax(above))]
+                raise ValueError(
+                    f"not all values of input feature `{feat.key}`are smaller than upper bound `{feat.upper_bound}` "
+                )
+            for i, feat in enumerate(self._numerical_candidates):
+                if (
+                    isinstance(feat, DiscreteInput)
+                    and not np.isin(X[:, i], np.array(feat.values)).all()
+                ):
+                    raise ValueError(
+                        f"Not allowed values in candidates for feature {feat.key}."
+                    )
+        for feat in self._categorical_candidates:
+            codes = self._get_codes(feat, candidates[feat.key])
+            if (codes < 0).any() or not self._allowed[feat.key][codes].all():
+                raise ValueError(
+                    f"not all values of input feature `{feat.key}` are a valid allowed category from {feat.get_allowed_categories()}"
+                )
+        for feat in self._other_candidates:
+            feat.validate_candidental(candidates[feat.key])
+        return candidates
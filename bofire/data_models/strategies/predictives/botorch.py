@@ -29,6 +29,9 @@ class BotorchStrategy(PredictiveStrategy):
     descriptor_method: CategoricalMethodEnum = CategoricalMethodEnum.EXHAUSTIVE
     categorical_method: CategoricalMethodEnum = CategoricalMethodEnum.EXHAUSTIVE
     discrete_method: CategoricalMethodEnum = CategoricalMethodEnum.EXHAUSTIVE
+    n_jobs: PositiveInt = 1
+    max_categorical_combinations: Optional[PositiveInt] = None
+    num_screening_samples: PositiveInt = 32
     surrogate_specs: Optional[BotorchSurrogates] = None
 
     @classmethod
@@ -61,6 +64,14 @@ class BotorchStrategy(PredictiveStrategy):
             )
         return v
 
+    @validator("num_screening_samples")
+    def validate_num_screening_samples(cls, v):
+        if is_power_of_two(v) is False:
+            raise ValueError(
+                "number screening samples have to be of the power of 2 to increase performance"
+            )
+        return v
+
     @root_validator(pre=False, skip_on_failure=True)
     def update_surrogate_specs_for_domain(cls, values):
         """Ensures that a prediction model is specified for each output feature"""
@@ -125,6 +136,12 @@ class BotorchStrategy(PredictiveStrategy):
                         outputs=Outputs(features=[domain.outputs.get_by_key(output_feature)]),  # type: ignore
                     )
                 )
-        surrogate_specs = BotorchSurrogates(surrogates=_surrogate_specs)
+        # further options of the passed specs are kept
+        options = (
+            {key: value for key, value in surrogate_specs if key != "surrogates"}
+            if surrogate_specs is not None
+            else {}
+        )
+        surrogate_specs = BotorchSurrogates(surrogates=_surrogate_specs, **options)
         surrogate_specs._check_compability(inputs=domain.inputs, outputs=domain.outputs)
         return surrogate_specs
@@ -17,6 +17,9 @@ try:
     from bofire.data_models.surrogates.random_forest import RandomForestSurrogate
     from bofire.data_models.surrogates.single_task_gp import SingleTaskGPSurrogate
     from bofire.data_models.surrogates.surrogate import Surrogate
+    from bofire.data_models.surrogates.variational_gp import (
+        SingleTaskVariationalGPSurrogate,
+    )
     from bofire.data_models.surrogates.xgb import XGBoostSurrogate
 
     AbstractSurrogate = Union[Surrogate, BotorchSurrogate, EmpiricalSurrogate]
@@ -29,6 +32,7 @@ try:
         MLPEnsemble,
         SaasSingleTaskGPSurrogate,
         XGBoostSurrogate,
+        SingleTaskVariationalGPSurrogate,
     ]
 except ImportError:
     # with the minimal installationwe don't have botorch
@@ -1,7 +1,7 @@
 import itertools
 from typing import List, Union
 
-from pydantic import validator
+from pydantic import PositiveInt, validator
 
 from bofire.data_models.base import BaseModel
 from bofire.data_models.domain.api import Inputs, Outputs
@@ -14,6 +14,9 @@ from bofire.data_models.surrogates.mixed_single_task_gp import (
 from bofire.data_models.surrogates.mlp import MLPEnsemble
 from bofire.data_models.surrogates.random_forest import RandomForestSurrogate
 from bofire.data_models.surrogates.single_task_gp import SingleTaskGPSurrogate
+from bofire.data_models.surrogates.variational_gp import (
+    SingleTaskVariationalGPSurrogate,
+)
 
 AnyBotorchSurrogate = Union[
     EmpiricalSurrogate,
@@ -22,15 +25,23 @@ AnyBotorchSurrogate = Union[
     MixedSingleTaskGPSurrogate,
     MLPEnsemble,
     SaasSingleTaskGPSurrogate,
+    SingleTaskVariationalGPSurrogate,
 ]
 
 
 class BotorchSurrogates(BaseModel):
     """ "List of botorch surrogates.
 
-    Behaves similar to a Surrogate."""
+    Behaves similar to a Surrogate.
+
+    Attributes:
+        surrogates (List[AnyBotorchSurrogate]): The surrogates, one per output.
+        n_jobs (PositiveInt): Number of worker processes in which the trainable surrogates
+            are fitted in parallel. Defaults to 1, meaning sequential fitting.
+    """
 
     surrogates: List[AnyBotorchSurrogate]
+    n_jobs: PositiveInt = 1
 
     @property
     def input_preprocessing_specs(self) -> TInputTransformSpecs:
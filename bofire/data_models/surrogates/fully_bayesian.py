@@ -1,17 +1,51 @@
-from typing import Literal
+from typing import Literal, Optional
 
-from pydantic import conint, validator
+from pydantic import PositiveFloat, PositiveInt, conint, validator
 
 from bofire.data_models.surrogates.botorch import BotorchSurrogate
 from bofire.data_models.surrogates.scaler import ScalerEnum
 
 
 class SaasSingleTaskGPSurrogate(BotorchSurrogate):
+    """Fully Bayesian single task GP with a SAAS prior, fitted by NUTS.
+
+    Attributes:
+        warmup_steps (int): Number of warmup steps of NUTS.
+        num_samples (int): Number of MCMC samples, summed over all chains.
+        thinning (int): Every `thinning`-th sample of a chain is retained.
+        scaler (ScalerEnum): Scaler for the inputs.
+        warm_start (bool): If True, a refit after at most `warm_start_max_new_rows`
+            experiments were appended to the previous training data starts the chains
+            at the previous posterior samples and uses `warm_start_warmup_steps`.
+        warm_start_max_new_rows (PositiveInt): Maximal number of new experiments for
+            a warm start.
+        warm_start_warmup_steps (int): Number of warmup steps of a warm started fit.
+        n_chains (PositiveInt): Number of chains, more than one chain is run in
+            parallel processes.
+        latency_budget (PositiveFloat, optional): Time budget of NUTS in seconds. If
+            it is exceeded, a MAP estimate of the hyperparameters is used instead.
+        cached_prediction (bool): If True, means and standard deviations are predicted
+            from Cholesky factors of the training covariances of the MCMC draws, which
+            are computed once per fit and reused across calls.
+        max_prediction_draws (PositiveInt, optional): In the cached prediction, at most
+            this many evenly spaced MCMC draws are used for the mixture.
+        prediction_batch_size (PositiveInt): Number of candidates which are predicted
+            at once in the cached prediction, this bounds the memory usage.
+    """
+
     type: Literal["SaasSingleTaskGPSurrogate"] = "SaasSingleTaskGPSurrogate"
     warmup_steps: conint(ge=1) = 256  # type: ignore
     num_samples: conint(ge=1) = 128  # type: ignore
     thinning: conint(ge=1) = 16  # type: ignore
     scaler: ScalerEnum = ScalerEnum.NORMALIZE
+    warm_start: bool = False
+    warm_start_max_new_rows: PositiveInt = 5
+    warm_start_warmup_steps: conint(ge=1) = 32  # type: ignore
+    n_chains: PositiveInt = 1
+    latency_budget: Optional[PositiveFloat] = None
+    cached_prediction: bool = False
+    max_prediction_draws: Optional[PositiveInt] = None
+    prediction_batch_size: PositiveInt = 1024
 
     @validator("thinning")
     def validate_thinning(cls, value, values):
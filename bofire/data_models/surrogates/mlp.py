@@ -1,10 +1,28 @@
-from typing import Literal, Sequence
+from typing import Literal, Optional, Sequence
+
+from pydantic import Field, PositiveInt
+from typing_extensions import Annotated
 
 from bofire.data_models.surrogates.botorch import BotorchSurrogate
 from bofire.data_models.surrogates.scaler import ScalerEnum
 
 
 class MLPEnsemble(BotorchSurrogate):
+    """Ensemble of MLPs trained on bootstrap samples of the data.
+
+    Attributes:
+        early_stopping_patience (Optional[PositiveInt]): If given, the training of a member
+            is stopped when its validation loss has not improved for this number of epochs,
+            and the parameters of the epoch with the best validation loss are restored.
+        validation_fraction (float): Fraction of the experiments held out per member as
+            validation set. If 0, the out-of-bag experiments of the bootstrap sample of a
+            member are used as validation set.
+        lr_schedule (Literal["constant", "cosine"]): Schedule of the learning rate over
+            the epochs.
+        full_batch (bool): If True, every epoch is a single gradient step on the whole
+            bootstrap sample of a member and `batch_size` is ignored.
+    """
+
     type: Literal["MLPEnsemble"] = "MLPEnsemble"
     n_estimators: int
     hidden_layer_sizes: Sequence = (100,)
@@ -17,3 +35,7 @@ class MLPEnsemble(BotorchSurrogate):
     subsample_fraction: float = 1.0
     shuffle: bool = True
     scaler: ScalerEnum = ScalerEnum.NORMALIZE
+    early_stopping_patience: Optional[PositiveInt] = None
+    validation_fraction: Annotated[float, Field(ge=0.0, lt=1.0)] = 0.0
+    lr_schedule: Literal["constant", "cosine"] = "constant"
+    full_batch: bool = False
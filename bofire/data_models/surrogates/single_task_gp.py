@@ -1,6 +1,6 @@
 from typing import Literal
 
-from pydantic import Field
+from pydantic import Field, PositiveInt
 
 from bofire.data_models.kernels.api import AnyKernel, MaternKernel, ScaleKernel
 from bofire.data_models.priors.api import (
@@ -28,3 +28,5 @@ class SingleTaskGPSurrogate(BotorchSurrogate):
     )
     noise_prior: AnyPrior = Field(default_factory=lambda: BOTORCH_NOISE_PRIOR())
     scaler: ScalerEnum = ScalerEnum.NORMALIZE
+    warm_start: bool = False
+    refit_interval: PositiveInt = 1
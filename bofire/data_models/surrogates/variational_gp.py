@@ -0,0 +1,53 @@
+from typing import Literal
+
+from pydantic import Field, PositiveFloat, PositiveInt
+
+from bofire.data_models.kernels.api import AnyKernel, MaternKernel, ScaleKernel
+from bofire.data_models.priors.api import (
+    BOTORCH_LENGTHCALE_PRIOR,
+    BOTORCH_NOISE_PRIOR,
+    BOTORCH_SCALE_PRIOR,
+    AnyPrior,
+)
+from bofire.data_models.surrogates.botorch import BotorchSurrogate
+from bofire.data_models.surrogates.scaler import ScalerEnum
+
+
+class SingleTaskVariationalGPSurrogate(BotorchSurrogate):
+    """Sparse variational GP with inducing points for large numbers of experiments.
+
+    The fit scales linearly in the number of experiments as the GP is approximated
+    by `n_inducing_points` inducing points, and the variational ELBO is optimized
+    on minibatches.
+
+    Attributes:
+        n_inducing_points (PositiveInt): Maximal number of inducing points. If there are
+            fewer experiments, all experiments are used as inducing points.
+        learn_inducing_points (bool): If True, the locations of the inducing points are
+            optimized together with the hyperparameters.
+        batch_size (PositiveInt): Number of experiments per minibatch.
+        n_epochs (PositiveInt): Number of passes over the experiments.
+        lr (PositiveFloat): Learning rate of the Adam optimizer.
+    """
+
+    type: Literal[
+        "SingleTaskVariationalGPSurrogate"
+    ] = "SingleTaskVariationalGPSurrogate"
+
+    kernel: AnyKernel = Field(
+        default_factory=lambda: ScaleKernel(
+            base_kernel=MaternKernel(
+                ard=True,
+                nu=2.5,
+                lengthscale_prior=BOTORCH_LENGTHCALE_PRIOR(),
+            ),
+            outputscale_prior=BOTORCH_SCALE_PRIOR(),
+        )
+    )
+    noise_prior: AnyPrior = Field(default_factory=lambda: BOTORCH_NOISE_PRIOR())
+    scaler: ScalerEnum = ScalerEnum.NORMALIZE
+    n_inducing_points: PositiveInt = 128
+    learn_inducing_points: bool = True
+    batch_size: PositiveInt = 256
+    n_epochs: PositiveInt = 100
+    lr: PositiveFloat = 0.05
@@ -1,6 +1,6 @@
 from typing import Literal, Optional
 
-from pydantic import Field, validator
+from pydantic import Field, PositiveInt, validator
 from typing_extensions import Annotated
 
 from bofire.data_models.enum import CategoricalEncodingEnum
@@ -13,6 +13,22 @@ from bofire.data_models.surrogates.botorch import BotorchSurrogate
 
 
 class XGBoostSurrogate(BotorchSurrogate):
+    """Gradient boosted trees via XGBoost.
+
+    Besides the XGBoost hyperparameters, the following attributes control refits
+    and predictions:
+
+    Attributes:
+        refit_interval (PositiveInt): The booster is only trained from scratch at every
+            `refit_interval`-th fit. In between, if experiments were appended to the
+            previous training data, boosting is continued from the previous booster
+            with `update_n_estimators` additional trees.
+        update_n_estimators (PositiveInt): Number of trees which are added to the
+            booster in an incremental fit.
+        predict_n_jobs (PositiveInt, optional): Number of threads used for prediction,
+            None uses all available cores.
+    """
+
     type: Literal["XGBoostSurrogate"] = "XGBoostSurrogate"
     n_estimators: int
     max_depth: Annotated[int, Field(ge=0)] = 6
@@ -41,6 +57,9 @@ class XGBoostSurrogate(BotorchSurrogate):
     scale_pos_weight: Annotated[float, Field(ge=0)] = 1
     random_state: Optional[Annotated[int, Field(ge=0)]] = None
     num_parallel_tree: Annotated[int, Field(gt=0)] = 1
+    refit_interval: PositiveInt = 1
+    update_n_estimators: PositiveInt = 10
+    predict_n_jobs: Optional[PositiveInt] = None
 
     @validator("input_preprocessing_specs", always=True)
     def validate_input_preprocessing_specs(cls, v, values):
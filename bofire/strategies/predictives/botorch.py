@@ -1,6 +1,18 @@
-import copy
+import heapq
+import itertools
 from abc import abstractmethod
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import numpy as np
 import pandas as pd
@@ -14,6 +26,8 @@ from botorch.optim.optimize import (
     optimize_acqf_list,
     optimize_acqf_mixed,
 )
+from botorch.utils.sampling import draw_sobol_samples
+from multiprocess.pool import Pool
 from torch import Tensor
 
 from bofire.data_models.constraints.api import (
@@ -36,6 +50,7 @@ from bofire.data_models.strategies.api import (
 from bofire.strategies.predictives.predictive import PredictiveStrategy
 from bofire.strategies.samplers.polytope import PolytopeSampler
 from bofire.surrogates.botorch_surrogates import BotorchSurrogates
+from bofire.utils.memmap import MemmapExperiments
 from bofire.utils.torch_tools import (
     get_initial_conditions_generator,
     get_linear_constraints,
@@ -48,6 +63,21 @@ def is_power_of_two(n):
     return (n != 0) and (n & (n - 1) == 0)
 
 
+def _optimize_acqf_seeded(seed: int, kwargs: Dict[str, Any]) -> Tuple[Tensor, Tensor]:
+    """Runs `optimize_acqf` in a worker process after seeding torch.
+
+    Args:
+        seed (int): Seed for the torch random number generator of the worker.
+        kwargs (Dict[str, Any]): Keyword arguments passed to `optimize_acqf`.
+
+    Returns:
+        Tuple[Tensor, Tensor]: Best candidates and their acquisition value.
+    """
+    torch.set_num_threads(1)
+    torch.manual_seed(seed)
+    return optimize_acqf(**kwargs)
+
+
 class BotorchStrategy(PredictiveStrategy):
     def __init__(
         self,
@@ -61,7 +91,15 @@ class BotorchStrategy(PredictiveStrategy):
         self.descriptor_method = data_model.descriptor_method
         self.categorical_method = data_model.categorical_method
         self.discrete_method = data_model.discrete_method
+        self.n_jobs = data_model.n_jobs
+        self.max_categorical_combinations = data_model.max_categorical_combinations
+        self.num_screening_samples = data_model.num_screening_samples
         self.surrogate_specs = BotorchSurrogates(data_model=data_model.surrogate_specs)  # type: ignore
+        self._transform_info: Optional[
+            Tuple[Dict[str, Tuple[int]], Dict[str, Tuple[str]]]
+        ] = None
+        self._X_train_cache: Optional[Tuple[int, Tensor]] = None
+        self._X_pending_cache: Optional[Tuple[int, Optional[Tensor]]] = None
         torch.manual_seed(self.seed)
 
     model: Optional[GPyTorchModel] = None
@@ -72,19 +110,32 @@ class BotorchStrategy(PredictiveStrategy):
 
     @property
     def _features2idx(self) -> Dict[str, Tuple[int]]:
-        features2idx, _ = self.domain.inputs._get_transform_info(
-            self.input_preprocessing_specs
-        )
+        features2idx, _ = self._get_transform_info()
         return features2idx
 
     @property
     def _features2names(self) -> Dict[str, Tuple[str]]:
-        _, features2names = self.domain.inputs._get_transform_info(
-            self.input_preprocessing_specs
-        )
+        _, features2names = self._get_transform_info()
         return features2names
 
-    def _fit(self, experiments: pd.DataFrame):
+    def _get_transform_info(
+        self,
+    ) -> Tuple[Dict[str, Tuple[int]], Dict[str, Tuple[str]]]:
+        """Returns the index and name maps of the transformed input features.
+
+        They only depend on the domain and the surrogate specs, which are both fixed
+        after the instantiation of the strategy, so they are computed only once.
+
+        Returns:
+            Tuple[Dict[str, Tuple[int]], Dict[str, Tuple[str]]]: features2idx and features2names
+        """
+        if self._transform_info is None:
+            self._transform_info = self.domain.inputs._get_transform_info(
+                self.input_preprocessing_specs
+            )
+        return self._transform_info  # type: ignore
+
+    def _fit(self, experiments: Union[pd.DataFrame, MemmapExperiments]):
         """[summary]
 
         Args:
@@ -127,10 +178,11 @@ class BotorchStrategy(PredictiveStrategy):
         """
         acqf = self._get_acqfs(1)[0]
 
-        transformed = self.domain.inputs.transform(
-            candidates, self.input_preprocessing_specs
-        )
-        X = torch.from_numpy(transformed.values).to(**tkwargs)
+        X = torch.from_numpy(
+            self.domain.inputs.get_encoder(
+                self.input_preprocessing_specs
+            ).transform_array(candidates)
+        ).to(**tkwargs)
         if combined is False:
             X = X.unsqueeze(-2)
 
@@ -144,8 +196,8 @@ class BotorchStrategy(PredictiveStrategy):
         num_categorical_features = len(
             self.domain.get_features([CategoricalInput, DiscreteInput])
         )
-        num_categorical_combinations = len(
-            self.domain.inputs.get_categorical_combinations()
+        num_categorical_combinations = (
+            self.domain.inputs.get_number_of_categorical_combinations()
         )
         lower, upper = self.domain.inputs.get_bounds(
             specs=self.input_preprocessing_specs
@@ -186,7 +238,16 @@ class BotorchStrategy(PredictiveStrategy):
             fixed_features_list = None
         else:
             fixed_features = None
-            fixed_features_list = self.get_categorical_combinations()
+            if (
+                self.max_categorical_combinations is not None
+                and self.get_number_of_categorical_combinations()
+                > self.max_categorical_combinations
+            ):
+                # the combinations are screened in `_ask`, for this purpose they
+                # are only generated lazily here.
+                fixed_features_list = self.iter_categorical_combinations()
+            else:
+                fixed_features_list = self.get_categorical_combinations()
         return (
             bounds,
             ic_generator,
@@ -245,7 +306,25 @@ class BotorchStrategy(PredictiveStrategy):
 
         acqfs = self._get_acqfs(candidate_count)
 
-        if len(acqfs) > 1:
+        if fixed_features_list is not None and not isinstance(
+            fixed_features_list, list
+        ):
+            fixed_features_list = self._screen_categorical_combinations(
+                acqfs=acqfs, bounds=bounds, fixed_features_list=fixed_features_list
+            )
+
+        if self.n_jobs > 1:
+            candidates = self._ask_parallel(
+                acqfs=acqfs,
+                candidate_count=candidate_count,
+                bounds=bounds,
+                ic_generator=ic_generator,
+                ic_gen_kwargs=ic_gen_kwargs,
+                nchooseks=nchooseks,
+                fixed_features=fixed_features,
+                fixed_features_list=fixed_features_list,
+            )
+        elif len(acqfs) > 1:
             candidates, _ = optimize_acqf_list(
                 acq_function_list=acqfs,
                 bounds=bounds,
@@ -304,6 +383,174 @@ class BotorchStrategy(PredictiveStrategy):
                 )
         return self._postprocess_candidates(candidates=candidates)
 
+    def _ask_parallel(
+        self,
+        acqfs: List[AcquisitionFunction],
+        candidate_count: int,
+        bounds: Tensor,
+        ic_generator: Optional[Callable],
+        ic_gen_kwargs: Dict,
+        nchooseks: Optional[List[Callable[[Tensor], float]]],
+        fixed_features: Optional[Dict[int, float]],
+        fixed_features_list: Optional[List[Dict[int, float]]],
+    ) -> Tensor:
+        """Optimizes the acquisition function(s) by distributing the restarts and
+        the fixed feature combinations over a pool of `n_jobs` worker processes.
+
+        The sequential greedy logic of `optimize_acqf_list` and `optimize_acqf_mixed`
+        is kept in the main process, only the individual multi-start optimizations
+        are executed in the workers. Every worker is seeded from the strategy's
+        random number generator, so that the results are reproducible for a fixed
+        seed and a fixed number of jobs.
+
+        Args:
+            acqfs (List[AcquisitionFunction]): Acquisition functions to optimize.
+            candidate_count (int): Number of candidates to generate.
+            bounds (Tensor): Bounds of the optimization problem.
+            ic_generator (Optional[Callable]): Generator for the initial conditions.
+            ic_gen_kwargs (Dict): Keyword arguments for the initial conditions generator.
+            nchooseks (Optional[List[Callable[[Tensor], float]]]): Relaxed NChooseK constraints.
+            fixed_features (Optional[Dict[int, float]]): Fixed features.
+            fixed_features_list (Optional[List[Dict[int, float]]]): List of fixed
+                feature combinations to optimize over.
+
+        Returns:
+            Tensor: `candidate_count x d`-dim tensor with the generated candidates.
+        """
+        common_kwargs = {
+            "bounds": bounds,
+            "raw_samples": self.num_raw_samples,
+            "equality_constraints": get_linear_constraints(
+                domain=self.domain, constraint=LinearEqualityConstraint  # type: ignore
+            ),
+            "inequality_constraints": get_linear_constraints(
+                domain=self.domain, constraint=LinearInequalityConstraint  # type: ignore
+            ),
+            "nonlinear_inequality_constraints": nchooseks,
+            "return_best_only": True,
+            "ic_generator": ic_generator,
+            **ic_gen_kwargs,
+        }
+        fixed_features_list = fixed_features_list or [fixed_features or {}]
+
+        with Pool(self.n_jobs) as pool:
+            if len(acqfs) > 1:
+                common_kwargs["options"] = {"batch_limit": 5, "maxiter": 200}
+                return self._optimize_acqfs_sequentially(
+                    pool=pool,
+                    acqfs=acqfs,
+                    fixed_features_list=fixed_features_list,
+                    common_kwargs=common_kwargs,
+                )
+            if len(fixed_features_list) == 1:
+                candidates, _ = self._optimize_acqf_on_pool(
+                    pool=pool,
+                    acqf=acqfs[0],
+                    q=candidate_count,
+                    fixed_features_list=fixed_features_list,
+                    common_kwargs=common_kwargs,
+                )
+                return candidates
+            # in the mixed case we do sequential greedy optimization as
+            # `optimize_acqf_mixed` does.
+            return self._optimize_acqfs_sequentially(
+                pool=pool,
+                acqfs=[acqfs[0] for _ in range(candidate_count)],
+                fixed_features_list=fixed_features_list,
+                common_kwargs=common_kwargs,
+            )
+
+    def _optimize_acqfs_sequentially(
+        self,
+        pool: Pool,
+        acqfs: List[AcquisitionFunction],
+        fixed_features_list: List[Dict[int, float]],
+        common_kwargs: Dict[str, Any],
+    ) -> Tensor:
+        """Sequential greedy optimization of a list of acquisition functions, in which
+        the previously generated candidates are set as pending to the next one.
+
+        Args:
+            pool (Pool): Pool of worker processes.
+            acqfs (List[AcquisitionFunction]): Acquisition functions to optimize.
+            fixed_features_list (List[Dict[int, float]]): List of fixed feature
+                combinations to optimize over.
+            common_kwargs (Dict[str, Any]): Keyword arguments passed to `optimize_acqf`.
+
+        Returns:
+            Tensor: `len(acqfs) x d`-dim tensor with the generated candidates.
+        """
+        base_X_pending = {id(acqf): acqf.X_pending for acqf in acqfs}
+        candidates = torch.tensor([], dtype=common_kwargs["bounds"].dtype)
+        for acqf in acqfs:
+            if len(candidates) > 0:
+                X_pending = base_X_pending[id(acqf)]
+                acqf.set_X_pending(
+                    torch.cat([X_pending, candidates], dim=-2)
+                    if X_pending is not None
+                    else candidates
+                )
+            candidate, _ = self._optimize_acqf_on_pool(
+                pool=pool,
+                acqf=acqf,
+                q=1,
+                fixed_features_list=fixed_features_list,
+                common_kwargs=common_kwargs,
+            )
+            candidates = torch.cat([candidates, candidate], dim=-2)
+        for acqf in acqfs:
+            acqf.set_X_pending(base_X_pending[id(acqf)])
+        return candidates
+
+    def _optimize_acqf_on_pool(
+        self,
+        pool: Pool,
+        acqf: AcquisitionFunction,
+        q: int,
+        fixed_features_list: List[Dict[int, float]],
+        common_kwargs: Dict[str, Any],
+    ) -> Tuple[Tensor, Tensor]:
+        """Splits one multi-start optimization into tasks over the fixed feature
+        combinations and chunks of restarts, runs them on the pool and returns the
+        best candidates over all tasks.
+
+        Args:
+            pool (Pool): Pool of worker processes.
+            acqf (AcquisitionFunction): Acquisition function to optimize.
+            q (int): Number of candidates to generate jointly.
+            fixed_features_list (List[Dict[int, float]]): List of fixed feature
+                combinations to optimize over.
+            common_kwargs (Dict[str, Any]): Keyword arguments passed to `optimize_acqf`.
+
+        Returns:
+            Tuple[Tensor, Tensor]: Best candidates and their acquisition value.
+        """
+        n_chunks = min(
+            self.num_restarts, max(1, self.n_jobs // len(fixed_features_list))
+        )
+        restarts = [
+            len(chunk)
+            for chunk in np.array_split(np.arange(self.num_restarts), n_chunks)
+        ]
+        tasks = [
+            {
+                **common_kwargs,
+                "acq_function": acqf,
+                "q": q,
+                "num_restarts": num_restarts,
+                "fixed_features": fixed_features,
+            }
+            for fixed_features in fixed_features_list
+            for num_restarts in restarts
+        ]
+        seeds = self.rng.integers(np.iinfo(np.int32).max, size=len(tasks)).tolist()
+        results = pool.starmap(_optimize_acqf_seeded, zip(seeds, tasks))
+        acq_values = torch.stack(
+            [acq_value.reshape(-1).sum() for _, acq_value in results]
+        )
+        best = int(torch.argmax(acq_values))
+        return results[best]
+
     def _tell(self) -> None:
         pass
 
@@ -380,8 +627,17 @@ class BotorchStrategy(PredictiveStrategy):
         Returns:
             list_of_fixed_features List[dict]: Each dict contains a combination of fixed values
         """
-        fixed_basis = self.get_fixed_features()
+        return list(self.iter_categorical_combinations())
 
+    def _get_categorical_combinations_filter(
+        self,
+    ) -> Optional[Tuple[Union[Type, List[Type]], Optional[Type]]]:
+        """Returns the feature types that have to be enumerated exhaustively.
+
+        Returns:
+            Optional[Tuple[Union[Type, List[Type]], Optional[Type]]]: Tuple of included
+                and excluded feature types, None if all methods are `FREE`.
+        """
         methods = [
             self.descriptor_method,
             self.discrete_method,
@@ -389,105 +645,216 @@ class BotorchStrategy(PredictiveStrategy):
         ]
 
         if all(m == CategoricalMethodEnum.FREE for m in methods):
-            return [{}]
-        else:
-            include = []
-            exclude = None
+            return None
 
-            if self.discrete_method == CategoricalMethodEnum.EXHAUSTIVE:
-                include.append(DiscreteInput)
+        include = []
+        exclude = None
 
-            if self.categorical_method == CategoricalMethodEnum.EXHAUSTIVE:
-                include.append(CategoricalInput)
-                exclude = CategoricalDescriptorInput
+        if self.discrete_method == CategoricalMethodEnum.EXHAUSTIVE:
+            include.append(DiscreteInput)
 
-            if self.descriptor_method == CategoricalMethodEnum.EXHAUSTIVE:
-                include.append(CategoricalDescriptorInput)
-                exclude = None
+        if self.categorical_method == CategoricalMethodEnum.EXHAUSTIVE:
+            include.append(CategoricalInput)
+            exclude = CategoricalDescriptorInput
+
+        if self.descriptor_method == CategoricalMethodEnum.EXHAUSTIVE:
+            include.append(CategoricalDescriptorInput)
+            exclude = None
 
-        if not include:
-            include = None
+        return (include if include else Input), exclude
 
-        combos = self.domain.inputs.get_categorical_combinations(
-            include=(include if include else Input), exclude=exclude
+    def get_number_of_categorical_combinations(self) -> int:
+        """Returns the number of fixed feature combinations generated by
+        `iter_categorical_combinations` without enumerating them.
+
+        Returns:
+            int: Number of combinations.
+        """
+        combinations_filter = self._get_categorical_combinations_filter()
+        if combinations_filter is None:
+            return 1
+        include, exclude = combinations_filter
+        return self.domain.inputs.get_number_of_categorical_combinations(
+            include=include, exclude=exclude
         )
-        # now build up the fixed feature list
-        if len(combos) == 1:
-            return [fixed_basis]
-        else:
-            features2idx = self._features2idx
-            list_of_fixed_features = []
 
-            for combo in combos:
-                fixed_features = copy.deepcopy(fixed_basis)
+    def iter_categorical_combinations(self) -> Iterator[Dict[int, float]]:
+        """Lazily generates all possible combinations of fixed values.
+
+        Yields:
+            Dict[int, float]: Combination of fixed values, keys are the feature indices,
+                values the transformed feature values.
+        """
+        fixed_basis = self.get_fixed_features()
 
-                for pair in combo:
-                    feat, val = pair
-                    feature = self.domain.get_feature(feat)
-                    if (
-                        isinstance(feature, CategoricalDescriptorInput)
-                        and self.input_preprocessing_specs[feat]
-                        == CategoricalEncodingEnum.DESCRIPTOR
-                    ):
-                        index = feature.categories.index(val)
+        combinations_filter = self._get_categorical_combinations_filter()
+        if combinations_filter is None:
+            yield {}
+            return
+        include, exclude = combinations_filter
+
+        if (
+            self.domain.inputs.get_number_of_categorical_combinations(
+                include=include, exclude=exclude
+            )
+            == 1
+        ):
+            yield fixed_basis
+            return
 
-                        for j, idx in enumerate(features2idx[feat]):
-                            fixed_features[idx] = feature.values[index][j]
+        # the transformed values are computed once per feature and level instead of
+        # once per combination
+        features2idx = self._features2idx
+        encodings = {}
+        for levels in self.domain.inputs._get_categorical_levels(
+            include=include, exclude=exclude
+        ):
+            for feat, val in levels:
+                feature = self.domain.get_feature(feat)
+                if (
+                    isinstance(feature, CategoricalDescriptorInput)
+                    and self.input_preprocessing_specs[feat]
+                    == CategoricalEncodingEnum.DESCRIPTOR
+                ):
+                    index = feature.categories.index(val)
+                    encoded = {
+                        idx: feature.values[index][j]
+                        for j, idx in enumerate(features2idx[feat])
+                    }
+                elif isinstance(feature, CategoricalInput):
+                    # it has to be onehot in this case
+                    transformed = feature.to_onehot_encoding(pd.Series([val]))
+                    encoded = {
+                        idx: transformed.values[0, j]
+                        for j, idx in enumerate(features2idx[feat])
+                    }
+                elif isinstance(feature, DiscreteInput):
+                    encoded = {features2idx[feat][0]: val}
+                else:
+                    encoded = {}
+                encodings[(feat, val)] = encoded
+
+        for combo in self.domain.inputs.iter_categorical_combinations(
+            include=include, exclude=exclude
+        ):
+            fixed_features = dict(fixed_basis)
+            for pair in combo:
+                fixed_features.update(encodings[pair])
+            yield fixed_features
 
-                    elif isinstance(feature, CategoricalInput):
-                        # it has to be onehot in this case
-                        transformed = feature.to_onehot_encoding(pd.Series([val]))
-                        for j, idx in enumerate(features2idx[feat]):
-                            fixed_features[idx] = transformed.values[0, j]
+    def _screen_categorical_combinations(
+        self,
+        acqfs: List[AcquisitionFunction],
+        bounds: Tensor,
+        fixed_features_list: Iterable[Dict[int, float]],
+    ) -> List[Dict[int, float]]:
+        """Scores every combination of fixed values on a common set of cheap raw
+        samples and returns the `max_categorical_combinations` most promising ones.
+
+        The raw samples are drawn once from a scrambled sobol sequence within the
+        bounds, the fixed values of every combination are plugged in and the
+        acquisition values of whole chunks of combinations are computed in one
+        batched call. The score of a combination is its maximal acquisition value
+        over the raw samples (and over the acquisition functions if more than one
+        is provided). Constraints are not taken into account during the screening.
 
-                    elif isinstance(feature, DiscreteInput):
-                        fixed_features[features2idx[feat][0]] = val
+        Args:
+            acqfs (List[AcquisitionFunction]): Acquisition functions used for scoring.
+            bounds (Tensor): Bounds of the optimization problem.
+            fixed_features_list (Iterable[Dict[int, float]]): Combinations of fixed values.
 
-                list_of_fixed_features.append(fixed_features)
-        return list_of_fixed_features
+        Returns:
+            List[Dict[int, float]]: The best combinations in the order of their enumeration.
+        """
+        assert self.max_categorical_combinations is not None
+        X = draw_sobol_samples(
+            bounds=bounds, n=self.num_screening_samples, q=1, seed=self.seed
+        ).squeeze(-2)
+        n, d = X.shape
+        chunk_size = max(1, self.num_raw_samples // n)
+        # min-heap holding the best (score, -position, combination) triples
+        heap = []
+        fixed_features_iter = enumerate(fixed_features_list)
+        while True:
+            chunk = list(itertools.islice(fixed_features_iter, chunk_size))
+            if len(chunk) == 0:
+                break
+            values = torch.zeros((len(chunk), d), **tkwargs)
+            mask = torch.zeros((len(chunk), d), dtype=torch.bool)
+            for i, (_, fixed_features) in enumerate(chunk):
+                for idx, val in fixed_features.items():
+                    values[i, idx] = val
+                    mask[i, idx] = True
+            Xc = torch.where(mask.unsqueeze(-2), values.unsqueeze(-2), X)
+            with torch.no_grad():
+                scores = torch.stack(
+                    [
+                        acqf(Xc.reshape(-1, 1, d)).reshape(len(chunk), n).max(dim=-1)[0]
+                        for acqf in acqfs
+                    ]
+                ).max(dim=0)[0]
+            for score, (position, fixed_features) in zip(scores.tolist(), chunk):
+                item = (score, -position, fixed_features)
+                if len(heap) < self.max_categorical_combinations:
+                    heapq.heappush(heap, item)
+                elif item[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, item)
+        return [item[2] for item in sorted(heap, key=lambda item: -item[1])]
 
     def has_sufficient_experiments(
         self,
     ) -> bool:
         if self.experiments is None:
             return False
-        if (
-            len(
-                self.domain.outputs.preprocess_experiments_all_valid_outputs(
-                    experiments=self.experiments
-                )
-            )
-            > 1
-        ):
+        if self._valid_outputs_mask().sum() > 1:
             return True
         return False
 
-    def get_acqf_input_tensors(self):
-        experiments = self.domain.outputs.preprocess_experiments_all_valid_outputs(
-            self.experiments
-        )
+    def get_acqf_input_tensors(self) -> Tuple[Tensor, Optional[Tensor]]:
+        """Returns the transformed training inputs and pending candidates as tensors.
 
-        # TODO: should this be selectable?
-        clean_experiments = experiments.drop_duplicates(
-            subset=[var.key for var in self.domain.get_features(Input)],
-            keep="first",
-            inplace=False,
-        )
+        The tensors are cached and only recomputed when the experiments or the
+        candidates of the strategy have been changed.
 
-        transformed = self.domain.inputs.transform(
-            clean_experiments, self.input_preprocessing_specs
-        )
-        X_train = torch.from_numpy(transformed.values).to(**tkwargs)
+        Returns:
+            Tuple[Tensor, Optional[Tensor]]: X_train and X_pending, X_pending is None
+                if no candidates are present.
+        """
+        if (
+            self._X_train_cache is None
+            or self._X_train_cache[0] != self._experiment_store.version
+        ):
+            experiments = self.experiments.loc[self._valid_outputs_mask()]
 
-        if self.candidates is not None:
-            transformed_candidates = self.domain.inputs.transform(
-                self.candidates, self.input_preprocessing_specs
+            # TODO: should this be selectable?
+            clean_experiments = experiments.drop_duplicates(
+                subset=[var.key for var in self.domain.get_features(Input)],
+                keep="first",
+                inplace=False,
             )
-            X_pending = torch.from_numpy(transformed_candidates.values).to(**tkwargs)
-        else:
-            X_pending = None
 
-        return X_train, X_pending
+            encoder = self.domain.inputs.get_encoder(self.input_preprocessing_specs)
+            self._X_train_cache = (
+                self._experiment_store.version,
+                torch.from_numpy(encoder.transform_array(clean_experiments)).to(
+                    **tkwargs
+                ),
+            )
+
+        if (
+            self._X_pending_cache is None
+            or self._X_pending_cache[0] != self._candidate_store.version
+        ):
+            if self.candidates is not None:
+                encoder = self.domain.inputs.get_encoder(self.input_preprocessing_specs)
+                X_pending = torch.from_numpy(
+                    encoder.transform_array(self.candidates)
+                ).to(**tkwargs)
+            else:
+                X_pending = None
+            self._X_pending_cache = (self._candidate_store.version, X_pending)
+
+        return self._X_train_cache[1], self._X_pending_cache[1]
 
     def get_infeasible_cost(
         self, objective: Callable[[Tensor, Tensor], Tensor], n_samples=128
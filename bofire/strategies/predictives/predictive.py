@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -10,6 +10,8 @@ from bofire.data_models.strategies.api import Strategy as DataModel
 from bofire.strategies.data_models.candidate import Candidate
 from bofire.strategies.data_models.values import InputValue, OutputValue
 from bofire.strategies.strategy import Strategy
+from bofire.utils.chunking import iter_chunks
+from bofire.utils.memmap import MemmapExperiments
 
 
 class PredictiveStrategy(Strategy):
@@ -59,12 +61,16 @@ class PredictiveStrategy(Strategy):
         return candidates
 
     def tell(
-        self, experiments: pd.DataFrame, replace: bool = False, retrain: bool = True
+        self,
+        experiments: Union[pd.DataFrame, MemmapExperiments],
+        replace: bool = False,
+        retrain: bool = True,
     ):
         """This function passes new experimental data to the optimizer.
 
         Args:
-            experiments (pd.DataFrame): DataFrame with experimental data
+            experiments (Union[pd.DataFrame, MemmapExperiments]): DataFrame with experimental data
+                or experiments stored on disk
             replace (bool, optional): Boolean to decide if the experimental data should replace the former dataFrame or if the new experiments should be attached. Defaults to False.
             retrain (bool, optional): If True, model(s) are retrained when new experimental data is passed to the optimizer. Defaults to True.
         """
@@ -82,17 +88,67 @@ class PredictiveStrategy(Strategy):
             # to fitting the models like initializing the ACQF.
             self._tell()
 
-    def predict(self, experiments: pd.DataFrame) -> pd.DataFrame:
+    def predict(
+        self, experiments: pd.DataFrame, chunk_size: Optional[int] = None
+    ) -> pd.DataFrame:
         """Run predictions for the provided experiments. Only input features have to be provided.
 
         Args:
             experiments (pd.DataFrame): Experimental data for which predictions should be performed.
+            chunk_size (Optional[int], optional): If provided, the predictions are computed
+                in chunks of at most `chunk_size` rows and written into a preallocated array,
+                which bounds the peak memory for large datasets. Defaults to None.
 
         Returns:
             pd.DataFrame: Dataframe with the predicted values.
         """
         if self.is_fitted is not True:
             raise ValueError("Model not yet fitted.")
+        if chunk_size is None or len(experiments) <= chunk_size:
+            return self._predict_chunk(experiments)
+        data, columns = None, None
+        start = 0
+        for chunk in iter_chunks(experiments, chunk_size=chunk_size):
+            predictions = self._predict_chunk(chunk)
+            if data is None:
+                data = np.empty((len(experiments), predictions.shape[1]))
+                columns = predictions.columns
+            data[start : start + len(chunk)] = predictions.values
+            start += len(chunk)
+        return pd.DataFrame(data=data, columns=columns, index=experiments.index)
+
+    def predict_batches(
+        self,
+        experiments: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Run predictions chunk by chunk, only one chunk is held in memory at a time.
+
+        Args:
+            experiments (Union[pd.DataFrame, Iterable[pd.DataFrame]]): Dataframe or iterable of
+                dataframes for which predictions should be performed.
+            chunk_size (Optional[int], optional): Maximal number of rows per chunk. If None, every
+                provided dataframe is predicted at once. Defaults to None.
+
+        Returns:
+            Iterator[pd.DataFrame]: Generator yielding the predictions per chunk.
+        """
+        if self.is_fitted is not True:
+            raise ValueError("Model not yet fitted.")
+        return (
+            self._predict_chunk(chunk)
+            for chunk in iter_chunks(experiments, chunk_size=chunk_size)
+        )
+
+    def _predict_chunk(self, experiments: pd.DataFrame) -> pd.DataFrame:
+        """Run predictions for the provided experiments at once.
+
+        Args:
+            experiments (pd.DataFrame): Experimental data for which predictions should be performed.
+
+        Returns:
+            pd.DataFrame: Dataframe with the predicted values.
+        """
         # TODO: validate also here the experiments but only for the input_columns
         # transformed = self.transformer.transform(experiments)
         transformed = self.domain.inputs.transform(
@@ -125,13 +181,19 @@ class PredictiveStrategy(Strategy):
         assert (
             self.experiments is not None and len(self.experiments) > 0
         ), "No fitting data available"
-        self.domain.validate_experiments(self.experiments, strict=True)
+        # the values were already validated when the experiments were added, only the
+        # checks across all experiments are needed
+        self.domain.validate_experiments(
+            self.experiments, strict=True, validated_rows=len(self.experiments)
+        )
         # transformed = self.transformer.fit_transform(self.experiments)
-        self._fit(self.experiments)
+        # experiments stored on disk are streamed, so that only the training data of
+        # the models is loaded into memory
+        self._fit(self._experiments_source)
         self.is_fitted = True
 
     @abstractmethod
-    def _fit(self, experiments: pd.DataFrame):
+    def _fit(self, experiments: Union[pd.DataFrame, MemmapExperiments]):
         """Abstract method where the acutal prediction are occuring."""
         pass
 
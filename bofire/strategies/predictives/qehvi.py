@@ -34,9 +34,7 @@ class QehviStrategy(BotorchStrategy):
     objective: Optional[MCMultiOutputObjective] = None
 
     def _get_acqfs(self, n) -> List[qExpectedHypervolumeImprovement]:
-        df = self.domain.outputs.preprocess_experiments_all_valid_outputs(
-            self.experiments
-        )
+        df = self.experiments.loc[self._valid_outputs_mask()]
 
         train_obj = (
             df[self.domain.outputs.get_keys_by_objective(excludes=None)].values
@@ -80,9 +78,7 @@ class QehviStrategy(BotorchStrategy):
 
     def get_adjusted_refpoint(self) -> List[float]:
         if self.ref_point is None:
-            df = self.domain.outputs.preprocess_experiments_all_valid_outputs(
-                self.experiments
-            )
+            df = self.experiments.loc[self._valid_outputs_mask()]
             ref_point = infer_ref_point(
                 self.domain, experiments=df, return_masked=False
             )
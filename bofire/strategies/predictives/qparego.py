@@ -63,9 +63,7 @@ class QparegoStrategy(BotorchStrategy):
         obj_callable = get_multiobjective_objective(outputs=self.domain.outputs)
 
         df_preds = self.predict(
-            self.domain.outputs.preprocess_experiments_any_valid_output(
-                experiments=self.experiments
-            )
+            self.experiments.loc[self._valid_outputs_mask(how="any")]
         )
 
         preds = torch.from_numpy(
@@ -32,13 +32,14 @@ class RejectionSampler(SamplerStrategy):
         n_iters = 0
         n_found = 0
         valid_samples = []
+        evaluator = self.domain.constraints.get_evaluator()
         while n_found < n:
             if n_iters > self.max_iters:
                 raise ValueError("Maximum iterations exceeded in rejection sampling.")
             samples = self.domain.inputs.sample(
                 self.num_base_samples, method=self.sampling_method
             )
-            valid = self.domain.constraints.is_fulfilled(samples)
+            valid = evaluator.is_fulfilled(samples)
             n_found += np.sum(valid)
             valid_samples.append(samples[valid])
             n_iters += 1
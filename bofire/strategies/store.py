@@ -0,0 +1,191 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# dtype kinds which are upcasted via numpy's promotion rules when rows with a different
+# dtype are appended, all other combinations of dtypes are stored as object
+_NUMERIC_KINDS = "iuf"
+
+
+def _to_array(values: pd.Series) -> np.ndarray:
+    """Returns the values of a column as numpy array, extension dtypes become object."""
+    if isinstance(values.dtype, np.dtype):
+        return values.to_numpy()
+    return values.to_numpy(dtype=object)
+
+
+def _common_dtype(a: np.dtype, b: np.dtype) -> np.dtype:
+    if a == b:
+        return a
+    if a.kind in _NUMERIC_KINDS and b.kind in _NUMERIC_KINDS:
+        return np.result_type(a, b)
+    return np.dtype(object)
+
+
+def _nullable_dtype(dtype: np.dtype) -> np.dtype:
+    """Returns the dtype which is needed to store missing values next to `dtype`."""
+    if dtype.kind in "fcmM":
+        return dtype
+    if dtype.kind in "iu":
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+def _missing_value(dtype: np.dtype):
+    return np.datetime64("NaT") if dtype.kind in "mM" else np.nan
+
+
+class ExperimentStore:
+    """Append-only columnar storage for the experiments or candidates of a strategy.
+
+    Every column is kept in a preallocated numpy array whose capacity is doubled when
+    it is exhausted, so appending rows has amortized costs proportional to the number
+    of appended rows instead of the total number of rows as `pd.concat`. The stored
+    data is returned as a dataframe whose columns are views on the arrays, it is only
+    created once per change of the data.
+
+    The counter `version` is increased on every change of the data and can be used to
+    key caches of derived data.
+
+    The semantics follow `pd.concat(..., ignore_index=True)`: the index is reset on
+    appends, columns which are missing in appended rows are filled with missing values,
+    and columns with different dtypes are upcasted. Columns with pandas extension dtypes
+    are stored with dtype object.
+    """
+
+    def __init__(self, initial_capacity: int = 16):
+        self.initial_capacity = initial_capacity
+        self.version = 0
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+        self._n_rows = 0
+        self._index: Optional[pd.Index] = None
+        self._frame: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    @property
+    def is_empty(self) -> bool:
+        """True if no data was set or appended since the last reset."""
+        return self._columns is None
+
+    @property
+    def columns(self) -> List[str]:
+        """Returns the keys of the stored columns."""
+        return [] if self._columns is None else list(self._columns.keys())
+
+    @property
+    def capacity(self) -> int:
+        """Returns the number of rows which fit into the allocated arrays."""
+        if self._columns is None or len(self._columns) == 0:
+            return 0
+        return len(next(iter(self._columns.values())))
+
+    def _changed(self):
+        self._frame = None
+        self.version += 1
+
+    def reset(self):
+        """Removes all data."""
+        self._columns = None
+        self._n_rows = 0
+        self._index = None
+        self._changed()
+
+    def set(self, data: pd.DataFrame, copy: bool = True):
+        """Replaces the stored data, the index of `data` is kept.
+
+        Args:
+            data (pd.DataFrame): New data.
+            copy (bool, optional): If False, the arrays of `data` are stored without
+                copying them, for example memory mapped columns which then stay on
+                disk. They are copied into preallocated arrays on the next append of
+                rows. Defaults to True.
+        """
+        # new arrays are allocated, so that dataframes which were already returned
+        # keep their values
+        capacity = max(self.initial_capacity, len(data))
+        self._columns = {}
+        for key, series in data.items():
+            values = _to_array(series)
+            if not copy:
+                self._columns[key] = values
+                continue
+            self._columns[key] = np.empty(capacity, dtype=values.dtype)
+            self._columns[key][: len(data)] = values
+        self._n_rows = len(data)
+        self._index = data.index
+        self._changed()
+
+    def append(self, data: pd.DataFrame):
+        """Appends rows to the stored data and resets the index.
+
+        Args:
+            data (pd.DataFrame): Rows to append.
+        """
+        if self._columns is None:
+            self.set(data.reset_index(drop=True))
+            return
+        n, k = self._n_rows, len(data)
+        self._reserve(n + k)
+        for key, series in data.items():
+            values = _to_array(series)
+            if key not in self._columns:
+                # the column is missing in the already stored rows
+                dtype = _nullable_dtype(values.dtype)
+                column = np.empty(self.capacity, dtype=dtype)
+                column[:n] = _missing_value(dtype)
+                self._columns[key] = column
+            column = self._columns[key]
+            dtype = _common_dtype(column.dtype, values.dtype)
+            if dtype != column.dtype:
+                self._columns[key] = column = column.astype(dtype)
+            column[n : n + k] = values
+        for key, column in self._columns.items():
+            if key not in data:
+                dtype = _nullable_dtype(column.dtype)
+                if dtype != column.dtype:
+                    self._columns[key] = column = column.astype(dtype)
+                column[n : n + k] = _missing_value(dtype)
+        self._n_rows = n + k
+        self._index = None
+        self._changed()
+
+    def _reserve(self, n_rows: int):
+        """Doubles the capacity of the arrays until `n_rows` rows fit into them.
+
+        Read-only arrays, like memory mapped ones, are always copied so that they can be
+        written.
+        """
+        capacity = self.capacity
+        if n_rows <= capacity and all(
+            column.flags.writeable for column in self._columns.values()  # type: ignore
+        ):
+            return
+        new_capacity = max(capacity, self.initial_capacity)
+        while new_capacity < n_rows:
+            new_capacity *= 2
+        for key, column in self._columns.items():  # type: ignore
+            new_column = np.empty(new_capacity, dtype=column.dtype)
+            new_column[: self._n_rows] = column[: self._n_rows]
+            self._columns[key] = new_column  # type: ignore
+
+    @property
+    def frame(self) -> Optional[pd.DataFrame]:
+        """Returns the stored data as dataframe, None if no data is stored.
+
+        The dataframe is cached until the data changes. Its columns are views on the
+        stored arrays, changes of the data have to be made via `set` and `append`.
+        """
+        if self._columns is None:
+            return None
+        if self._frame is None:
+            n = self._n_rows
+            self._frame = pd.DataFrame(
+                {key: column[:n] for key, column in self._columns.items()},
+                index=self._index if self._index is not None else pd.RangeIndex(n),
+                columns=list(self._columns.keys()),
+                copy=False,
+            )
+        return self._frame
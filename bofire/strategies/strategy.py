@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -8,6 +8,8 @@ from pydantic import PositiveInt
 from bofire.data_models.strategies.api import Strategy as DataModel
 from bofire.strategies.data_models.candidate import Candidate
 from bofire.strategies.data_models.values import InputValue
+from bofire.strategies.store import ExperimentStore
+from bofire.utils.memmap import MemmapExperiments
 
 
 class Strategy(ABC):
@@ -23,8 +25,18 @@ class Strategy(ABC):
         self.domain = data_model.domain
         self.seed = data_model.seed
         self.rng = np.random.default_rng(self.seed)
-        self._experiments = None
-        self._candidates = None
+        # append-only stores, their `version` can be used to key caches of data
+        # derived from the experiments or candidates
+        self._experiment_store = ExperimentStore()
+        self._candidate_store = ExperimentStore()
+        # experiments stored on disk together with the version of the store in which
+        # they were set
+        self._experiment_source: Optional[Tuple[MemmapExperiments, int]] = None
+        # masks of the experiments with valid outputs per filter and output keys,
+        # together with the version of the store for which they were computed
+        self._valid_mask_cache: Dict[
+            Tuple[str, Tuple[str, ...]], Tuple[int, np.ndarray]
+        ] = {}
 
     @classmethod
     def from_spec(cls, data_model: DataModel) -> "Strategy":
@@ -38,7 +50,49 @@ class Strategy(ABC):
         Returns:
             pd.DataFrame: Current experiments.
         """
-        return self._experiments  # type: ignore
+        return self._experiment_store.frame  # type: ignore
+
+    def _valid_outputs_mask(
+        self,
+        output_feature_keys: Optional[List[str]] = None,
+        how: Literal["all", "any"] = "all",
+    ) -> np.ndarray:
+        """Returns the mask of the experiments with valid outputs, see
+        `Outputs.get_valid_outputs_mask`. The mask is cached until the experiments
+        change.
+
+        Args:
+            output_feature_keys (Optional[List[str]], optional): Keys of the outputs
+                which are considered. Defaults to None, i.e. all outputs.
+            how (Literal["all", "any"], optional): If "all", all outputs of an experiment
+                have to be valid, if "any", at least one. Defaults to "all".
+
+        Returns:
+            np.ndarray: Boolean mask with one entry per experiment, it must not be
+                modified.
+        """
+        key = (how, tuple(output_feature_keys or ()))
+        version = self._experiment_store.version
+        cached = self._valid_mask_cache.get(key)
+        if cached is None or cached[0] != version:
+            mask = self.domain.outputs.get_valid_outputs_mask(
+                self.experiments, output_feature_keys=output_feature_keys, how=how
+            )
+            mask.flags.writeable = False
+            cached = (version, mask)
+            self._valid_mask_cache[key] = cached
+        return cached[1]
+
+    @property
+    def _experiments_source(self) -> Union[pd.DataFrame, MemmapExperiments]:
+        """Returns the experiments stored on disk if they were set and not changed
+        since, so that they can be streamed, else the current experiments."""
+        if (
+            self._experiment_source is not None
+            and self._experiment_source[1] == self._experiment_store.version
+        ):
+            return self._experiment_source[0]
+        return self.experiments
 
     @property
     def candidates(self) -> pd.DataFrame:
@@ -47,17 +101,18 @@ class Strategy(ABC):
         Returns:
             pd.DataFrame: Pending experiments.
         """
-        return self._candidates  # type: ignore
+        return self._candidate_store.frame  # type: ignore
 
     def tell(
         self,
-        experiments: pd.DataFrame,
+        experiments: Union[pd.DataFrame, MemmapExperiments],
         replace: bool = False,
     ) -> None:
         """This function passes new experimental data to the optimizer
 
         Args:
-            experiments (pd.DataFrame): DataFrame with experimental data
+            experiments (Union[pd.DataFrame, MemmapExperiments]): DataFrame with experimental data
+                or experiments stored on disk
             replace (bool, optional): Boolean to decide if the experimental data should replace the former DataFrame or if the new experiments should be attached. Defaults to False.
         """
         if len(experiments) == 0:
@@ -66,14 +121,13 @@ class Strategy(ABC):
             self.set_experiments(experiments=experiments)
         else:
             self.add_experiments(experiments=experiments)
-        # we check here that the experiments do not have completely fixed columns
-        cleaned_experiments = (
-            self.domain.outputs.preprocess_experiments_all_valid_outputs(
-                experiments=experiments
-            )
-        )
+        # we check here that the experiments do not have completely fixed columns,
+        # the told experiments are the last rows of the stored ones
+        n = len(experiments)
+        mask = self._valid_outputs_mask()[-n:]
         for feature in self.domain.inputs.get_fixed():
-            if (cleaned_experiments[feature.key] == feature.fixed_value()[0]).all():  # type: ignore
+            values = self.experiments[feature.key].to_numpy()[-n:][mask]
+            if (values == feature.fixed_value()[0]).all():  # type: ignore
                 raise ValueError(
                     f"No variance in experiments for fixed feature {feature.key}"
                 )
@@ -185,7 +239,7 @@ class Strategy(ABC):
             experiments (pd.DataFrame): Dataframe with candidates.
         """
         candidates = self.domain.validate_candidates(candidates, only_inputs=True)
-        self._candidates = candidates[self.domain.inputs.get_keys()]
+        self._candidate_store.set(candidates[self.domain.inputs.get_keys()])
 
     def add_candidates(self, candidates: pd.DataFrame):
         """Add candidates to the strategy. Appends to existing ones.
@@ -194,51 +248,56 @@ class Strategy(ABC):
             experiments (pd.DataFrame): Dataframe with candidates.
         """
         candidates = self.domain.validate_candidates(candidates, only_inputs=True)
-        if self.candidates is None:
-            self._candidates = candidates[self.domain.inputs.get_keys()]
+        if self._candidate_store.is_empty:
+            self._candidate_store.set(candidates[self.domain.inputs.get_keys()])
         else:
-            self._candidates = pd.concat(
-                (self.candidates, candidates[self.domain.inputs.get_keys()]),
-                ignore_index=True,
-            )
+            self._candidate_store.append(candidates[self.domain.inputs.get_keys()])
 
     def reset_candidates(self):
         """Resets the pending candidates of the strategy."""
-        self._candidates = None
+        self._candidate_store.reset()
 
     @property
     def num_candidates(self) -> int:
         """Returns number of (pending) candidates"""
-        if self.candidates is None:
-            return 0
-        return len(self.candidates)
+        return len(self._candidate_store)
 
-    def set_experiments(self, experiments: pd.DataFrame):
+    def set_experiments(self, experiments: Union[pd.DataFrame, MemmapExperiments]):
         """Set experiments of the strategy. Overwrites existing ones.
 
+        Experiments stored on disk are not loaded into memory, the numerical columns of
+        `experiments` are views on the memory mapped files until further experiments
+        are added.
+
         Args:
-            experiments (pd.DataFrame): Dataframe with experiments.
+            experiments (Union[pd.DataFrame, MemmapExperiments]): Dataframe with experiments
+                or experiments stored on disk.
         """
+        if isinstance(experiments, MemmapExperiments):
+            self._experiment_store.set(
+                self.domain.validate_experiments(experiments.to_frame()), copy=False
+            )
+            self._experiment_source = (experiments, self._experiment_store.version)
+            return
         experiments = self.domain.validate_experiments(experiments)
-        self._experiments = experiments
+        self._experiment_store.set(experiments)
 
-    def add_experiments(self, experiments: pd.DataFrame):
+    def add_experiments(self, experiments: Union[pd.DataFrame, MemmapExperiments]):
         """Add experiments to the strategy. Appends to existing ones.
 
         Args:
-            experiments (pd.DataFrame): Dataframe with experiments.
+            experiments (Union[pd.DataFrame, MemmapExperiments]): Dataframe with experiments
+                or experiments stored on disk.
         """
+        if self._experiment_store.is_empty:
+            self.set_experiments(experiments)
+            return
+        if isinstance(experiments, MemmapExperiments):
+            experiments = experiments.to_frame()
         experiments = self.domain.validate_experiments(experiments)
-        if self.experiments is None:
-            self._experiments = experiments
-        else:
-            self._experiments = pd.concat(
-                (self.experiments, experiments), ignore_index=True
-            )
+        self._experiment_store.append(experiments)
 
     @property
     def num_experiments(self) -> int:
         """Returns number of experiments"""
-        if self.experiments is None:
-            return 0
-        return len(self.experiments)
+        return len(self._experiment_store)
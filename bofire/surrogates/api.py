@@ -8,4 +8,5 @@ from bofire.surrogates.single_task_gp import SingleTaskGPSurrogate
 from bofire.surrogates.surrogate import Surrogate
 from bofire.surrogates.trainable import TrainableSurrogate
 from bofire.surrogates.values import PredictedValue
+from bofire.surrogates.variational_gp import SingleTaskVariationalGPSurrogate
 from bofire.surrogates.xgb import XGBoostSurrogate
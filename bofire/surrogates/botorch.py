@@ -1,10 +1,14 @@
 import base64
 import io
+from typing import Dict, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 import torch
 from botorch.models.transforms.input import ChainedInputTransform, FilterFeatures
+from botorch.posteriors import Posterior
+from botorch.posteriors.ensemble import EnsemblePosterior
+from torch import Tensor
 
 from bofire.data_models.surrogates.api import BotorchSurrogate as DataModel
 from bofire.surrogates.surrogate import Surrogate
@@ -22,10 +26,113 @@ class BotorchSurrogate(Surrogate):
     def _predict(self, transformed_X: pd.DataFrame):
         # transform to tensor
         X = torch.from_numpy(transformed_X.values).to(**tkwargs)
+        predictions = self.predict_tensor(X)
+        return predictions["mean"].numpy(), predictions["std"].numpy()
+
+    def predict_tensor(
+        self,
+        X: Tensor,
+        covariance: bool = False,
+        quantiles: Optional[Sequence[float]] = None,
+        n_samples: Optional[int] = None,
+    ) -> Dict[str, Tensor]:
+        """Predicts the outputs for already transformed inputs from a single evaluation
+        of the posterior.
+
+        In contrast to `predict`, the inputs are neither validated nor transformed, this
+        is left to the caller which has to provide them in the representation defined by
+        the `input_preprocessing_specs`.
+
+        Args:
+            X (Tensor): Transformed inputs of shape `n x d`.
+            covariance (bool, optional): If True, the covariance matrix of the predictions
+                is returned for every output. Defaults to False.
+            quantiles (Optional[Sequence[float]], optional): Quantiles of the marginal
+                predictive distributions which should be returned. Defaults to None.
+            n_samples (Optional[int], optional): Number of samples drawn from the
+                posterior. Defaults to None.
+
+        Returns:
+            Dict[str, Tensor]: Dictionary with the means `mean` and standard deviations
+                `std` of shape `n x m`. On request, it includes `covariance` of shape
+                `m x n x n`, `quantiles` of shape `len(quantiles) x n x m` and `samples`
+                of shape `n_samples x n x m`.
+        """
+        if not self.is_fitted:
+            raise ValueError("Model is not fitted/available yet.")
         with torch.no_grad():
-            preds = self.model.posterior(X=X, observation_noise=True).mean.cpu().detach().numpy()  # type: ignore
-            stds = np.sqrt(self.model.posterior(X=X, observation_noise=True).variance.cpu().detach().numpy())  # type: ignore
-        return preds, stds
+            posterior = self._posterior(X)
+            mean, variance = self._posterior_mean_variance(posterior)
+            predictions = {"mean": mean, "std": variance.sqrt()}
+            if covariance:
+                predictions["covariance"] = self._posterior_covariance(posterior)
+            if quantiles is not None:
+                predictions["quantiles"] = self._posterior_quantiles(
+                    posterior, torch.tensor(quantiles).to(**tkwargs)
+                )
+            if n_samples is not None:
+                predictions["samples"] = self._posterior_samples(posterior, n_samples)
+        return {key: value.cpu().detach() for key, value in predictions.items()}
+
+    def predict_posterior(
+        self,
+        X: pd.DataFrame,
+        covariance: bool = False,
+        quantiles: Optional[Sequence[float]] = None,
+        n_samples: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Predicts the outputs together with additional statistics of the posterior.
+
+        Args:
+            X (pd.DataFrame): Dataframe with the inputs.
+            covariance (bool, optional): If True, the covariance matrix of the predictions
+                is returned for every output. Defaults to False.
+            quantiles (Optional[Sequence[float]], optional): Quantiles of the marginal
+                predictive distributions which should be returned. Defaults to None.
+            n_samples (Optional[int], optional): Number of samples drawn from the
+                posterior. Defaults to None.
+
+        Returns:
+            Dict[str, np.ndarray]: Dictionary with the statistics as described in
+                `predict_tensor`, the outputs are ordered as in `self.outputs`.
+        """
+        if not self.is_fitted:
+            raise ValueError("Model is not fitted/available yet.")
+        X = torch.from_numpy(self._transform(X).values).to(**tkwargs)
+        predictions = self.predict_tensor(
+            X, covariance=covariance, quantiles=quantiles, n_samples=n_samples
+        )
+        return {key: value.numpy() for key, value in predictions.items()}
+
+    def _posterior(self, X: Tensor) -> Posterior:
+        return self.model.posterior(X=X, observation_noise=True)  # type: ignore
+
+    def _posterior_mean_variance(self, posterior: Posterior) -> Tuple[Tensor, Tensor]:
+        return posterior.mean, posterior.variance
+
+    def _posterior_covariance(self, posterior: Posterior) -> Tensor:
+        if isinstance(posterior, EnsemblePosterior):
+            # empirical covariance over the members, unbiased as the variance
+            centered = posterior.values - posterior.values.mean(dim=-3, keepdim=True)
+            return torch.einsum("sam,sbm->mab", centered, centered) / (
+                centered.shape[-3] - 1
+            )
+        mean = posterior.mean
+        n, m = mean.shape[-2], mean.shape[-1]
+        # the covariance of multi-output posteriors is interleaved over the outputs
+        cov = posterior.mvn.covariance_matrix.reshape((n, m, n, m))  # type: ignore
+        return torch.diagonal(cov, dim1=1, dim2=3).permute(2, 0, 1)
+
+    def _posterior_quantiles(self, posterior: Posterior, quantiles: Tensor) -> Tensor:
+        q = quantiles.reshape((-1, 1, 1))
+        if isinstance(posterior, EnsemblePosterior):
+            return torch.quantile(posterior.values, quantiles, dim=-3)
+        # the marginals of gaussian posteriors are normal distributions
+        mean, variance = self._posterior_mean_variance(posterior)
+        return torch.distributions.Normal(mean, variance.sqrt()).icdf(q)
+
+    def _posterior_samples(self, posterior: Posterior, n_samples: int) -> Tensor:
+        return posterior.rsample(torch.Size([n_samples]))
 
     @property
     def is_compatibilized(self) -> bool:
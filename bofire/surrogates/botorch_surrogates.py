@@ -1,12 +1,13 @@
 import itertools
 from abc import ABC
-from typing import List
+from typing import List, Union
 
 import botorch
 import pandas as pd
 import torch
 from botorch.models import ModelList
 from botorch.models.transforms.input import ChainedInputTransform, FilterFeatures
+from multiprocess.pool import Pool
 
 from bofire.data_models.domain.api import Inputs, Outputs
 from bofire.data_models.features.api import TInputTransformSpecs
@@ -14,6 +15,17 @@ from bofire.data_models.surrogates.api import BotorchSurrogates as DataModel
 from bofire.surrogates.botorch import BotorchSurrogate
 from bofire.surrogates.mapper import map as map_surrogate
 from bofire.surrogates.trainable import TrainableSurrogate
+from bofire.utils.memmap import MemmapExperiments
+
+
+def _fit_surrogate(
+    surrogate: TrainableSurrogate, experiments: Union[pd.DataFrame, MemmapExperiments]
+) -> TrainableSurrogate:
+    """Fits a surrogate in a worker process and returns it."""
+    # the surrogates are fitted in parallel processes, so every process uses one thread
+    torch.set_num_threads(1)
+    surrogate.fit(experiments)
+    return surrogate
 
 
 class BotorchSurrogates(ABC):
@@ -25,6 +37,7 @@ class BotorchSurrogates(ABC):
         **kwargs,
     ):
         self.surrogates = [map_surrogate(model) for model in data_model.surrogates]  # type: ignore
+        self.n_jobs = data_model.n_jobs
 
     @property
     def input_preprocessing_specs(self) -> TInputTransformSpecs:
@@ -34,10 +47,33 @@ class BotorchSurrogates(ABC):
             for key, value in model.input_preprocessing_specs.items()
         }
 
-    def fit(self, experiments: pd.DataFrame):
-        for model in self.surrogates:
-            if isinstance(model, TrainableSurrogate):
-                model.fit(experiments)
+    def fit(self, experiments: Union[pd.DataFrame, MemmapExperiments]):
+        """Fits the trainable surrogates to the experiments.
+
+        If `n_jobs` > 1, the surrogates are fitted concurrently in worker processes. Every
+        worker fits its own copy of a surrogate and the fitted copy, including its model and
+        the state of incremental fits, replaces the original one.
+
+        Args:
+            experiments (Union[pd.DataFrame, MemmapExperiments]): Experimental data, can
+                also be stored on disk.
+        """
+        indices = [
+            i
+            for i, model in enumerate(self.surrogates)
+            if isinstance(model, TrainableSurrogate)
+        ]
+        if self.n_jobs > 1 and len(indices) > 1:
+            with Pool(min(self.n_jobs, len(indices))) as pool:
+                fitted = pool.starmap(
+                    _fit_surrogate,
+                    [(self.surrogates[i], experiments) for i in indices],
+                )
+            for i, model in zip(indices, fitted):
+                self.surrogates[i] = model
+        else:
+            for i in indices:
+                self.surrogates[i].fit(experiments)  # type: ignore
 
     @property
     def outputs(self) -> Outputs:
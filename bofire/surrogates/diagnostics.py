@@ -4,13 +4,7 @@ from typing import Dict, List, Optional, Sequence
 import numpy as np
 import pandas as pd
 from pydantic import Field, root_validator, validator
-from scipy.stats import fisher_exact, pearsonr, spearmanr
-from sklearn.metrics import (
-    mean_absolute_error,
-    mean_absolute_percentage_error,
-    mean_squared_error,
-    r2_score,
-)
+from scipy.stats import fisher_exact, rankdata
 
 from bofire.data_models.base import BaseModel
 from bofire.data_models.domain.domain import is_numeric
@@ -18,6 +12,143 @@ from bofire.data_models.enum import RegressionMetricsEnum
 from bofire.data_models.validated import ValidatedDataFrame, ValidatedSeries
 
 
+def _batched_mean_absolute_error(
+    observed: np.ndarray, predicted: np.ndarray
+) -> np.ndarray:
+    """Calculates the mean absolute error for a batch of predictions.
+
+    Args:
+        observed (np.ndarray): Observed data with shape (n,).
+        predicted (np.ndarray): Batch of predictions with shape (b, n).
+
+    Returns:
+        np.ndarray: mean absolute errors with shape (b,).
+    """
+    return np.abs(predicted - observed).mean(axis=-1)
+
+
+def _batched_mean_squared_error(
+    observed: np.ndarray, predicted: np.ndarray
+) -> np.ndarray:
+    """Calculates the mean squared error for a batch of predictions.
+
+    Args:
+        observed (np.ndarray): Observed data with shape (n,).
+        predicted (np.ndarray): Batch of predictions with shape (b, n).
+
+    Returns:
+        np.ndarray: mean squared errors with shape (b,).
+    """
+    return ((observed - predicted) ** 2).mean(axis=-1)
+
+
+def _batched_mean_absolute_percentage_error(
+    observed: np.ndarray, predicted: np.ndarray
+) -> np.ndarray:
+    """Calculates the mean percentage error for a batch of predictions.
+
+    Args:
+        observed (np.ndarray): Observed data with shape (n,).
+        predicted (np.ndarray): Batch of predictions with shape (b, n).
+
+    Returns:
+        np.ndarray: mean percentage errors with shape (b,).
+    """
+    return (
+        np.abs(predicted - observed)
+        / np.maximum(np.abs(observed), np.finfo(np.float64).eps)
+    ).mean(axis=-1)
+
+
+def _batched_r2_score(observed: np.ndarray, predicted: np.ndarray) -> np.ndarray:
+    """Calculates the R2 score for a batch of predictions with the same conventions
+    as sklearn.
+
+    Args:
+        observed (np.ndarray): Observed data with shape (n,).
+        predicted (np.ndarray): Batch of predictions with shape (b, n).
+
+    Returns:
+        np.ndarray: R2 scores with shape (b,).
+    """
+    if len(observed) < 2:
+        return np.full(len(predicted), np.nan)
+    ss_res = ((observed - predicted) ** 2).sum(axis=-1)
+    ss_tot = ((observed - observed.mean()) ** 2).sum()
+    if ss_tot == 0:
+        return np.where(ss_res == 0, 1.0, 0.0)
+    return 1 - ss_res / ss_tot
+
+
+def _batched_pearson(observed: np.ndarray, predicted: np.ndarray) -> np.ndarray:
+    """Calculates the Pearson correlation coefficient for a batch of predictions.
+
+    Args:
+        observed (np.ndarray): Observed data with shape (n,).
+        predicted (np.ndarray): Batch of predictions with shape (b, n).
+
+    Returns:
+        np.ndarray: Pearson correlation coefficients with shape (b,).
+    """
+    predicted = predicted - predicted.mean(axis=-1, keepdims=True)
+    observed = observed - observed.mean()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rho = (predicted / np.linalg.norm(predicted, axis=-1, keepdims=True)) @ (
+            observed / np.linalg.norm(observed)
+        )
+    return np.clip(rho, -1.0, 1.0)
+
+
+def _batched_spearman(observed: np.ndarray, predicted: np.ndarray) -> np.ndarray:
+    """Calculates the Spearman correlation coefficient for a batch of predictions.
+
+    Args:
+        observed (np.ndarray): Observed data with shape (n,).
+        predicted (np.ndarray): Batch of predictions with shape (b, n).
+
+    Returns:
+        np.ndarray: Spearman correlation coefficients with shape (b,).
+    """
+    return _batched_pearson(rankdata(observed), rankdata(predicted, axis=-1))
+
+
+def _batched_fisher_exact_test_p(
+    observed: np.ndarray, predicted: np.ndarray
+) -> np.ndarray:
+    """Calculates the p value of Fisher's exact test for a batch of predictions,
+    see `_fisher_exact_test_p` for details.
+
+    Args:
+        observed (np.ndarray): Observed data with shape (n,).
+        predicted (np.ndarray): Batch of predictions with shape (b, n).
+
+    Returns:
+        np.ndarray: p values with shape (b,).
+    """
+    n = len(observed)
+    n_half = n // 2
+    top_obs = np.zeros(n, dtype=bool)
+    top_obs[observed.argsort()[-n_half:]] = True
+    top_est = np.zeros(predicted.shape, dtype=bool)
+    np.put_along_axis(top_est, predicted.argsort(axis=-1)[:, -n_half:], True, axis=-1)
+    # the contingency table differs per prediction, so the test is run one by one
+    p = []
+    for tp in (top_est & top_obs).sum(axis=-1):
+        table = np.array(
+            [[tp, n_half - tp], [n_half - tp, (n - n_half) - (n_half - tp)]]
+        )
+        _, p_value = fisher_exact(table, alternative="greater")
+        p.append(p_value)
+    return np.array(p, dtype=np.float64)
+
+
+def _as_batch(observed: np.ndarray, predicted: np.ndarray):
+    return (
+        np.asarray(observed, dtype=np.float64),
+        np.asarray(predicted, dtype=np.float64)[np.newaxis],
+    )
+
+
 def _mean_absolute_error(
     observed: np.ndarray,
     predicted: np.ndarray,
@@ -34,7 +165,7 @@ def _mean_absolute_error(
     Returns:
         float: mean absolute error
     """
-    return mean_absolute_error(observed, predicted)
+    return float(_batched_mean_absolute_error(*_as_batch(observed, predicted))[0])
 
 
 def _mean_squared_error(
@@ -53,7 +184,7 @@ def _mean_squared_error(
     Returns:
         float: mean squared error
     """
-    return mean_squared_error(observed, predicted)
+    return float(_batched_mean_squared_error(*_as_batch(observed, predicted))[0])
 
 
 def _mean_absolute_percentage_error(
@@ -72,7 +203,9 @@ def _mean_absolute_percentage_error(
     Returns:
         float: mean percentage error
     """
-    return mean_absolute_percentage_error(observed, predicted)
+    return float(
+        _batched_mean_absolute_percentage_error(*_as_batch(observed, predicted))[0]
+    )
 
 
 def _r2_score(
@@ -91,7 +224,7 @@ def _r2_score(
     Returns:
         float: R2 score.
     """
-    return float(r2_score(observed, predicted))
+    return float(_batched_r2_score(*_as_batch(observed, predicted))[0])
 
 
 def _pearson(
@@ -110,9 +243,7 @@ def _pearson(
     Returns:
         float: Pearson correlation coefficient.
     """
-    with np.errstate(invalid="ignore"):
-        rho, _ = pearsonr(predicted, observed)
-    return float(rho)
+    return float(_batched_pearson(*_as_batch(observed, predicted))[0])
 
 
 def _spearman(
@@ -131,9 +262,7 @@ def _spearman(
     Returns:
         float: Spearman correlation coefficient.
     """
-    with np.errstate(invalid="ignore"):
-        rho, _ = spearmanr(predicted, observed)
-    return float(rho)
+    return float(_batched_spearman(*_as_batch(observed, predicted))[0])
 
 
 def _fisher_exact_test_p(
@@ -159,18 +288,7 @@ def _fisher_exact_test_p(
     Returns:
         float: p value of the test.
     """
-    n_half = len(observed) // 2
-    top_obs = observed.argsort(axis=0)[-n_half:]
-    top_est = predicted.argsort(axis=0)[-n_half:]
-    # Construct contingency table
-    tp = len(set(top_est).intersection(top_obs))
-    fp = n_half - tp
-    fn = n_half - tp
-    tn = (len(observed) - n_half) - (n_half - tp)
-    table = np.array([[tp, fp], [fn, tn]])
-    # Compute the test statistic
-    _, p = fisher_exact(table, alternative="greater")
-    return float(p)
+    return float(_batched_fisher_exact_test_p(*_as_batch(observed, predicted))[0])
 
 
 metrics = {
@@ -183,6 +301,16 @@ metrics = {
     RegressionMetricsEnum.FISHER: _fisher_exact_test_p,
 }
 
+batched_metrics = {
+    RegressionMetricsEnum.MAE: _batched_mean_absolute_error,
+    RegressionMetricsEnum.MSD: _batched_mean_squared_error,
+    RegressionMetricsEnum.R2: _batched_r2_score,
+    RegressionMetricsEnum.MAPE: _batched_mean_absolute_percentage_error,
+    RegressionMetricsEnum.PEARSON: _batched_pearson,
+    RegressionMetricsEnum.SPEARMAN: _batched_spearman,
+    RegressionMetricsEnum.FISHER: _batched_fisher_exact_test_p,
+}
+
 
 class CvResult(BaseModel):
     """Container representing the results of one CV fold.
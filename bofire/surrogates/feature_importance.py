@@ -1,11 +1,12 @@
-from typing import Dict, Sequence
+from typing import Dict, Optional, Sequence
 
 import numpy as np
 import pandas as pd
 
 from bofire.data_models.enum import RegressionMetricsEnum
-from bofire.surrogates.diagnostics import metrics
+from bofire.surrogates.diagnostics import batched_metrics, metrics
 from bofire.surrogates.surrogate import Surrogate
+from bofire.utils.chunking import iter_chunks
 
 
 def permutation_importance(
@@ -14,6 +15,7 @@ def permutation_importance(
     y: pd.DataFrame,
     n_repeats: int = 5,
     seed: int = 42,
+    chunk_size: Optional[int] = None,
 ) -> Dict[str, pd.DataFrame]:
     """Computes permutation feature importance for a model.
 
@@ -23,6 +25,9 @@ def permutation_importance(
         y (pd.DataFrame): Y values used to estimate the importances.
         n_repeats (int, optional): Number of repeats. Defaults to 5.
         seed (int, optional): Seed for the random sampler. Defaults to 42.
+        chunk_size (Optional[int], optional): If provided, the permuted variants of `X`, which
+            are stacked into one batch, are predicted in chunks of at most `chunk_size` rows.
+            Defaults to None.
 
     Returns:
         Dict[str, pd.DataFrame]: keys are the metrices for which the model is evluated and value is a dataframe
@@ -44,27 +49,44 @@ def permutation_importance(
 
     output_key = model.outputs[0].key
     rng = np.random.default_rng(seed)
+    if not model.is_fitted:
+        raise ValueError("Model is not fitted/available yet.")
+    # encode X only once, the permutations are applied on the encoded column
+    # blocks of the features
+    Xt = model._transform(X)
+    encoded = Xt.values
+    features2idx, _ = model.inputs._get_transform_info(model.input_preprocessing_specs)
+    n, d = encoded.shape
+    n_features = len(model.inputs)
+    # the first entry of the batch is the unpermuted data
+    batch = np.repeat(encoded[np.newaxis], 1 + n_features * n_repeats, axis=0)
+    for i, feature in enumerate(model.inputs):
+        idx = list(features2idx[feature.key])
+        for j in range(n_repeats):
+            permutation = rng.permutation(n)
+            batch[1 + i * n_repeats + j][:, idx] = encoded[permutation][:, idx]
+    # predict all variants in one stacked batch
+    preds = np.empty(len(batch) * n)
+    start = 0
+    for chunk in iter_chunks(
+        pd.DataFrame(data=batch.reshape(-1, d), columns=Xt.columns),
+        chunk_size=chunk_size,
+    ):
+        chunk_preds, _ = model._predict(chunk)
+        preds[start : start + len(chunk)] = np.asarray(chunk_preds).reshape(-1)
+        start += len(chunk)
+    preds = preds.reshape(len(batch), n)
+    # compute the scores for all variants at once
+    observed = y[output_key].values.astype(np.float64)
+    scores = {k: batched_metrics[k](observed, preds) for k in metrics.keys()}
+    original_metrics = {k.name: scores[k][0] for k in metrics.keys()}
     prelim_results = {
-        k.name: {feature.key: [] for feature in model.inputs} for k in metrics.keys()
-    }
-    pred = model.predict(X)
-    original_metrics = {
-        k.name: metrics[k](y[output_key].values, pred[output_key + "_pred"].values)  # type: ignore
+        k.name: {
+            feature.key: scores[k][1 + i * n_repeats : 1 + (i + 1) * n_repeats]
+            for i, feature in enumerate(model.inputs)
+        }
         for k in metrics.keys()
     }
-
-    for feature in model.inputs:
-        for _ in range(n_repeats):
-            # shuffle
-            X_i = X.copy()
-            X_i[feature.key] = rng.permutation(X_i[feature.key].values)  # type: ignore
-            # predict
-            pred = model.predict(X_i)
-            # compute scores
-            for metricenum, metric in metrics.items():
-                prelim_results[metricenum.name][feature.key].append(
-                    metric(y[output_key].values, pred[output_key + "_pred"].values)  # type: ignore
-                )
     # convert dictionaries to dataframe for easier postprocessing and statistics
     # and return
     results = {}
@@ -94,6 +116,7 @@ def permutation_importance_hook(
     use_test: bool = True,
     n_repeats: int = 5,
     seed: int = 42,
+    chunk_size: Optional[int] = None,
 ) -> Dict[str, pd.DataFrame]:
     """Hook that can be used within `model.cross_validate` to compute a cross validated permutation feature importance.
 
@@ -107,6 +130,8 @@ def permutation_importance_hook(
             Defaults to True.
         n_repeats (int, optional): Number of repeats per feature. Defaults to 5.
         seed (int, optional): Seed for the random number generator. Defaults to 42.
+        chunk_size (Optional[int], optional): Maximal number of rows per prediction of the
+            permuted variants. Defaults to None.
 
     Returns:
         Dict[str, pd.DataFrame]: keys are the metrices for which the model is evluated and value is a dataframe
@@ -118,7 +143,9 @@ def permutation_importance_hook(
     else:
         X = X_train
         y = y_train
-    return permutation_importance(model=model, X=X, y=y, n_repeats=n_repeats, seed=seed)
+    return permutation_importance(
+        model=model, X=X, y=y, n_repeats=n_repeats, seed=seed, chunk_size=chunk_size
+    )
 
 
 def combine_permutation_importances(
@@ -1,11 +1,21 @@
-from typing import Dict, Optional
+import math
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
+import pyro
 import torch
-from botorch import fit_fully_bayesian_model_nuts
-from botorch.models.fully_bayesian import SaasFullyBayesianSingleTaskGP
+from botorch.models.fully_bayesian import SaasFullyBayesianSingleTaskGP, SaasPyroModel
 from botorch.models.transforms.outcome import Standardize
+from botorch.posteriors import Posterior
+from gpytorch.kernels import MaternKernel, ScaleKernel
+from linear_operator.utils.cholesky import psd_safe_cholesky
+from multiprocess.pool import Pool
+from pyro.infer.mcmc import MCMC, NUTS
+from pyro.infer.mcmc.util import initialize_model
+from pyro.ops.stats import effective_sample_size
+from torch import Tensor
 
 from bofire.data_models.enum import OutputFilteringEnum
 from bofire.data_models.surrogates.api import SaasSingleTaskGPSurrogate as DataModel
@@ -14,8 +24,216 @@ from bofire.surrogates.single_task_gp import get_scaler
 from bofire.surrogates.trainable import TrainableSurrogate
 from bofire.utils.torch_tools import tkwargs
 
+MAP_STEPS = 200
+
+
+class _LatencyBudgetExceeded(Exception):
+    pass
+
+
+class _WarmStartedNUTS(NUTS):
+    """NUTS kernel which starts from the step size and inverse mass matrix adapted in a
+    previous run. The mass matrix is kept fixed, only the step size is adapted during
+    the warmup."""
+
+    def __init__(self, *args, inverse_mass_matrix: Dict[Tuple, Tensor], **kwargs):
+        super().__init__(*args, adapt_mass_matrix=False, **kwargs)
+        self._warm_inverse_mass_matrix = inverse_mass_matrix
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Checks if the installed pyro version exposes the mass matrix adapter, via
+        which the inverse mass matrix is set.
+
+        Returns:
+            bool: True if the kernel can be warm started.
+        """
+        return isinstance(getattr(NUTS, "mass_matrix_adapter", None), property)
+
+    def setup(self, warmup_steps, *args, **kwargs):
+        super().setup(warmup_steps, *args, **kwargs)
+        self.mass_matrix_adapter.inverse_mass_matrix = {
+            sites: value.clone()
+            for sites, value in self._warm_inverse_mass_matrix.items()
+        }
+
+
+def _run_nuts_chain(
+    pyro_model: SaasPyroModel,
+    warmup_steps: int,
+    num_samples: int,
+    initial_params: Optional[Dict[str, Tensor]] = None,
+    adaptation: Optional[Dict] = None,
+    deadline: Optional[float] = None,
+    disable_progbar: bool = True,
+) -> Optional[Tuple[Dict[str, Tensor], Dict]]:
+    """Runs one NUTS chain on the SAAS model.
+
+    Args:
+        pyro_model (SaasPyroModel): Pyro model holding the training data.
+        warmup_steps (int): Number of warmup steps.
+        num_samples (int): Number of samples drawn after the warmup.
+        initial_params (Dict[str, Tensor], optional): Unconstrained initial values of the
+            latent sites. Defaults to None.
+        adaptation (Dict, optional): Step size and inverse mass matrix adapted in a
+            previous run, from which the warmup starts. Ignored if the installed pyro
+            version does not support it. Defaults to None.
+        deadline (float, optional): Point in time after which the chain is aborted.
+            Defaults to None.
+        disable_progbar (bool, optional): Disables the progress bar. Defaults to True.
+
+    Returns:
+        Optional[Tuple[Dict[str, Tensor], Dict]]: Samples of the latent sites and the
+            adapted step size and inverse mass matrix, None if the deadline was
+            exceeded.
+    """
+
+    def hook_fn(kernel, samples, stage, i):
+        if deadline is not None and time.time() > deadline:
+            raise _LatencyBudgetExceeded()
+
+    kwargs = {"jit_compile": False, "full_mass": True, "max_tree_depth": 6}
+    if adaptation is None or not _WarmStartedNUTS.is_supported():
+        nuts = NUTS(pyro_model.sample, **kwargs)
+    else:
+        nuts = _WarmStartedNUTS(
+            pyro_model.sample,
+            step_size=adaptation["step_size"],
+            inverse_mass_matrix=adaptation["inverse_mass_matrix"],
+            **kwargs,
+        )
+    mcmc = MCMC(
+        nuts,
+        warmup_steps=warmup_steps,
+        num_samples=num_samples,
+        initial_params=initial_params,
+        disable_progbar=disable_progbar,
+        hook_fn=hook_fn,
+    )
+    try:
+        mcmc.run()
+    except _LatencyBudgetExceeded:
+        return None
+    return mcmc.get_samples(), {
+        "step_size": nuts.step_size,
+        "inverse_mass_matrix": {
+            sites: value.detach().clone()
+            for sites, value in nuts.inverse_mass_matrix.items()
+        },
+    }
+
+
+def _run_nuts_chain_in_process(
+    seed: int, *args
+) -> Optional[Tuple[Dict[str, Tensor], Dict]]:
+    # the chains are already run in parallel, intra-op parallelism would oversubscribe
+    torch.set_num_threads(1)
+    pyro.set_rng_seed(seed)
+    return _run_nuts_chain(*args)
+
+
+def _fit_map(
+    pyro_model: SaasPyroModel, initial_params: Optional[Dict[str, Tensor]] = None
+) -> Dict[str, Tensor]:
+    """Computes a MAP estimate of the SAAS hyperparameters.
+
+    The potential energy of the model, i.e. the negative log posterior density in the
+    unconstrained space, is minimized with Adam.
+
+    Args:
+        pyro_model (SaasPyroModel): Pyro model holding the training data.
+        initial_params (Dict[str, Tensor], optional): Unconstrained initial values of the
+            latent sites. Defaults to None.
+
+    Returns:
+        Dict[str, Tensor]: The MAP estimate as a single sample of the latent sites.
+    """
+    init_params, potential_fn, transforms, _ = initialize_model(pyro_model.sample)
+    params = {
+        key: value.detach().clone().requires_grad_(True)
+        for key, value in (initial_params or init_params).items()
+    }
+    optimizer = torch.optim.Adam(params.values(), lr=0.1)
+    for _ in range(MAP_STEPS):
+        optimizer.zero_grad()
+        loss = potential_fn(params)
+        loss.backward()
+        optimizer.step()
+    return {
+        key: transforms[key].inv(value.detach()).unsqueeze(0)
+        for key, value in params.items()
+    }
+
+
+def _min_effective_sample_size(chains: List[Dict[str, Tensor]]) -> float:
+    """Computes the smallest effective sample size over all latent sites.
+
+    Args:
+        chains (List[Dict[str, Tensor]]): Samples of the latent sites per chain.
+
+    Returns:
+        float: The smallest effective sample size, nan if it cannot be estimated.
+    """
+    n_samples = min(chain["mean"].shape[0] for chain in chains)
+    if n_samples < 2:
+        return float("nan")
+    ess = torch.cat(
+        [
+            effective_sample_size(
+                torch.stack([chain[key][:n_samples] for chain in chains]).to(**tkwargs),
+                chain_dim=0,
+                sample_dim=1,
+            ).reshape(-1)
+            for key in chains[0]
+        ]
+    )
+    ess = ess[torch.isfinite(ess)]
+    return ess.min().item() if len(ess) > 0 else float("nan")
+
+
+def _matern52(X1: Tensor, X2: Tensor, lengthscale: Tensor) -> Tensor:
+    """Evaluates the Matern 5/2 kernel for a batch of lengthscales.
+
+    Args:
+        X1 (Tensor): Inputs of shape `n1 x d`.
+        X2 (Tensor): Inputs of shape `n2 x d`.
+        lengthscale (Tensor): Lengthscales of shape `s x 1 x d`.
+
+    Returns:
+        Tensor: Kernel matrices of shape `s x n1 x n2`.
+    """
+    # center the inputs for numerical stability as done in gpytorch
+    center = X2.mean(dim=0)
+    dist = torch.cdist((X1 - center) / lengthscale, (X2 - center) / lengthscale)
+    sqrt5_dist = math.sqrt(5) * dist
+    return (1 + sqrt5_dist + sqrt5_dist**2 / 3) * torch.exp(-sqrt5_dist)
+
 
 class SaasSingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
+    """Fully Bayesian single task GP with a SAAS prior, fitted by NUTS.
+
+    Refitting after new experiments were added can be sped up with `warm_start`: if at
+    most `warm_start_max_new_rows` experiments were appended to the previous training
+    data, the chains start at the previous posterior samples and only
+    `warm_start_warmup_steps` warmup steps are run. The warm started chains keep the
+    inverse mass matrices adapted in the previous fit and start the adaptation of the
+    step size from the previous step sizes. With `n_chains` > 1 the chains are
+    run in parallel processes, each of them draws its share of `num_samples`. If a
+    `latency_budget` is set and NUTS exceeds it, a MAP estimate of the hyperparameters
+    is used instead.
+
+    After every fit, `fit_method` ("nuts" or "map"), `warm_started`, `fit_time` in
+    seconds, the smallest effective sample size over all hyperparameters `ess` and
+    `ess_per_second` are available for monitoring.
+
+    With `cached_prediction`, means and standard deviations are not computed from the
+    botorch posterior. Instead the Cholesky factors of the training covariances and
+    the weights K^-1 (y - mean) of the MCMC draws are computed once per fit and reused
+    across calls, optionally for at most `max_prediction_draws` draws. The candidates
+    are predicted in batches of `prediction_batch_size` rows. Covariances and samples
+    are still computed from the posterior of all draws.
+    """
+
     def __init__(
         self,
         data_model: DataModel,
@@ -25,6 +243,24 @@ class SaasSingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
         self.num_samples = data_model.num_samples
         self.thinning = data_model.thinning
         self.scaler = data_model.scaler
+        self.warm_start = data_model.warm_start
+        self.warm_start_max_new_rows = data_model.warm_start_max_new_rows
+        self.warm_start_warmup_steps = data_model.warm_start_warmup_steps
+        self.n_chains = data_model.n_chains
+        self.latency_budget = data_model.latency_budget
+        self.cached_prediction = data_model.cached_prediction
+        self.max_prediction_draws = data_model.max_prediction_draws
+        self.prediction_batch_size = data_model.prediction_batch_size
+        self._prediction_cache: Optional[Dict] = None
+        self._train_X: Optional[Tensor] = None
+        self._train_Y: Optional[Tensor] = None
+        self._mcmc_samples: Optional[Dict[str, Tensor]] = None
+        self._nuts_adaptations: Optional[List[Dict]] = None
+        self.fit_method: Optional[str] = None
+        self.warm_started = False
+        self.fit_time = float("nan")
+        self.ess = float("nan")
+        self.ess_per_second = float("nan")
         super().__init__(data_model=data_model, **kwargs)
 
     model: Optional[SaasFullyBayesianSingleTaskGP] = None
@@ -39,26 +275,272 @@ class SaasSingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
             Y.values
         ).to(**tkwargs)
 
+        start = time.time()
+        initial_params = self._initial_params(tX, tY)
+        self.warm_started = initial_params is not None
+        warmup_steps = (
+            self.warm_start_warmup_steps if self.warm_started else self.warmup_steps
+        )
+
         self.model = SaasFullyBayesianSingleTaskGP(
             train_X=tX,
             train_Y=tY,
             outcome_transform=Standardize(m=1),
             input_transform=scaler,
         )
-        fit_fully_bayesian_model_nuts(
-            self.model,
-            warmup_steps=self.warmup_steps,
-            num_samples=self.num_samples,
-            thinning=self.thinning,
-            disable_progbar=disable_progbar,
+        self.model.train()
+        pyro_model = self.model.pyro_model
+        deadline = start + self.latency_budget if self.latency_budget else None
+        num_samples = math.ceil(self.num_samples / self.n_chains)
+        # warm started chains also start from the previously adapted step sizes and
+        # inverse mass matrices
+        adaptations = (
+            [
+                self._nuts_adaptations[i % len(self._nuts_adaptations)]
+                for i in range(self.n_chains)
+            ]
+            if self.warm_started and self._nuts_adaptations
+            else [None] * self.n_chains
         )
+        if self.n_chains == 1:
+            results = [
+                _run_nuts_chain(
+                    pyro_model,
+                    warmup_steps,
+                    num_samples,
+                    None if initial_params is None else initial_params[0],
+                    adaptations[0],
+                    deadline,
+                    disable_progbar,
+                )
+            ]
+        else:
+            seeds = torch.randint(2**31 - 1, (self.n_chains,)).tolist()
+            with Pool(processes=self.n_chains) as p:
+                results = p.starmap(
+                    _run_nuts_chain_in_process,
+                    [
+                        (
+                            seed,
+                            pyro_model,
+                            warmup_steps,
+                            num_samples,
+                            None if initial_params is None else initial_params[i],
+                            adaptations[i],
+                            deadline,
+                        )
+                        for i, seed in enumerate(seeds)
+                    ],
+                )
+        chains = [result[0] for result in results if result is not None]
+
+        if len(chains) > 0:
+            self.fit_method = "nuts"
+            self.ess = _min_effective_sample_size(chains)
+            self._nuts_adaptations = [
+                result[1] for result in results if result is not None
+            ]
+            samples = {
+                key: torch.cat([chain[key][:: self.thinning] for chain in chains])
+                for key in chains[0]
+            }
+        else:
+            self.fit_method = "map"
+            self.ess = float("nan")
+            self._nuts_adaptations = None
+            samples = _fit_map(
+                pyro_model, None if initial_params is None else initial_params[0]
+            )
+        self._mcmc_samples = {key: value.clone() for key, value in samples.items()}
+        self.model.load_mcmc_samples(pyro_model.postprocess_mcmc_samples(samples))
+        self.model.eval()
+
+        self.fit_time = time.time() - start
+        self.ess_per_second = self.ess / self.fit_time
+        self._train_X, self._train_Y = tX, tY
+
+    def _initial_params(
+        self, tX: Tensor, tY: Tensor
+    ) -> Optional[List[Dict[str, Tensor]]]:
+        """Returns unconstrained initial values of the latent sites for every chain, taken
+        from the samples of the previous fit, if a warm start is possible.
 
-    def _predict(self, transformed_X: pd.DataFrame):
-        # transform to tensor
-        X = torch.from_numpy(transformed_X.values).to(**tkwargs)
+        This is the case if `warm_start` is set and the training data of the last fit
+        is a prefix of the new training data with at most `warm_start_max_new_rows`
+        appended rows.
+
+        Args:
+            tX (Tensor): Transformed training inputs.
+            tY (Tensor): Training targets.
+
+        Returns:
+            Optional[List[Dict[str, Tensor]]]: Initial values per chain, None if no warm
+                start is possible.
+        """
+        if (
+            not self.warm_start
+            or self._mcmc_samples is None
+            or self._train_X is None
+            or self._train_Y is None
+        ):
+            return None
+        n = self._train_X.shape[0]
+        if (
+            tX.shape[0] < n
+            or tX.shape[0] - n > self.warm_start_max_new_rows
+            or tX.shape[1] != self._train_X.shape[1]
+            or not torch.equal(tX[:n], self._train_X)
+            or not torch.equal(tY[:n], self._train_Y)
+        ):
+            return None
+        _, _, transforms, _ = initialize_model(self.model.pyro_model.sample)  # type: ignore
+        n_draws = self._mcmc_samples["mean"].shape[0]
+        # spread the chains over the previous samples
+        draws = np.linspace(0, n_draws - 1, self.n_chains).round().astype(int)
+        return [
+            {
+                key: transforms[key](value[draw])
+                for key, value in self._mcmc_samples.items()
+            }
+            for draw in draws
+        ]
+
+    def predict_tensor(
+        self,
+        X: Tensor,
+        covariance: bool = False,
+        quantiles: Optional[Sequence[float]] = None,
+        n_samples: Optional[int] = None,
+    ) -> Dict[str, Tensor]:
+        if not self.cached_prediction or covariance or n_samples is not None:
+            return super().predict_tensor(
+                X, covariance=covariance, quantiles=quantiles, n_samples=n_samples
+            )
+        if not self.is_fitted:
+            raise ValueError("Model is not fitted/available yet.")
         with torch.no_grad():
-            posterior = self.model.posterior(X=X)  # type: ignore
+            mean, variance = self._cached_mean_variance(X)
+            predictions = {"mean": mean, "std": variance.sqrt()}
+            if quantiles is not None:
+                q = torch.tensor(quantiles).to(**tkwargs).reshape((-1, 1, 1))
+                predictions["quantiles"] = torch.distributions.Normal(
+                    mean, variance.sqrt()
+                ).icdf(q)
+        return {key: value.cpu().detach() for key, value in predictions.items()}
+
+    def _prediction_factors(self) -> Dict:
+        """Returns the per draw quantities needed for the cached prediction, they are
+        computed only once for every fitted model and number of used draws.
+
+        Returns:
+            Dict: The training inputs, the hyperparameters, the Cholesky factors of the
+                training covariances and the weights K^-1 (y - mean) of the used draws.
+        """
+        if (
+            self._prediction_cache is not None
+            and self._prediction_cache["model"] is self.model
+            and self._prediction_cache["max_prediction_draws"]
+            == self.max_prediction_draws
+        ):
+            return self._prediction_cache
+        model: SaasFullyBayesianSingleTaskGP = self.model  # type: ignore
+        # the cached prediction evaluates the kernel of the SAAS model itself
+        assert isinstance(model.covar_module, ScaleKernel)
+        assert isinstance(model.covar_module.base_kernel, MaternKernel)
+        assert model.covar_module.base_kernel.nu == 2.5
+        n_draws = model.num_mcmc_samples
+        draws = torch.arange(n_draws)
+        if (
+            self.max_prediction_draws is not None
+            and self.max_prediction_draws < n_draws
+        ):
+            draws = torch.linspace(0, n_draws - 1, self.max_prediction_draws)
+            draws = draws.round().long()
+        train_X = model.train_inputs[0]  # type: ignore
+        lengthscale = model.covar_module.base_kernel.lengthscale[draws]  # type: ignore
+        outputscale = model.covar_module.outputscale[draws]  # type: ignore
+        noise = model.likelihood.noise[draws]  # type: ignore
+        constant = model.mean_module.constant[draws]  # type: ignore
+        K = outputscale.reshape(-1, 1, 1) * _matern52(train_X, train_X, lengthscale)
+        K = K + noise.unsqueeze(-1) * torch.eye(train_X.shape[0]).to(K)
+        L = psd_safe_cholesky(K)
+        residuals = model.train_targets - constant.unsqueeze(-1)  # type: ignore
+        self._prediction_cache = {
+            "model": model,
+            "max_prediction_draws": self.max_prediction_draws,
+            "train_X": train_X,
+            "lengthscale": lengthscale,
+            "outputscale": outputscale,
+            "constant": constant,
+            "L": L,
+            "alpha": torch.cholesky_solve(residuals.unsqueeze(-1), L),
+        }
+        return self._prediction_cache
+
+    def _cached_mean_variance(self, X: Tensor) -> Tuple[Tensor, Tensor]:
+        """Computes the mean and variance of the mixture over the MCMC draws from the
+        cached factors, batched over the rows of `X`.
+
+        Args:
+            X (Tensor): Transformed inputs of shape `n x d`.
+
+        Returns:
+            Tuple[Tensor, Tensor]: Mean and variance of shape `n x 1`.
+        """
+        factors = self._prediction_factors()
+        X = self.model.transform_inputs(X)  # type: ignore
+        outputscale = factors["outputscale"].unsqueeze(-1)
+        means, variances = [], []
+        for batch in X.split(self.prediction_batch_size):
+            k = outputscale.unsqueeze(-1) * _matern52(
+                batch, factors["train_X"], factors["lengthscale"]
+            )
+            mean = factors["constant"].unsqueeze(-1) + (k @ factors["alpha"]).squeeze(
+                -1
+            )
+            v = torch.linalg.solve_triangular(
+                factors["L"], k.transpose(-1, -2), upper=False
+            )
+            variance = (outputscale - v.pow(2).sum(dim=-2)).clamp_min(0.0)
+            # law of total variance over the mixture of the draws
+            mixture_mean = mean.mean(dim=0)
+            means.append(mixture_mean)
+            variances.append(
+                variance.mean(dim=0) + (mean - mixture_mean).pow(2).mean(dim=0)
+            )
+        outcome_transform: Standardize = self.model.outcome_transform  # type: ignore
+        mean = torch.cat(means).unsqueeze(-1)
+        variance = torch.cat(variances).unsqueeze(-1)
+        return (
+            mean * outcome_transform.stdvs + outcome_transform.means,
+            variance * outcome_transform.stdvs.pow(2),
+        )
+
+    def _posterior(self, X: Tensor) -> Posterior:
+        return self.model.posterior(X=X)  # type: ignore
+
+    def _posterior_mean_variance(self, posterior: Posterior) -> Tuple[Tensor, Tensor]:
+        return posterior.mixture_mean, posterior.mixture_variance  # type: ignore
+
+    def _posterior_covariance(self, posterior: Posterior) -> Tensor:
+        # law of total covariance over the mixture of the MCMC draws
+        means = posterior.mean.squeeze(-1)  # type: ignore
+        centered = means - means.mean(dim=0, keepdim=True)
+        cov = posterior.mvn.covariance_matrix.mean(dim=0)  # type: ignore
+        cov = cov + centered.T @ centered / means.shape[0]
+        return cov.unsqueeze(0)
 
-        preds = posterior.mixture_mean.detach().numpy()
-        stds = np.sqrt(posterior.mixture_variance.detach().numpy())
-        return preds, stds
+    def _posterior_samples(self, posterior: Posterior, n_samples: int) -> Tensor:
+        # every sample is drawn from the posterior of a randomly chosen MCMC draw, the
+        # draws are chosen first and only their posteriors are sampled
+        mean = posterior.mean
+        draws = torch.randint(mean.shape[0], (n_samples,))
+        samples = torch.empty((n_samples, *mean.shape[1:])).to(mean)
+        for draw in draws.unique():
+            idx = (draws == draw).nonzero().squeeze(-1)
+            samples[idx] = (
+                posterior.distribution[draw]  # type: ignore
+                .rsample(torch.Size([len(idx)]))
+                .reshape((len(idx), *mean.shape[1:]))
+            )
+        return samples
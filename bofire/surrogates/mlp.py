@@ -1,4 +1,5 @@
-from typing import Literal, Optional, Sequence
+import math
+from typing import List, Literal, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -6,7 +7,7 @@ import torch
 import torch.nn as nn
 from botorch.models.ensemble import EnsembleModel
 from torch import Tensor
-from torch.utils.data import DataLoader, Dataset
+from torch.utils.data import Dataset
 
 from bofire.data_models.enum import OutputFilteringEnum
 from bofire.data_models.surrogates.api import MLPEnsemble as DataModel
@@ -73,20 +74,147 @@ class MLP(nn.Module):
         return self.layers(x)
 
 
+class StackedLinear(nn.Module):
+    """Linear layers of several ensemble members stacked into one module.
+
+    The weights have the shape `s x in_features x out_features` and the biases the shape
+    `s x 1 x out_features`, where `s` is the number of ensemble members. All members are
+    evaluated by one batched matrix multiplication.
+    """
+
+    def __init__(self, n_estimators: int, in_features: int, out_features: int):
+        super().__init__()
+        self.n_estimators = n_estimators
+        self.in_features = in_features
+        self.out_features = out_features
+        # same initialization as in `nn.Linear`
+        bound = 1 / math.sqrt(in_features)
+        self.weight = nn.Parameter(
+            torch.empty(n_estimators, in_features, out_features, **tkwargs).uniform_(
+                -bound, bound
+            )
+        )
+        self.bias = nn.Parameter(
+            torch.empty(n_estimators, 1, out_features, **tkwargs).uniform_(
+                -bound, bound
+            )
+        )
+
+    def forward(self, x: Tensor) -> Tensor:
+        """Applies the linear layers of all members.
+
+        Args:
+            x (Tensor): Input tensor of shape `s x n x in_features`, the member dimension
+                can also be 1 to feed the same data to all members.
+
+        Returns:
+            Tensor: Output tensor of shape `s x n x out_features`.
+        """
+        return torch.baddbmm(
+            self.bias, x.expand(self.n_estimators, -1, -1), self.weight
+        )
+
+
+class StackedMLP(nn.Module):
+    """Ensemble of MLPs with identical architecture whose layers are stacked."""
+
+    def __init__(
+        self,
+        n_estimators: int,
+        input_size: int,
+        output_size: int = 1,
+        hidden_layer_sizes: Sequence = (100,),
+        dropout: float = 0.0,
+        activation: Literal["relu", "logistic", "tanh"] = "relu",
+    ):
+        super().__init__()
+        if activation == "relu":
+            f_activation = nn.ReLU
+        elif activation == "logistic":
+            f_activation = nn.Sigmoid
+        elif activation == "tanh":
+            f_activation = nn.Tanh
+        else:
+            raise ValueError(f"Activation {activation} not known.")
+        sizes = [input_size] + list(hidden_layer_sizes)
+        layers = []
+        for i in range(len(hidden_layer_sizes)):
+            layers += [
+                StackedLinear(n_estimators, sizes[i], sizes[i + 1]),
+                f_activation(),
+            ]
+            if dropout > 0.0:
+                layers.append(nn.Dropout(dropout))
+        layers.append(StackedLinear(n_estimators, sizes[-1], output_size))
+        self.n_estimators = n_estimators
+        self.layers = nn.Sequential(*layers)
+
+    @classmethod
+    def from_mlps(cls, mlps: Sequence[MLP]) -> "StackedMLP":
+        """Stacks the parameters of individual MLPs into one StackedMLP.
+
+        Args:
+            mlps (Sequence[MLP]): MLPs with identical architecture.
+
+        Returns:
+            StackedMLP: Stacked ensemble with copies of the parameters of the MLPs.
+        """
+        stacked = cls.__new__(cls)
+        nn.Module.__init__(stacked)
+        layers = []
+        for i, layer in enumerate(mlps[0].layers):
+            if not isinstance(layer, nn.Linear):
+                layers.append(layer)
+                continue
+            stacked_layer = StackedLinear(
+                len(mlps), layer.in_features, layer.out_features
+            )
+            with torch.no_grad():
+                stacked_layer.weight.copy_(
+                    torch.stack([mlp.layers[i].weight.T for mlp in mlps])
+                )
+                stacked_layer.bias.copy_(
+                    torch.stack([mlp.layers[i].bias.unsqueeze(0) for mlp in mlps])
+                )
+            layers.append(stacked_layer)
+        stacked.n_estimators = len(mlps)
+        stacked.layers = nn.Sequential(*layers)
+        return stacked
+
+    def forward(self, x: Tensor) -> Tensor:
+        return self.layers(x)
+
+
 class _MLPEnsemble(EnsembleModel):
-    def __init__(self, mlps: Sequence[MLP]):
+    def __init__(self, mlps: Union[Sequence[MLP], StackedMLP]):
+        """Constructs the ensemble.
+
+        Args:
+            mlps (Union[Sequence[MLP], StackedMLP]): Members of the ensemble, either as
+                already stacked ensemble or as individual MLPs which are stacked.
+        """
         super().__init__()
-        if len(mlps) == 0:
-            raise ValueError("List of mlps is empty.")
-        num_in_features = mlps[0].layers[0].in_features
-        num_out_features = mlps[0].layers[-1].out_features
-        for mlp in mlps:
-            assert mlp.layers[0].in_features == num_in_features
-            assert mlp.layers[-1].out_features == num_out_features
+        if not isinstance(mlps, StackedMLP):
+            if len(mlps) == 0:
+                raise ValueError("List of mlps is empty.")
+            num_in_features = mlps[0].layers[0].in_features
+            num_out_features = mlps[0].layers[-1].out_features
+            for mlp in mlps:
+                assert mlp.layers[0].in_features == num_in_features
+                assert mlp.layers[-1].out_features == num_out_features
+            mlps = StackedMLP.from_mlps(mlps)
         self.mlps = mlps
         # put all models in eval mode
-        for mlp in self.mlps:
-            mlp.eval()
+        self.mlps.eval()
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        # ensembles dumped before the members were stacked hold a list of MLPs
+        mlps = self.__dict__.get("mlps")
+        if isinstance(mlps, (list, tuple)):
+            del self.__dict__["mlps"]
+            self.mlps = StackedMLP.from_mlps(mlps)
+            self.mlps.eval()
 
     def forward(self, X: Tensor):
         r"""Compute the model output at X.
@@ -98,12 +226,17 @@ class _MLPEnsemble(EnsembleModel):
             A `batch_shape x s x n x m`-dimensional output tensor where
             `s` is the size of the ensemble.
         """
-        return torch.stack([mlp(X) for mlp in self.mlps], dim=-3)
+        batch_shape, n = X.shape[:-2], X.shape[-2]
+        # all batches are flattened into one matrix which is fed to all members,
+        # this results in one batched matrix multiplication per layer
+        preds = self.mlps(X.reshape((1, -1, X.shape[-1])))
+        preds = preds.reshape((preds.shape[0], *batch_shape, n, preds.shape[-1]))
+        return preds.movedim(0, -3)
 
     @property
     def num_outputs(self) -> int:
         r"""The number of outputs of the model."""
-        return self.mlps[0].layers[-1].out_features  # type: ignore
+        return self.mlps.layers[-1].out_features  # type: ignore
 
 
 def fit_mlp(
@@ -114,9 +247,11 @@ def fit_mlp(
     lr: float = 1e-4,
     shuffle: bool = True,
     weight_decay: float = 0.0,
-):
+) -> List[float]:
     """Fit a MLP for regression to a dataset.
 
+    The MLP is fitted as stacked ensemble with a single member via `fit_stacked_mlp`.
+
     Args:
         mlp (MLP): The MLP that should be fitted.
         dataset (RegressionDataSet): The data that should be fitted
@@ -125,36 +260,161 @@ def fit_mlp(
         lr (float, optional): Initial learning rate. Defaults to 1e-4.
         shuffle (bool, optional): Whereas the batches should be shuffled. Defaults to True.
         weight_decay (float, optional): Weight decay (L2 regularization). Defaults to 0.0 (no regularization).
+
+    Returns:
+        List[float]: Mean training loss per epoch.
     """
     mlp.train()
-    train_loader = DataLoader(dataset=dataset, batch_size=batch_size, shuffle=shuffle)
-    loss_function = nn.L1Loss()
-    optimizer = torch.optim.Adam(mlp.parameters(), lr=lr, weight_decay=weight_decay)
-    for _ in range(n_epoches):
-        current_loss = 0.0
-        for data in train_loader:
-            # Get and prepare inputs
-            inputs, targets = data
-            if len(targets.shape) == 1:
-                targets = targets.reshape((targets.shape[0], 1))
-
-            # Zero the gradients
-            optimizer.zero_grad()
+    stacked = StackedMLP.from_mlps([mlp])
+    y = dataset.y if len(dataset.y.shape) > 1 else dataset.y.unsqueeze(-1)
+    train_losses, _, _ = fit_stacked_mlp(
+        mlp=stacked,
+        X=dataset.X.unsqueeze(0),
+        y=y.unsqueeze(0),
+        batch_size=batch_size,
+        n_epoches=n_epoches,
+        lr=lr,
+        shuffle=shuffle,
+        weight_decay=weight_decay,
+    )
+    # write the fitted parameters back into the MLP
+    with torch.no_grad():
+        for layer, stacked_layer in zip(mlp.layers, stacked.layers):
+            if isinstance(layer, nn.Linear):
+                layer.weight.copy_(stacked_layer.weight[0].T)
+                layer.bias.copy_(stacked_layer.bias[0, 0])
+    return train_losses[0].tolist()
+
+
+def fit_stacked_mlp(
+    mlp: StackedMLP,
+    X: Tensor,
+    y: Tensor,
+    batch_size: int = 10,
+    n_epoches: int = 200,
+    lr: float = 1e-4,
+    shuffle: bool = True,
+    weight_decay: float = 0.0,
+    X_val: Optional[Tensor] = None,
+    y_val: Optional[Tensor] = None,
+    val_mask: Optional[Tensor] = None,
+    patience: Optional[int] = None,
+    lr_schedule: Literal["constant", "cosine"] = "constant",
+) -> Tuple[Tensor, Tensor, Tensor]:
+    """Fit all members of a stacked MLP ensemble in one optimization loop.
 
-            # Perform forward pass
-            outputs = mlp(inputs)
+    Every member is trained on its own data set, the losses of the members are summed up
+    so that the parameter updates are the same as when fitting the members one by one.
+    If `patience` is given, the training of a member is stopped as soon as its validation
+    loss has not improved for `patience` epochs and its parameters of the epoch with the
+    lowest validation loss are restored. Members without validation data are stopped based
+    on their training loss.
 
-            # Compute loss
-            loss = loss_function(outputs, targets)
+    Args:
+        mlp (StackedMLP): The stacked MLPs that should be fitted.
+        X (Tensor): Training inputs of shape `s x n x d`, one data set per member.
+        y (Tensor): Training targets of shape `s x n x m`.
+        batch_size (int, optional): Batch size, if it is at least `n`, full batch gradient
+            steps are performed. Defaults to 10.
+        n_epoches (int, optional): Maximal number of training epoches. Defaults to 200.
+        lr (float, optional): Initial learning rate. Defaults to 1e-4.
+        shuffle (bool, optional): Whereas the batches should be shuffled. Defaults to True.
+        weight_decay (float, optional): Weight decay (L2 regularization). Defaults to 0.0 (no regularization).
+        X_val (Optional[Tensor], optional): Validation inputs of shape `1 x n_val x d`, shared
+            by all members. Defaults to None.
+        y_val (Optional[Tensor], optional): Validation targets of shape `1 x n_val x m`.
+            Defaults to None.
+        val_mask (Optional[Tensor], optional): Boolean tensor of shape `s x n_val` indicating
+            which validation points are used by which member. Defaults to None, meaning that
+            all members use all validation points.
+        patience (Optional[int], optional): Number of epochs without improvement of the
+            validation loss after which the training of a member is stopped. Defaults to None
+            (no early stopping).
+        lr_schedule (Literal["constant", "cosine"], optional): Schedule of the learning rate.
+            Defaults to "constant".
 
-            # Perform backward pass
+    Returns:
+        Tuple[Tensor, Tensor, Tensor]: Training losses and validation losses of shape
+            `s x n_epochs` (NaN after the training of a member was stopped or if no validation
+            data is provided) and the number of epochs used per member.
+    """
+    mlp.train()
+    X, y = X.to(**tkwargs), y.to(**tkwargs)
+    n_estimators, n = X.shape[0], X.shape[1]
+    members = torch.arange(n_estimators).unsqueeze(-1)
+    optimizer = torch.optim.Adam(mlp.parameters(), lr=lr, weight_decay=weight_decay)
+    scheduler = (
+        torch.optim.lr_scheduler.CosineAnnealingLR(optimizer, T_max=n_epoches)
+        if lr_schedule == "cosine"
+        else None
+    )
+    if X_val is not None:
+        assert y_val is not None
+        X_val, y_val = X_val.to(**tkwargs), y_val.to(**tkwargs)
+        if val_mask is None:
+            val_mask = torch.ones(n_estimators, X_val.shape[-2], dtype=torch.bool)
+        val_weights = val_mask.to(**tkwargs)
+        n_val = val_weights.sum(dim=-1)
+    train_losses = torch.full((n_estimators, n_epoches), float("nan"), **tkwargs)
+    val_losses = torch.full((n_estimators, n_epoches), float("nan"), **tkwargs)
+    n_epochs_used = torch.full((n_estimators,), n_epoches, dtype=torch.long)
+    active = torch.ones(n_estimators, dtype=torch.bool)
+    best_losses = torch.full((n_estimators,), float("inf"), **tkwargs)
+    best_params = [p.detach().clone() for p in mlp.parameters()]
+    n_bad_epochs = torch.zeros(n_estimators, dtype=torch.long)
+    for epoch in range(n_epoches):
+        if shuffle and batch_size < n:
+            # independent permutation of the data of every member
+            perm = torch.argsort(torch.rand(n_estimators, n), dim=-1)
+        else:
+            perm = torch.arange(n).expand(n_estimators, n)
+        epoch_losses = torch.zeros(n_estimators, **tkwargs)
+        for start in range(0, n, batch_size):
+            if batch_size >= n:
+                inputs, targets = X, y
+            else:
+                idx = perm[:, start : start + batch_size]
+                inputs, targets = X[members, idx], y[members, idx]
+            optimizer.zero_grad()
+            member_losses = (mlp(inputs) - targets).abs().mean(dim=(-2, -1))
+            # stopped members do not contribute to the gradient anymore
+            loss = member_losses[active].sum()
             loss.backward()
-
-            # Perform optimization
             optimizer.step()
-
-            # Print statistics
-            current_loss += loss.item()
+            epoch_losses += member_losses.detach() * inputs.shape[-2] / n
+        if scheduler is not None:
+            scheduler.step()
+        train_losses[active, epoch] = epoch_losses[active]
+        if X_val is None and patience is None:
+            continue
+        monitored = epoch_losses
+        if X_val is not None:
+            mlp.eval()
+            with torch.no_grad():
+                errors = (mlp(X_val) - y_val).abs().mean(dim=-1)
+            mlp.train()
+            val_loss = (errors * val_weights).sum(dim=-1) / n_val
+            val_losses[active, epoch] = val_loss[active]
+            monitored = torch.where(n_val > 0, val_loss, epoch_losses)
+        if patience is None:
+            continue
+        improved = active & (monitored < best_losses)
+        with torch.no_grad():
+            for param, best_param in zip(mlp.parameters(), best_params):
+                best_param[improved] = param[improved]
+        best_losses = torch.where(improved, monitored, best_losses)
+        n_bad_epochs = torch.where(improved, 0, n_bad_epochs + 1)
+        stopped = active & (n_bad_epochs >= patience)
+        n_epochs_used[stopped] = epoch + 1
+        active = active & ~stopped
+        if not active.any():
+            break
+    if patience is not None:
+        with torch.no_grad():
+            for param, best_param in zip(mlp.parameters(), best_params):
+                param.copy_(best_param)
+    n_max = int(n_epochs_used.max())
+    return train_losses[:, :n_max], val_losses[:, :n_max], n_epochs_used
 
 
 class MLPEnsemble(BotorchSurrogate, TrainableSurrogate):
@@ -170,6 +430,14 @@ class MLPEnsemble(BotorchSurrogate, TrainableSurrogate):
         self.subsample_fraction = data_model.subsample_fraction
         self.shuffle = data_model.shuffle
         self.scaler = data_model.scaler
+        self.early_stopping_patience = data_model.early_stopping_patience
+        self.validation_fraction = data_model.validation_fraction
+        self.lr_schedule = data_model.lr_schedule
+        self.full_batch = data_model.full_batch
+        # training history of the members of the last fit
+        self.n_epochs_used: Optional[List[int]] = None
+        self.train_losses: Optional[List[np.ndarray]] = None
+        self.validation_losses: Optional[List[np.ndarray]] = None
         super().__init__(data_model, **kwargs)
 
     _output_filtering: OutputFilteringEnum = OutputFilteringEnum.ALL
@@ -179,35 +447,69 @@ class MLPEnsemble(BotorchSurrogate, TrainableSurrogate):
         scaler = get_scaler(self.inputs, self.input_preprocessing_specs, self.scaler, X)
         transformed_X = self.inputs.transform(X, self.input_preprocessing_specs)
 
-        mlps = []
-        subsample_size = round(self.subsample_fraction * X.shape[0])
-        for _ in range(self.n_estimators):
-            # resample X and Y
-            sample_idx = np.random.choice(X.shape[0], replace=True, size=subsample_size)
-            tX = torch.from_numpy(transformed_X.values[sample_idx]).to(**tkwargs)
-            ty = torch.from_numpy(Y.values[sample_idx]).to(**tkwargs)
-
-            dataset = RegressionDataSet(
-                X=scaler.transform(tX) if scaler is not None else tX,
-                y=ty,
-            )
-            mlp = MLP(
-                input_size=transformed_X.shape[1],
-                output_size=1,
-                hidden_layer_sizes=self.hidden_layer_sizes,
-                activation=self.activation,  # type: ignore
-                dropout=self.dropout,
+        n = X.shape[0]
+        n_val = round(self.validation_fraction * n)
+        if n_val > 0:
+            # every member holds out its own random validation set and draws its
+            # bootstrap sample from the remaining experiments
+            perm = np.argsort(np.random.rand(self.n_estimators, n), axis=1)
+            subsample_size = round(self.subsample_fraction * (n - n_val))
+            sample_idx = np.take_along_axis(
+                perm[:, n_val:],
+                np.random.choice(
+                    n - n_val, replace=True, size=(self.n_estimators, subsample_size)
+                ),
+                axis=1,
             )
-            fit_mlp(
-                mlp=mlp,
-                dataset=dataset,
-                batch_size=self.batch_size,
-                n_epoches=self.n_epochs,
-                lr=self.lr,
-                shuffle=self.shuffle,
-                weight_decay=self.weight_decay,
+            val_mask = np.zeros((self.n_estimators, n), dtype=bool)
+            np.put_along_axis(val_mask, perm[:, :n_val], True, axis=1)
+        else:
+            subsample_size = round(self.subsample_fraction * n)
+            # bootstrap resampling of all members at once as index tensor
+            sample_idx = np.random.choice(
+                n, replace=True, size=(self.n_estimators, subsample_size)
             )
-            mlps.append(mlp)
+            # the out-of-bag experiments are used for validation
+            val_mask = np.ones((self.n_estimators, n), dtype=bool)
+            np.put_along_axis(val_mask, sample_idx, False, axis=1)
+        use_validation = n_val > 0 or self.early_stopping_patience is not None
+        sample_idx = torch.from_numpy(sample_idx)
+        tX = torch.from_numpy(transformed_X.values).to(**tkwargs)
+        ty = torch.from_numpy(Y.values).to(**tkwargs)
+        if scaler is not None:
+            tX = scaler.transform(tX)
+        mlps = StackedMLP(
+            n_estimators=self.n_estimators,
+            input_size=transformed_X.shape[1],
+            output_size=1,
+            hidden_layer_sizes=self.hidden_layer_sizes,
+            activation=self.activation,  # type: ignore
+            dropout=self.dropout,
+        )
+        train_losses, val_losses, n_epochs_used = fit_stacked_mlp(
+            mlp=mlps,
+            X=tX[sample_idx],
+            y=ty[sample_idx],
+            batch_size=subsample_size if self.full_batch else self.batch_size,
+            n_epoches=self.n_epochs,
+            lr=self.lr,
+            shuffle=self.shuffle,
+            weight_decay=self.weight_decay,
+            X_val=tX.unsqueeze(0) if use_validation else None,
+            y_val=ty.unsqueeze(0) if use_validation else None,
+            val_mask=torch.from_numpy(val_mask) if use_validation else None,
+            patience=self.early_stopping_patience,
+            lr_schedule=self.lr_schedule,  # type: ignore
+        )
+        self.n_epochs_used = n_epochs_used.tolist()
+        self.train_losses = [
+            losses[:n_epochs].numpy()
+            for losses, n_epochs in zip(train_losses, self.n_epochs_used)
+        ]
+        self.validation_losses = [
+            losses[:n_epochs].numpy()
+            for losses, n_epochs in zip(val_losses, self.n_epochs_used)
+        ]
         self.model = _MLPEnsemble(mlps=mlps)
         if scaler is not None:
             self.model.input_transform = scaler
@@ -20,6 +20,9 @@ from bofire.utils.torch_tools import tkwargs
 class _RandomForest(EnsembleModel):
     """Botorch wrapper around the sklearn RandomForestRegressor.
     Predictions of the individual trees are interpreted as uncertainty.
+
+    For fast predictions, the trees of the forest are compiled into flat node arrays
+    which are traversed for all trees and all samples at once.
     """
 
     def __init__(self, rf: RandomForestRegressor):
@@ -33,6 +36,51 @@ class _RandomForest(EnsembleModel):
             raise ValueError("`rf` is not a sklearn RandomForestRegressor.")
         check_is_fitted(rf)
         self._rf = rf
+        self._compile()
+
+    def _compile(self):
+        """Flattens the nodes of all trees into contiguous arrays.
+
+        The children of every tree are shifted by the offset of the tree in the flat
+        arrays. Leaves point to themselves and refer to the first feature, so that a
+        sample which already reached its leaf stays there in further traversal steps.
+        """
+        trees = [estimator.tree_ for estimator in self._rf.estimators_]
+        n_nodes = np.array([tree.node_count for tree in trees], dtype=np.intp)
+        self._roots = np.concatenate(([0], np.cumsum(n_nodes)[:-1])).astype(np.intp)
+        self._depth = max(tree.max_depth for tree in trees)
+        features, thresholds, left, right, values = [], [], [], [], []
+        for tree, offset in zip(trees, self._roots):
+            nodes = np.arange(tree.node_count, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            values.append(tree.value[:, 0, 0])
+        self._features = np.concatenate(features).astype(np.intp)
+        self._thresholds = np.concatenate(thresholds)
+        self._left = np.concatenate(left).astype(np.intp)
+        self._right = np.concatenate(right).astype(np.intp)
+        self._values = np.concatenate(values)
+
+    def _predict_trees(self, X: np.ndarray) -> np.ndarray:
+        """Predicts the values of all trees for the samples in X.
+
+        Args:
+            X (np.ndarray): Input array with shape `m x d`.
+
+        Returns:
+            np.ndarray: Predictions with shape `s x m`, where `s` is the number of trees.
+        """
+        # sklearn compares float32 inputs with the thresholds
+        X = X.astype(np.float32)
+        samples = np.arange(X.shape[0])[np.newaxis, :]
+        nodes = np.repeat(self._roots[:, np.newaxis], X.shape[0], axis=1)
+        for _ in range(self._depth):
+            go_left = X[samples, self._features[nodes]] <= self._thresholds[nodes]
+            nodes = np.where(go_left, self._left[nodes], self._right[nodes])
+        return self._values[nodes]
 
     def forward(self, X: Tensor):
         r"""Compute the model output at X.
@@ -44,27 +92,13 @@ class _RandomForest(EnsembleModel):
             A `batch_shape x s x n x m`-dimensional output tensor where
             `s` is the size of the ensemble.
         """
-        # we transform to numpy
         nX = X.detach().numpy()
-        # we need to check if we have a batch dimension
-        if len(X.shape) != 3:
-            # now we add the q-batch dimension
-            nX = nX.reshape((1, *nX.shape))
-        # loop over batches
-        preds = []
-        for i in range(nX.shape[0]):
-            batch_preds = []
-            # loop over estimators
-            for estimator in self._rf.estimators_:
-                batch_preds.append(
-                    estimator.predict(nX[i]).reshape((nX[i].shape[0], 1))
-                )
-            preds.append(np.stack(batch_preds, axis=0))
-        preds = np.stack(preds, axis=0)
-        if X.ndim == 3:  # we have a batch dim
-            return torch.from_numpy(preds).to(**tkwargs)
-        else:  # we have no batch dim
-            return torch.from_numpy(preds).to(**tkwargs).squeeze(dim=0)
+        batch_shape, n = nX.shape[:-2], nX.shape[-2]
+        preds = self._predict_trees(nX.reshape((-1, nX.shape[-1])))
+        # s x (batch * n) -> batch_shape x s x n x 1
+        preds = preds.reshape((preds.shape[0], -1, n, 1))
+        preds = np.moveaxis(preds, 0, 1).reshape((*batch_shape, -1, n, 1))
+        return torch.from_numpy(preds).to(**tkwargs)
 
     @property
     def num_outputs(self) -> int:
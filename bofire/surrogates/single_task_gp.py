@@ -1,6 +1,7 @@
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, Tuple, Union
 
 import botorch
+import numpy as np
 import pandas as pd
 import torch
 from botorch.fit import fit_gpytorch_mll
@@ -81,6 +82,15 @@ def get_scaler(
 
 
 class SingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
+    """Single task GP surrogate.
+
+    Refitting the surrogate after new experiments were added can be sped up in two ways:
+    with `warm_start` the hyperparameter optimization starts from the hyperparameters of the
+    previous fit, and with `refit_interval` > 1 the hyperparameters are only optimized at every
+    `refit_interval`-th fit. In between, the hyperparameters are kept frozen and the GP is only
+    conditioned on the newly appended experiments via a low-rank update of its caches.
+    """
+
     def __init__(
         self,
         data_model: DataModel,
@@ -89,6 +99,11 @@ class SingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
         self.kernel = data_model.kernel
         self.scaler = data_model.scaler
         self.noise_prior = data_model.noise_prior
+        self.warm_start = data_model.warm_start
+        self.refit_interval = data_model.refit_interval
+        self._train_X: Optional[torch.Tensor] = None
+        self._train_Y: Optional[torch.Tensor] = None
+        self._n_updates = 0
         super().__init__(data_model=data_model, **kwargs)
 
     model: Optional[botorch.models.SingleTaskGP] = None
@@ -96,13 +111,19 @@ class SingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
     training_specs: Dict = {}
 
     def _fit(self, X: pd.DataFrame, Y: pd.DataFrame):
-        scaler = get_scaler(self.inputs, self.input_preprocessing_specs, self.scaler, X)
         transformed_X = self.inputs.transform(X, self.input_preprocessing_specs)
 
         tX, tY = torch.from_numpy(transformed_X.values).to(**tkwargs), torch.from_numpy(
             Y.values
         ).to(**tkwargs)
 
+        if self._can_update(tX, tY):
+            self._update(tX, tY)
+            return
+
+        previous_model = self.model if self.warm_start else None
+        scaler = get_scaler(self.inputs, self.input_preprocessing_specs, self.scaler, X)
+
         self.model = botorch.models.SingleTaskGP(  # type: ignore
             train_X=tX,
             train_Y=tY,
@@ -118,5 +139,136 @@ class SingleTaskGPSurrogate(BotorchSurrogate, TrainableSurrogate):
 
         self.model.likelihood.noise_covar.noise_prior = priors.map(self.noise_prior)  # type: ignore
 
+        if previous_model is not None:
+            self._load_hyperparameters(previous_model)
+
         mll = ExactMarginalLogLikelihood(self.model.likelihood, self.model)
         fit_gpytorch_mll(mll, options=self.training_specs, max_attempts=10)
+
+        self._train_X, self._train_Y = tX, tY
+        self._n_updates = 0
+
+    def _can_update(self, tX: torch.Tensor, tY: torch.Tensor) -> bool:
+        """Checks if the model can be updated by conditioning on new observations
+        instead of refitting it from scratch.
+
+        This is the case if the full refit is not yet due and the training data of the
+        last fit is a prefix of the new training data.
+
+        Args:
+            tX (torch.Tensor): Transformed training inputs.
+            tY (torch.Tensor): Training targets.
+
+        Returns:
+            bool: True if an incremental update is possible.
+        """
+        if (
+            self.model is None
+            or self._train_X is None
+            or self._train_Y is None
+            or self._n_updates + 1 >= self.refit_interval
+        ):
+            return False
+        n = self._train_X.shape[0]
+        if tX.shape[0] <= n or tX.shape[1] != self._train_X.shape[1]:
+            return False
+        return torch.equal(tX[:n], self._train_X) and torch.equal(tY[:n], self._train_Y)
+
+    def _update(self, tX: torch.Tensor, tY: torch.Tensor):
+        """Conditions the model with frozen hyperparameters on the appended observations.
+
+        Args:
+            tX (torch.Tensor): Transformed training inputs, including the already known ones.
+            tY (torch.Tensor): Training targets, including the already known ones.
+        """
+        n = self._train_X.shape[0]  # type: ignore
+        new_X, new_Y = tX[n:], tY[n:]
+        # the model could be compatibilized by a strategy, which changes its input transform
+        self.decompatibilize()
+        self.model.eval()  # type: ignore
+        with torch.no_grad():
+            # populate the prediction caches, which are needed for the low rank update
+            self.model.posterior(new_X[:1])  # type: ignore
+            model = self.model.condition_on_observations(  # type: ignore
+                X=self.model.transform_inputs(new_X), Y=new_Y  # type: ignore
+            )
+        if hasattr(model, "_original_train_inputs"):
+            model._original_train_inputs = torch.cat(
+                [model._original_train_inputs, new_X], dim=-2
+            )
+        self.model = model
+        self._train_X, self._train_Y = tX, tY
+        self._n_updates += 1
+
+    def _load_hyperparameters(self, model: botorch.models.SingleTaskGP):
+        """Initializes the hyperparameters of the current model with the ones of `model`,
+        if their shapes are matching.
+
+        Args:
+            model (botorch.models.SingleTaskGP): Model from which the hyperparameters are taken.
+        """
+        hyperparameters = dict(model.named_parameters())
+        for name, parameter in self.model.named_parameters():  # type: ignore
+            if (
+                name not in hyperparameters
+                or hyperparameters[name].shape != parameter.shape
+            ):
+                return
+        self.model.load_state_dict(hyperparameters, strict=False)  # type: ignore
+
+    def _predict_loo(
+        self, X: pd.DataFrame, Y: pd.DataFrame
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Fits the GP to all data and computes the LOO predictions for the fitted
+        hyperparameters from one Cholesky factorization of the training covariance.
+
+        Args:
+            X (pd.DataFrame): Inputs of the training data.
+            Y (pd.DataFrame): Outputs of the training data.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Means and standard deviations of the
+                held out experiments with shape (n,), means and standard deviations of the training data
+                with shape (n, n), in which row i holds the predictions of the model without experiment i.
+        """
+        # the LOO predictions rely on hyperparameters fitted to all data, so the
+        # incremental update via conditioning is skipped
+        self._train_X, self._train_Y = None, None
+        self._fit(X, Y)
+        self.model.eval()  # type: ignore
+        with torch.no_grad():
+            # in eval mode the train inputs are already transformed
+            train_X = self.model.train_inputs[0]  # type: ignore
+            train_y = self.model.train_targets  # type: ignore
+            noise = self.model.likelihood.noise.squeeze()  # type: ignore
+            n = train_X.shape[-2]
+            K = self.model.covar_module(train_X).to_dense()  # type: ignore
+            A = K + noise * torch.eye(n, **tkwargs)
+            A_inv = torch.cholesky_inverse(torch.linalg.cholesky(A))
+            alpha = A_inv @ (train_y - self.model.mean_module(train_X))  # type: ignore
+            A_inv_diag = A_inv.diagonal()
+            # held out experiments
+            test_preds = train_y - alpha / A_inv_diag
+            test_vars = 1 / A_inv_diag
+            # training data, the inverse of the reduced covariance is obtained via a
+            # rank one downdate of A_inv
+            reduced_alpha = alpha.unsqueeze(0) - A_inv * (alpha / A_inv_diag).unsqueeze(
+                -1
+            )
+            train_preds = train_y.unsqueeze(0) - noise * reduced_alpha
+            reduced_A_inv_diag = A_inv_diag.unsqueeze(
+                0
+            ) - A_inv**2 / A_inv_diag.unsqueeze(-1)
+            train_vars = 2 * noise - noise**2 * reduced_A_inv_diag
+            # diagonal entries are not part of the respective training data
+            train_preds.fill_diagonal_(float("nan"))
+            train_vars.fill_diagonal_(float("nan"))
+            # transform back to the original scale
+            mean = self.model.outcome_transform.means.squeeze()  # type: ignore
+            std = self.model.outcome_transform.stdvs.squeeze()  # type: ignore
+        return (
+            (test_preds * std + mean).numpy(),
+            (test_vars.sqrt() * std).numpy(),
+            (train_preds * std + mean).numpy(),
+            (train_vars.clamp_min(0).sqrt() * std).numpy(),
+        )
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -7,6 +7,7 @@ import pandas as pd
 from bofire.data_models.domain.domain import is_numeric
 from bofire.data_models.surrogates.api import Surrogate as DataModel
 from bofire.surrogates.values import PredictedValue
+from bofire.utils.chunking import iter_chunks
 
 
 class Surrogate(ABC):
@@ -31,30 +32,108 @@ class Surrogate(ABC):
         """Return True if model is fitted, else False."""
         return self.model is not None
 
-    def predict(self, X: pd.DataFrame) -> pd.DataFrame:
+    def predict(
+        self, X: pd.DataFrame, chunk_size: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Predicts the outputs for the provided inputs.
+
+        Args:
+            X (pd.DataFrame): Dataframe with the inputs.
+            chunk_size (Optional[int], optional): If provided, the predictions are computed
+                in chunks of at most `chunk_size` rows and written into a preallocated array,
+                which bounds the peak memory for large datasets. Defaults to None.
+
+        Returns:
+            pd.DataFrame: Dataframe with the predicted means and standard deviations.
+        """
         # check if model is fitted
         if not self.is_fitted:
             raise ValueError("Model is not fitted/available yet.")
-        # validate
-        X = self.inputs.validate_experiments(X, strict=False)
-        # transform
-        Xt = self.inputs.transform(X, self.input_preprocessing_specs)
-        # make sure that all is float64
-        for c in Xt.columns:
-            Xt[c] = pd.to_numeric(Xt[c], errors="raise")
-        # predict
-        preds, stds = self._predict(Xt)
-        # postprocess
-        predictions = pd.DataFrame(
-            data=np.hstack((preds, stds)),
-            columns=["%s_pred" % featkey for featkey in self.outputs.get_keys()]
-            + ["%s_sd" % featkey for featkey in self.outputs.get_keys()],
-        )
+        if chunk_size is None:
+            data = self._predict_chunk(X)
+        else:
+            data = np.empty((len(X), 2 * len(self.outputs)))
+            start = 0
+            for chunk in iter_chunks(X, chunk_size=chunk_size):
+                data[start : start + len(chunk)] = self._predict_chunk(chunk)
+                start += len(chunk)
+        predictions = pd.DataFrame(data=data, columns=self._prediction_columns)
         # validate
         self.validate_predictions(predictions=predictions)
         # return
         return predictions
 
+    def predict_batches(
+        self,
+        X: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Predicts the outputs for the provided inputs chunk by chunk.
+
+        Only one chunk is held in memory at a time, so this can be used to score datasets
+        which do not fit into memory at once.
+
+        Args:
+            X (Union[pd.DataFrame, Iterable[pd.DataFrame]]): Dataframe or iterable of dataframes
+                with the inputs.
+            chunk_size (Optional[int], optional): Maximal number of rows per chunk. If None, every
+                provided dataframe is predicted at once. Defaults to None.
+
+        Returns:
+            Iterator[pd.DataFrame]: Generator yielding the predictions per chunk, indexed as
+                the chunk.
+        """
+        if not self.is_fitted:
+            raise ValueError("Model is not fitted/available yet.")
+
+        def generator() -> Iterator[pd.DataFrame]:
+            for chunk in iter_chunks(X, chunk_size=chunk_size):
+                predictions = pd.DataFrame(
+                    data=self._predict_chunk(chunk),
+                    columns=self._prediction_columns,
+                    index=chunk.index,
+                )
+                self.validate_predictions(predictions=predictions)
+                yield predictions
+
+        return generator()
+
+    @property
+    def _prediction_columns(self) -> List[str]:
+        return ["%s_pred" % featkey for featkey in self.outputs.get_keys()] + [
+            "%s_sd" % featkey for featkey in self.outputs.get_keys()
+        ]
+
+    def _predict_chunk(self, X: pd.DataFrame) -> np.ndarray:
+        """Validates and transforms the inputs and predicts them.
+
+        Args:
+            X (pd.DataFrame): Dataframe with the inputs.
+
+        Returns:
+            np.ndarray: Array with the predicted means followed by the standard deviations.
+        """
+        preds, stds = self._predict(self._transform(X))
+        return np.hstack((preds, stds))
+
+    def _transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Validates the inputs and transforms them into the numeric representation
+        expected by `_predict`.
+
+        Args:
+            X (pd.DataFrame): Dataframe with the inputs.
+
+        Returns:
+            pd.DataFrame: Transformed inputs.
+        """
+        # validate
+        X = self.inputs.validate_experiments(X, strict=False)
+        # transform directly into a float64 array
+        encoder = self.inputs.get_encoder(self.input_preprocessing_specs)
+        return pd.DataFrame(
+            data=encoder.transform_array(X), columns=encoder.columns, index=X.index
+        )
+
     def validate_predictions(self, predictions: pd.DataFrame) -> pd.DataFrame:
         expected_cols = [
             f"{key}_{t}" for key in self.outputs.get_keys() for t in ["pred", "sd"]
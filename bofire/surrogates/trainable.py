@@ -1,20 +1,41 @@
 import warnings
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
+import torch
+from multiprocess.pool import Pool
 from sklearn.model_selection import KFold
 
 from bofire.data_models.enum import OutputFilteringEnum
 from bofire.surrogates.diagnostics import CvResult, CvResults
 from bofire.surrogates.surrogate import Surrogate
+from bofire.utils.memmap import MemmapExperiments
+
+# number of rows which are read at once from experiments stored on disk
+FIT_CHUNK_SIZE = 65536
+
+
+def _cross_validate_fold_in_process(
+    surrogate: "TrainableSurrogate", *args
+) -> Tuple[CvResult, CvResult, Dict[str, Any]]:
+    # the folds are already run in parallel, intra-op parallelism would oversubscribe
+    torch.set_num_threads(1)
+    return surrogate._cross_validate_fold(*args)
 
 
 class TrainableSurrogate(ABC):
     _output_filtering: OutputFilteringEnum = OutputFilteringEnum.ALL
 
-    def fit(self, experiments: pd.DataFrame, options: Optional[Dict] = None):
+    def fit(
+        self,
+        experiments: Union[pd.DataFrame, MemmapExperiments],
+        options: Optional[Dict] = None,
+    ):
         # preprocess
+        if isinstance(experiments, MemmapExperiments):
+            experiments = self._read_experiments(experiments)
         experiments = self._preprocess_experiments(experiments)
         # validate
         experiments = self.inputs.validate_experiments(  # type: ignore
@@ -27,6 +48,33 @@ class TrainableSurrogate(ABC):
         options = options or {}
         self._fit(X=X, Y=Y, **options)  # type: ignore
 
+    def _read_experiments(self, experiments: MemmapExperiments) -> pd.DataFrame:
+        """Reads the experiments which pass the output filtering from disk.
+
+        The columns of the input and output features are streamed in chunks and
+        filtered chunk by chunk, so that only the training data is held in memory.
+
+        Args:
+            experiments (MemmapExperiments): Experiments stored on disk.
+
+        Returns:
+            pd.DataFrame: The filtered experiments, the index are the row numbers.
+        """
+        output_keys = self.outputs.get_keys()  # type: ignore
+        keys = (
+            self.inputs.get_keys()  # type: ignore
+            + output_keys
+            + [f"valid_{key}" for key in output_keys]
+        )
+        columns = [key for key in keys if key in experiments.columns]
+        chunks = [
+            self._preprocess_experiments(chunk)
+            for chunk in experiments.iter_chunks(FIT_CHUNK_SIZE, columns=columns)
+        ]
+        if len(chunks) == 0:
+            return experiments.to_frame(columns=columns)
+        return pd.concat(chunks)
+
     def _preprocess_experiments(self, experiments: pd.DataFrame) -> pd.DataFrame:
         if self._output_filtering is None:
             return experiments
@@ -69,6 +117,8 @@ class TrainableSurrogate(ABC):
             ]
         ] = None,
         hook_kwargs: Optional[Dict[str, Dict[str, Any]]] = None,
+        n_jobs: int = 1,
+        method: Literal["refit", "analytic_loo"] = "refit",
     ) -> Tuple[CvResults, CvResults, Dict[str, List[Any]]]:
         """Perform a cross validation for the provided training data.
 
@@ -82,6 +132,13 @@ class TrainableSurrogate(ABC):
                 modeld and the current CV folds in the following order: X_train, y_train, X_test, y_test. Defaults to {}.
             hook_kwargs (Dict[str, Dict[str, Any]], optional): Dictionary holding hook specefic keyword arguments.
                 Defaults to {}.
+            n_jobs (int, optional): Number of worker processes in which the folds are fitted in parallel. Every
+                worker operates on its own copy of the surrogate and also calls the hooks, the results are returned
+                in fold order. For n_jobs > 1 the surrogate itself is not refitted. Defaults to 1.
+            method (Literal["refit", "analytic_loo"], optional): With "refit" the surrogate is refitted for every fold.
+                With "analytic_loo" the surrogate is fitted once to all data and the LOO predictions are computed in
+                closed form for fixed hyperparameters. This is only available for LOO CV, without hooks and for
+                surrogates which support it. Defaults to "refit".
 
         Returns:
             Tuple[CvResults, CvResults, Dict[str, List[Any]]]: First CvResults object reflects the training data,
@@ -106,6 +163,16 @@ class TrainableSurrogate(ABC):
             raise ValueError("Folds must be -1 for LOO, or > 1.")
         elif folds == -1:
             folds = n
+        if method not in ["refit", "analytic_loo"]:
+            raise ValueError(f"Unknown cross validation method {method}.")
+        if method == "analytic_loo":
+            if folds != n:
+                raise ValueError("Analytic cross validation is only available for LOO.")
+            if hooks:
+                raise ValueError("Hooks are not supported for analytic LOO.")
+            return self._cross_validate_analytic_loo(
+                experiments, include_X=include_X, include_labcodes=include_labcodes
+            )
         # preprocess hooks
         if hooks is None:
             hooks = {}
@@ -114,63 +181,193 @@ class TrainableSurrogate(ABC):
         hook_results = {key: [] for key in hooks.keys()}
         # instantiate kfold object
         cv = KFold(n_splits=folds, shuffle=True)
-        key = self.outputs.get_keys()[0]  # type: ignore
         # first filter the experiments based on the model setting
         experiments = self._preprocess_experiments(experiments)
-        train_results = []
-        test_results = []
         # now get the indices for the split
-        for train_index, test_index in cv.split(experiments):
-            X_train = experiments.iloc[train_index][self.inputs.get_keys()]  # type: ignore
-            X_test = experiments.iloc[test_index][self.inputs.get_keys()]  # type: ignore
-            y_train = experiments.iloc[train_index][self.outputs.get_keys()]  # type: ignore
-            y_test = experiments.iloc[test_index][self.outputs.get_keys()]  # type: ignore
-            train_labcodes = (
-                experiments.iloc[train_index]["labcode"] if include_labcodes else None
-            )
-            test_labcodes = (
-                experiments.iloc[test_index]["labcode"] if include_labcodes else None
+        fold_args = [
+            (
+                experiments,
+                train_index,
+                test_index,
+                include_X,
+                include_labcodes,
+                hooks,
+                hook_kwargs,
             )
-            # now fit the model
-            self._fit(X_train, y_train)
-            # now do the scoring
-            y_test_pred = self.predict(X_test)  # type: ignore
-            y_train_pred = self.predict(X_train)  # type: ignore
-            # now store the results
-            train_results.append(
-                CvResult(  # type: ignore
-                    key=key,
-                    observed=y_train[key],
-                    predicted=y_train_pred[key + "_pred"],
-                    standard_deviation=y_train_pred[key + "_sd"],
-                    X=X_train if include_X else None,
-                    labcodes=train_labcodes,
-                )
-            )
-            test_results.append(
-                CvResult(  # type: ignore
-                    key=key,
-                    observed=y_test[key],
-                    predicted=y_test_pred[key + "_pred"],
-                    standard_deviation=y_test_pred[key + "_sd"],
-                    X=X_test if include_X else None,
-                    labcodes=test_labcodes,
-                )
-            )
-            # now call the hooks if available
-            for hookname, hook in hooks.items():
-                hook_results[hookname].append(
-                    hook(
-                        model=self,  # type: ignore
-                        X_train=X_train,
-                        y_train=y_train,
-                        X_test=X_test,
-                        y_test=y_test,
-                        **hook_kwargs.get(hookname, {}),
-                    )
+            for train_index, test_index in cv.split(experiments)
+        ]
+        if n_jobs > 1:
+            with Pool(min(n_jobs, len(fold_args))) as pool:
+                fold_results = pool.starmap(
+                    _cross_validate_fold_in_process,
+                    [(self, *args) for args in fold_args],
                 )
+        else:
+            fold_results = [self._cross_validate_fold(*args) for args in fold_args]
+        # gather the results in fold order
+        train_results = []
+        test_results = []
+        for train_result, test_result, fold_hook_results in fold_results:
+            train_results.append(train_result)
+            test_results.append(test_result)
+            for hookname, hook_result in fold_hook_results.items():
+                hook_results[hookname].append(hook_result)
         return (
             CvResults(results=train_results),
             CvResults(results=test_results),
             hook_results,
         )
+
+    def _cross_validate_analytic_loo(
+        self,
+        experiments: pd.DataFrame,
+        include_X: bool = False,
+        include_labcodes: bool = False,
+    ) -> Tuple[CvResults, CvResults, Dict[str, List[Any]]]:
+        """Perform a LOO cross validation based on closed form LOO predictions.
+
+        Args:
+            experiments (pd.DataFrame): Data on which the cross validation should be performed.
+            include_X (bool, optional): If true the X values of the fold are written to respective CvResult objects.
+                Defaults to False.
+            include_labcodes (bool, optional): If true the labcodes of the fold are written to respective CvResult
+                objects. Defaults to False.
+
+        Returns:
+            Tuple[CvResults, CvResults, Dict[str, List[Any]]]: Same structure as returned by `cross_validate`, the
+                dictionary of hook results is empty.
+        """
+        key = self.outputs.get_keys()[0]  # type: ignore
+        experiments = self._preprocess_experiments(experiments)
+        X = experiments[self.inputs.get_keys()]  # type: ignore
+        Y = experiments[self.outputs.get_keys()]  # type: ignore
+        test_preds, test_stds, train_preds, train_stds = self._predict_loo(X, Y)
+        train_results = []
+        test_results = []
+        for i in range(len(experiments)):
+            train_index = np.delete(np.arange(len(experiments)), i)
+            test_index = np.array([i])
+            for results, index, preds, stds in [
+                (
+                    train_results,
+                    train_index,
+                    train_preds[i, train_index],
+                    train_stds[i, train_index],
+                ),
+                (
+                    test_results,
+                    test_index,
+                    test_preds[test_index],
+                    test_stds[test_index],
+                ),
+            ]:
+                observed = Y.iloc[index][key]
+                results.append(
+                    CvResult(  # type: ignore
+                        key=key,
+                        observed=observed,
+                        predicted=pd.Series(
+                            preds, index=observed.index, name=key + "_pred"
+                        ),
+                        standard_deviation=pd.Series(
+                            stds, index=observed.index, name=key + "_sd"
+                        ),
+                        X=X.iloc[index] if include_X else None,
+                        labcodes=experiments.iloc[index]["labcode"]
+                        if include_labcodes
+                        else None,
+                    )
+                )
+        return CvResults(results=train_results), CvResults(results=test_results), {}
+
+    def _predict_loo(
+        self, X: pd.DataFrame, Y: pd.DataFrame
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Fits the surrogate to all data and computes the LOO predictions in closed form.
+
+        Has to be overwritten by surrogates which support analytic LOO cross validation.
+
+        Args:
+            X (pd.DataFrame): Inputs of the training data.
+            Y (pd.DataFrame): Outputs of the training data.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Means and standard deviations of the
+                held out experiments with shape (n,), means and standard deviations of the training data
+                with shape (n, n), in which row i holds the predictions of the model without experiment i.
+        """
+        raise NotImplementedError(
+            f"Analytic LOO cross validation is not implemented for {self.__class__.__name__}."
+        )
+
+    def _cross_validate_fold(
+        self,
+        experiments: pd.DataFrame,
+        train_index: np.ndarray,
+        test_index: np.ndarray,
+        include_X: bool,
+        include_labcodes: bool,
+        hooks: Dict[str, Callable],
+        hook_kwargs: Dict[str, Dict[str, Any]],
+    ) -> Tuple[CvResult, CvResult, Dict[str, Any]]:
+        """Fits and scores the surrogate for a single cross validation fold.
+
+        Args:
+            experiments (pd.DataFrame): Preprocessed experiments on which the cross validation is performed.
+            train_index (np.ndarray): Indices of the training data of the fold.
+            test_index (np.ndarray): Indices of the test data of the fold.
+            include_X (bool): If true the X values of the fold are written to the CvResult objects.
+            include_labcodes (bool): If true the labcodes of the fold are written to the CvResult objects.
+            hooks (Dict[str, Callable]): Dictionary of callable hooks that are called after fitting.
+            hook_kwargs (Dict[str, Dict[str, Any]]): Dictionary holding hook specefic keyword arguments.
+
+        Returns:
+            Tuple[CvResult, CvResult, Dict[str, Any]]: CvResult for the training data, CvResult for the test
+                data and the return values of the hooks.
+        """
+        key = self.outputs.get_keys()[0]  # type: ignore
+        X_train = experiments.iloc[train_index][self.inputs.get_keys()]  # type: ignore
+        X_test = experiments.iloc[test_index][self.inputs.get_keys()]  # type: ignore
+        y_train = experiments.iloc[train_index][self.outputs.get_keys()]  # type: ignore
+        y_test = experiments.iloc[test_index][self.outputs.get_keys()]  # type: ignore
+        train_labcodes = (
+            experiments.iloc[train_index]["labcode"] if include_labcodes else None
+        )
+        test_labcodes = (
+            experiments.iloc[test_index]["labcode"] if include_labcodes else None
+        )
+        # now fit the model
+        self._fit(X_train, y_train)
+        # now do the scoring
+        y_test_pred = self.predict(X_test)  # type: ignore
+        y_train_pred = self.predict(X_train)  # type: ignore
+        # now store the results
+        train_result = CvResult(  # type: ignore
+            key=key,
+            observed=y_train[key],
+            predicted=y_train_pred[key + "_pred"],
+            standard_deviation=y_train_pred[key + "_sd"],
+            X=X_train if include_X else None,
+            labcodes=train_labcodes,
+        )
+        test_result = CvResult(  # type: ignore
+            key=key,
+            observed=y_test[key],
+            predicted=y_test_pred[key + "_pred"],
+            standard_deviation=y_test_pred[key + "_sd"],
+            X=X_test if include_X else None,
+            labcodes=test_labcodes,
+        )
+        # now call the hooks if available
+        hook_results = {
+            hookname: hook(
+                model=self,  # type: ignore
+                X_train=X_train,
+                y_train=y_train,
+                X_test=X_test,
+                y_test=y_test,
+                **hook_kwargs.get(hookname, {}),
+            )
+            for hookname, hook in hooks.items()
+        }
+        return train_result, test_result, hook_results
@@ -0,0 +1,90 @@
+from typing import Optional
+
+import pandas as pd
+import torch
+from botorch.models.approximate_gp import SingleTaskVariationalGP
+from botorch.models.transforms.outcome import Standardize
+from gpytorch.likelihoods import GaussianLikelihood
+from gpytorch.mlls import VariationalELBO
+
+import bofire.kernels.api as kernels
+import bofire.priors.api as priors
+from bofire.data_models.enum import OutputFilteringEnum
+from bofire.data_models.surrogates.api import (
+    SingleTaskVariationalGPSurrogate as DataModel,
+)
+from bofire.surrogates.botorch import BotorchSurrogate
+from bofire.surrogates.single_task_gp import get_scaler
+from bofire.surrogates.trainable import TrainableSurrogate
+from bofire.utils.torch_tools import tkwargs
+
+
+class SingleTaskVariationalGPSurrogate(BotorchSurrogate, TrainableSurrogate):
+    """Sparse variational GP surrogate based on inducing points.
+
+    In contrast to the exact `SingleTaskGPSurrogate`, the cost of the fit grows linearly
+    with the number of experiments, which makes it applicable to large experiment
+    histories.
+    """
+
+    def __init__(
+        self,
+        data_model: DataModel,
+        **kwargs,
+    ):
+        self.kernel = data_model.kernel
+        self.noise_prior = data_model.noise_prior
+        self.scaler = data_model.scaler
+        self.n_inducing_points = data_model.n_inducing_points
+        self.learn_inducing_points = data_model.learn_inducing_points
+        self.batch_size = data_model.batch_size
+        self.n_epochs = data_model.n_epochs
+        self.lr = data_model.lr
+        super().__init__(data_model=data_model, **kwargs)
+
+    model: Optional[SingleTaskVariationalGP] = None
+    _output_filtering: OutputFilteringEnum = OutputFilteringEnum.ALL
+
+    def _fit(self, X: pd.DataFrame, Y: pd.DataFrame):
+        scaler = get_scaler(self.inputs, self.input_preprocessing_specs, self.scaler, X)
+        transformed_X = self.inputs.transform(X, self.input_preprocessing_specs)
+
+        tX, tY = torch.from_numpy(transformed_X.values).to(**tkwargs), torch.from_numpy(
+            Y.values
+        ).to(**tkwargs)
+
+        self.model = SingleTaskVariationalGP(
+            train_X=tX,
+            train_Y=tY,
+            likelihood=GaussianLikelihood(noise_prior=priors.map(self.noise_prior)),
+            covar_module=kernels.map(
+                self.kernel,
+                batch_shape=torch.Size(),
+                active_dims=list(range(tX.shape[1])),
+                ard_num_dims=1,  # this keyword is ingored
+            ),
+            inducing_points=min(self.n_inducing_points, tX.shape[0]),
+            learn_inducing_points=self.learn_inducing_points,
+            outcome_transform=Standardize(m=tY.shape[-1]),
+            input_transform=scaler,
+        )
+        self._fit_elbo()
+
+    def _fit_elbo(self):
+        """Maximizes the variational ELBO with Adam on minibatches of the experiments."""
+        model = self.model.model  # type: ignore
+        # the stored training data are already transformed
+        train_X, train_y = model.train_inputs[0], model.train_targets
+        n = train_X.shape[0]
+        mll = VariationalELBO(self.model.likelihood, model, num_data=n)  # type: ignore
+        optimizer = torch.optim.Adam(self.model.parameters(), lr=self.lr)  # type: ignore
+        self.model.train()  # type: ignore
+        for _ in range(self.n_epochs):
+            perm = torch.randperm(n)
+            for start in range(0, n, self.batch_size):
+                idx = perm[start : start + self.batch_size]
+                optimizer.zero_grad()
+                loss = -mll(model(train_X[idx]), train_y[idx])
+                loss.backward()
+                optimizer.step()
+        self.model.eval()  # type: ignore
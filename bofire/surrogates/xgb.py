@@ -1,24 +1,30 @@
+import base64
 import warnings
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
-from bofire.utils.tmpfile import make_tmpfile
-
 try:
-    from xgboost import XGBRegressor  # type: ignore
+    from xgboost import DMatrix, XGBRegressor  # type: ignore
 except ImportError:
     warnings.warn("xgboost not installed, BoFire's `XGBoostSurrogate` cannot be used.")
 
-import uuid
-
 from bofire.data_models.surrogates.api import XGBoostSurrogate as DataModel
 from bofire.surrogates.surrogate import Surrogate
 from bofire.surrogates.trainable import TrainableSurrogate
 
 
 class XGBoostSurrogate(TrainableSurrogate, Surrogate):
+    """XGBoost surrogate.
+
+    With `refit_interval` > 1, a refit after experiments were appended to the previous
+    training data continues boosting from the previous booster with
+    `update_n_estimators` additional trees instead of training a new booster. Predictions
+    are made by the booster on a `DMatrix` with `predict_n_jobs` threads, and the booster
+    is serialized in memory as base64 encoded UBJSON.
+    """
+
     def __init__(self, data_model: DataModel, **kwargs) -> None:
         self.n_estimators = data_model.n_estimators
         self.max_depth = data_model.max_depth
@@ -42,7 +48,12 @@ class XGBoostSurrogate(TrainableSurrogate, Surrogate):
         self.scale_pos_weight = data_model.scale_pos_weight
         self.random_state = data_model.random_state
         self.num_parallel_tree = data_model.num_parallel_tree
-        self.tmpfile_name = f"xgb_{uuid.uuid4().hex}.json"
+        self.refit_interval = data_model.refit_interval
+        self.update_n_estimators = data_model.update_n_estimators
+        self.predict_n_jobs = data_model.predict_n_jobs
+        self._train_X: Optional[np.ndarray] = None
+        self._train_Y: Optional[np.ndarray] = None
+        self._n_updates = 0
         super().__init__(data_model=data_model, **kwargs)
 
     def _init_xgb(self):
@@ -73,26 +84,77 @@ class XGBoostSurrogate(TrainableSurrogate, Surrogate):
 
     def _fit(self, X: pd.DataFrame, Y: pd.DataFrame, **kwargs):
         transformed_X = self.inputs.transform(X, self.input_preprocessing_specs)
-        self._init_xgb()
-        self.model.fit(X=transformed_X.values, y=Y.values)
+        tX, tY = transformed_X.values, Y.values
+        if self._can_update(tX, tY):
+            # continue boosting from the previous booster on all experiments
+            self.model.set_params(n_estimators=self.update_n_estimators)
+            self.model.fit(X=tX, y=tY, xgb_model=self.model.get_booster())
+            self._n_updates += 1
+        else:
+            self._init_xgb()
+            self.model.fit(X=tX, y=tY)
+            self._n_updates = 0
+        self._train_X, self._train_Y = tX, tY
+
+    def _can_update(self, tX: np.ndarray, tY: np.ndarray) -> bool:
+        """Checks if boosting can be continued from the previous booster.
+
+        This is the case if the full refit is not yet due and the training data of the
+        last fit is a prefix of the new training data.
+
+        Args:
+            tX (np.ndarray): Transformed training inputs.
+            tY (np.ndarray): Training targets.
+
+        Returns:
+            bool: True if an incremental fit is possible.
+        """
+        if (
+            self.model is None
+            or self._train_X is None
+            or self._train_Y is None
+            or self._n_updates + 1 >= self.refit_interval
+        ):
+            return False
+        n = self._train_X.shape[0]
+        if tX.shape[0] <= n or tX.shape[1] != self._train_X.shape[1]:
+            return False
+        return np.array_equal(tX[:n], self._train_X) and np.array_equal(
+            tY[:n], self._train_Y
+        )
 
     def _predict(self, transformed_X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
-        preds = self.model.predict(transformed_X.values)
+        n_jobs = self.predict_n_jobs or -1
+        booster = self.model.get_booster()
+        booster.set_param({"nthread": n_jobs})
+        try:
+            preds = booster.predict(
+                DMatrix(
+                    np.ascontiguousarray(transformed_X.values, dtype=np.float32),
+                    nthread=n_jobs,
+                ),
+                validate_features=False,
+            )
+        finally:
+            booster.set_param({"nthread": self.n_jobs})
         return preds.reshape((transformed_X.shape[0], 1)), np.zeros(
             (transformed_X.shape[0], 1)
         )
 
     def loads(self, data: str):
-        with make_tmpfile(name=self.tmpfile_name) as fname:
-            # write to file
-            self._init_xgb()
-            with open(fname, "w") as f:
-                f.write(data)
-            self.model.load_model(fname)
+        self._init_xgb()
+        # dumps of older versions are plain JSON
+        if data.lstrip().startswith("{"):
+            raw = bytearray(data.encode())
+        else:
+            raw = bytearray(base64.b64decode(data.encode()))
+        with warnings.catch_warnings():
+            # the regressor is already initialized from the data model, only the
+            # booster is serialized
+            warnings.filterwarnings("ignore", message="Loading a native XGBoost model")
+            self.model.load_model(raw)
+        self._train_X, self._train_Y = None, None
 
     def _dumps(self) -> str:
-        with make_tmpfile(name=self.tmpfile_name) as fname:
-            self.model.save_model(fname=fname)
-            with open(fname, "r") as f:
-                dump = f.read()
-            return dump
+        raw = self.model.get_booster().save_raw(raw_format="ubj")
+        return base64.b64encode(raw).decode()
@@ -0,0 +1,39 @@
+from typing import Iterable, Iterator, Optional, Union
+
+import pandas as pd
+
+from bofire.utils.memmap import MemmapExperiments
+
+
+def iter_chunks(
+    experiments: Union[pd.DataFrame, MemmapExperiments, Iterable[pd.DataFrame]],
+    chunk_size: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """Iterates over a dataframe or an iterable of dataframes in chunks.
+
+    Args:
+        experiments (Union[pd.DataFrame, MemmapExperiments, Iterable[pd.DataFrame]]): Dataframe,
+            experiments stored on disk or iterable of dataframes, for example a generator
+            reading a large dataset piece by piece.
+        chunk_size (Optional[int], optional): Maximal number of rows per chunk. If None, every
+            provided dataframe is yielded as it is. Defaults to None.
+
+    Yields:
+        pd.DataFrame: Chunks of the provided data.
+    """
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f"chunk_size has to be at least 1 but got {chunk_size}.")
+    if isinstance(experiments, MemmapExperiments):
+        if chunk_size is None:
+            yield experiments.to_frame()
+        else:
+            yield from experiments.iter_chunks(chunk_size)
+        return
+    if isinstance(experiments, pd.DataFrame):
+        experiments = [experiments]
+    for df in experiments:
+        if chunk_size is None:
+            yield df
+            continue
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start : start + chunk_size]
@@ -0,0 +1,154 @@
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+META_FILE = "meta.json"
+
+
+class MemmapExperiments:
+    """Experiments stored on disk in a columnar format which is read via memory mapping.
+
+    Every column is stored as `.npy` file in a directory. Numerical, boolean and datetime
+    columns are stored as they are, all other columns as integer category codes whose
+    categories are kept in the metadata. The columns are opened with `np.load(...,
+    mmap_mode="r")`, so only the pages which are accessed are read from disk and they
+    can be evicted by the operating system at any time.
+
+    Use `MemmapExperiments.write` to store a dataframe, and pass the returned object or
+    `MemmapExperiments(path)` to `Strategy.tell` / `set_experiments` or to
+    `TrainableSurrogate.fit`.
+
+    Attributes:
+        path (Path): Directory of the stored experiments.
+        columns (List[str]): Keys of the stored columns.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path / META_FILE, "r") as f:
+            meta = json.load(f)
+        self._n_rows: int = meta["n_rows"]
+        self._meta: Dict[str, Dict] = {
+            column["key"]: column for column in meta["columns"]
+        }
+        self.columns: List[str] = [column["key"] for column in meta["columns"]]
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def write(
+        cls, experiments: pd.DataFrame, path: Union[str, Path]
+    ) -> "MemmapExperiments":
+        """Writes a dataframe to disk.
+
+        Args:
+            experiments (pd.DataFrame): Experiments to store, the index is not stored.
+            path (Union[str, Path]): Directory in which the columns are stored, it is
+                created if it does not exist.
+
+        Raises:
+            ValueError: when the categories of a non numerical column cannot be stored
+                as JSON.
+
+        Returns:
+            MemmapExperiments: The stored experiments.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        columns = []
+        for i, (key, values) in enumerate(experiments.items()):
+            fname = f"{i}.npy"
+            if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufcmM":
+                np.save(path / fname, values.to_numpy())
+                columns.append({"key": key, "file": fname, "categories": None})
+                continue
+            categorical = pd.Categorical(values)
+            try:
+                categories = json.loads(json.dumps(categorical.categories.tolist()))
+            except TypeError as e:
+                raise ValueError(f"Values of column {key} cannot be stored.") from e
+            np.save(path / fname, categorical.codes.astype(np.int32))
+            columns.append({"key": key, "file": fname, "categories": categories})
+        with open(path / META_FILE, "w") as f:
+            json.dump({"n_rows": len(experiments), "columns": columns}, f)
+        return cls(path)
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    def __getstate__(self):
+        # only the path is sent to worker processes, they map the files themselves
+        state = self.__dict__.copy()
+        state["_arrays"] = {}
+        return state
+
+    def _array(self, key: str) -> np.ndarray:
+        """Returns the memory mapped array of a column, the codes for categorical ones."""
+        if key not in self._arrays:
+            self._arrays[key] = np.load(
+                self.path / self._meta[key]["file"], mmap_mode="r"
+            )
+        return self._arrays[key]
+
+    def column(self, key: str, rows: Optional[slice] = None) -> pd.Series:
+        """Returns a column, numerical columns are views on the memory mapped files.
+
+        Args:
+            key (str): Key of the column.
+            rows (slice, optional): Rows to return. Defaults to None, i.e. all rows.
+
+        Returns:
+            pd.Series: The column, categorical columns have dtype object.
+        """
+        rows = slice(0, self._n_rows) if rows is None else rows
+        index = pd.RangeIndex(self._n_rows)[rows]
+        values = self._array(key)[rows]
+        categories = self._meta[key]["categories"]
+        if categories is None:
+            return pd.Series(values, index=index, name=key, copy=False)
+        # the category objects are shared between the rows, missing values have code -1
+        data = np.full(len(values), np.nan, dtype=object)
+        valid = values >= 0
+        data[valid] = np.asarray(categories, dtype=object).take(values[valid])
+        return pd.Series(data, index=index, name=key)
+
+    def to_frame(
+        self, columns: Optional[Sequence[str]] = None, rows: Optional[slice] = None
+    ) -> pd.DataFrame:
+        """Returns the experiments as dataframe.
+
+        Args:
+            columns (Sequence[str], optional): Keys of the columns to return. Defaults to
+                None, i.e. all columns.
+            rows (slice, optional): Rows to return. Defaults to None, i.e. all rows.
+
+        Returns:
+            pd.DataFrame: The experiments, the index are the row numbers.
+        """
+        columns = self.columns if columns is None else list(columns)
+        data = {key: self.column(key, rows=rows) for key in columns}
+        index = pd.RangeIndex(self._n_rows)[
+            slice(0, self._n_rows) if rows is None else rows
+        ]
+        # the columns are not consolidated into blocks, which would copy them
+        return pd.DataFrame(data, index=index, columns=columns, copy=False)
+
+    def iter_chunks(
+        self, chunk_size: int, columns: Optional[Sequence[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """Iterates over the experiments in chunks of consecutive rows.
+
+        Args:
+            chunk_size (int): Maximal number of rows per chunk.
+            columns (Sequence[str], optional): Keys of the columns to return. Defaults to
+                None, i.e. all columns.
+
+        Yields:
+            pd.DataFrame: Chunks of the experiments, the index are the row numbers.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size has to be at least 1 but got {chunk_size}.")
+        for start in range(0, self._n_rows, chunk_size):
+            yield self.to_frame(columns=columns, rows=slice(start, start + chunk_size))
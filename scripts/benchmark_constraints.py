@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import argparse
+import time
+from functools import partial
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from bofire.data_models.constraints.api import (
+    LinearEqualityConstraint,
+    LinearInequalityConstraint,
+    NChooseKConstraint,
+    NonlinearInequalityConstraint,
+)
+from bofire.data_models.domain.api import Constraints
+
+# Compares the evaluation of constraints one by one, concatenated by `pd.concat`, with
+# the cached `ConstraintsEvaluator` used by `Constraints.is_fulfilled`.
+
+
+def _concat_is_fulfilled(constraints: Constraints, experiments: pd.DataFrame):
+    """Reference implementation of `Constraints.is_fulfilled`."""
+    return pd.concat(
+        [c.is_fulfilled(experiments, 1e-6) for c in constraints], axis=1
+    ).all(axis=1)
+
+
+def _concat_call(constraints: Constraints, experiments: pd.DataFrame):
+    """Reference implementation of `Constraints.__call__`."""
+    return pd.concat([c(experiments) for c in constraints], axis=1)
+
+
+def _constraints(n_features: int) -> Constraints:
+    keys = [f"x_{i}" for i in range(n_features)]
+    return Constraints(
+        constraints=[
+            LinearInequalityConstraint(
+                features=keys[i : i + 3], coefficients=[1, 1, 1], rhs=2
+            )
+            for i in range(n_features - 2)
+        ]
+        + [
+            LinearEqualityConstraint(
+                features=keys, coefficients=[1] * n_features, rhs=n_features / 2
+            ),
+            NChooseKConstraint(
+                features=keys[: n_features // 2],
+                min_count=1,
+                max_count=3,
+                none_also_valid=False,
+            ),
+            NonlinearInequalityConstraint(expression="x_0**2 + x_1**2 - 1"),
+        ]
+    )
+
+
+def _timeit(f, n_repeats: int) -> float:
+    t1 = time.perf_counter()
+    for _ in range(n_repeats):
+        f()
+    return (time.perf_counter() - t1) / n_repeats
+
+
+def benchmark_constraints(
+    n_rows: List[int], n_features: int, n_repeats: int
+) -> pd.DataFrame:
+    constraints = _constraints(n_features)
+    rng = np.random.default_rng(42)
+    records = []
+    for n in n_rows:
+        experiments = pd.DataFrame(
+            rng.uniform(size=(n, n_features)),
+            columns=[f"x_{i}" for i in range(n_features)],
+        )
+        assert (
+            _concat_is_fulfilled(constraints, experiments)
+            == constraints.is_fulfilled(experiments)
+        ).all()
+        variants = {
+            "concat_is_fulfilled": partial(
+                _concat_is_fulfilled, constraints, experiments
+            ),
+            "is_fulfilled": partial(constraints.is_fulfilled, experiments),
+            "concat_call": partial(_concat_call, constraints, experiments),
+            "call": partial(constraints, experiments),
+        }
+        for name, f in variants.items():
+            runtime = _timeit(f, n_repeats)
+            print(f"n_rows={n}, {name}: {runtime * 1e3:.3f} ms")
+            records.append({"n_rows": n, "evaluation": name, "runtime": runtime})
+    return pd.DataFrame.from_records(records)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the evaluation of constraints."
+    )
+    parser.add_argument(
+        "-n",
+        "--n_rows",
+        type=int,
+        nargs="+",
+        default=[1, 10, 1_000, 100_000],
+        help="Numbers of experiments.",
+    )
+    parser.add_argument(
+        "-f", "--n_features", type=int, default=10, help="Number of features."
+    )
+    parser.add_argument(
+        "--n_repeats",
+        type=int,
+        default=100,
+        help="Number of repeated evaluations.",
+    )
+    args = parser.parse_args()
+
+    df = benchmark_constraints(
+        n_rows=args.n_rows, n_features=args.n_features, n_repeats=args.n_repeats
+    )
+    print(df.pivot_table(index="n_rows", columns="evaluation", values="runtime"))
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List
+
+import pandas as pd
+
+import bofire.surrogates.api as surrogates
+from bofire.benchmarks.single import Himmelblau
+from bofire.data_models.enum import RegressionMetricsEnum
+from bofire.data_models.surrogates.api import SingleTaskGPSurrogate
+
+# Compares the runtime of the LOO cross validation of a SingleTaskGPSurrogate when refitting
+# the model for every fold with the closed form LOO predictions for fixed hyperparameters.
+
+
+def benchmark_cross_validation(
+    n_experiments: List[int], methods: List[str], n_jobs: int = 1
+) -> pd.DataFrame:
+    benchmark = Himmelblau()
+    records = []
+    for n in n_experiments:
+        experiments = benchmark.f(
+            benchmark.domain.inputs.sample(n), return_complete=True
+        )
+        for method in methods:
+            surrogate = surrogates.map(
+                SingleTaskGPSurrogate(
+                    inputs=benchmark.domain.inputs, outputs=benchmark.domain.outputs
+                )
+            )
+            t1 = time.time()
+            _, test_cv, _ = surrogate.cross_validate(
+                experiments, folds=-1, method=method, n_jobs=n_jobs
+            )
+            elapsed_time = time.time() - t1
+            print(f"n={n}, method={method}: {elapsed_time:.2f} seconds")
+            records.append(
+                {
+                    "n_experiments": n,
+                    "method": method,
+                    "runtime": elapsed_time,
+                    "r2": test_cv.get_metric(RegressionMetricsEnum.R2).iloc[0],
+                }
+            )
+    return pd.DataFrame.from_records(records)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks refit and analytic LOO cross validation."
+    )
+    parser.add_argument(
+        "-n",
+        "--n_experiments",
+        type=int,
+        nargs="+",
+        default=[25, 50, 100],
+        help="Numbers of experiments for which the cross validation is performed.",
+    )
+    parser.add_argument(
+        "-m",
+        "--methods",
+        nargs="+",
+        default=["refit", "analytic_loo"],
+        help="Cross validation methods to compare.",
+    )
+    parser.add_argument(
+        "-j",
+        "--n_jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used for the refit method.",
+    )
+    args = parser.parse_args()
+
+    df = benchmark_cross_validation(
+        n_experiments=args.n_experiments, methods=args.methods, n_jobs=args.n_jobs
+    )
+    print(df.to_string(index=False))
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import argparse
+import time
+from functools import partial
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from bofire.data_models.domain.api import Outputs
+from bofire.data_models.features.api import ContinuousOutput
+
+# Compares the filters for experiments with valid outputs based on `DataFrame.query`
+# with the boolean masks computed by `Outputs.get_valid_outputs_mask`.
+
+
+def _query_all(outputs: Outputs, experiments: pd.DataFrame) -> pd.DataFrame:
+    """Reference implementation of `preprocess_experiments_all_valid_outputs`."""
+    keys = outputs.get_keys()
+    clean_exp = experiments.query(" & ".join([f"(`valid_{key}` > 0)" for key in keys]))
+    return clean_exp.dropna(subset=keys)
+
+
+def _query_any(outputs: Outputs, experiments: pd.DataFrame) -> pd.DataFrame:
+    """Reference implementation of `preprocess_experiments_any_valid_output`."""
+    return experiments.query(
+        " or ".join(
+            [f"((`valid_{key}` >0) & `{key}`.notna())" for key in outputs.get_keys()]
+        )
+    )
+
+
+def _experiments(outputs: Outputs, n_rows: int, n_inputs: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    data = {f"x_{i}": rng.uniform(size=n_rows) for i in range(n_inputs)}
+    for key in outputs.get_keys():
+        values = rng.normal(size=n_rows)
+        values[rng.uniform(size=n_rows) < 0.05] = np.nan
+        data[key] = values
+        data[f"valid_{key}"] = (rng.uniform(size=n_rows) > 0.05).astype(int)
+    return pd.DataFrame(data)
+
+
+def _timeit(f, n_repeats: int) -> float:
+    t1 = time.perf_counter()
+    for _ in range(n_repeats):
+        f()
+    return (time.perf_counter() - t1) / n_repeats
+
+
+def benchmark_output_filters(
+    n_rows: List[int], n_outputs: int, n_inputs: int, n_repeats: int
+) -> pd.DataFrame:
+    outputs = Outputs(
+        features=[ContinuousOutput(key=f"y_{i}") for i in range(n_outputs)]
+    )
+    records = []
+    for n in n_rows:
+        experiments = _experiments(outputs, n_rows=n, n_inputs=n_inputs)
+        for how in ["all", "any"]:
+            query = _query_all if how == "all" else _query_any
+            preprocess = (
+                outputs.preprocess_experiments_all_valid_outputs
+                if how == "all"
+                else outputs.preprocess_experiments_any_valid_output
+            )
+            expected = query(outputs, experiments)
+            pd.testing.assert_frame_equal(preprocess(experiments), expected)
+            variants = {
+                "query": partial(query, outputs, experiments),
+                "preprocess": partial(preprocess, experiments),
+                "mask": partial(outputs.get_valid_outputs_mask, experiments, how=how),
+            }
+            for name, f in variants.items():
+                runtime = _timeit(f, n_repeats)
+                print(f"n_rows={n}, how={how}, {name}: {runtime * 1e3:.3f} ms")
+                records.append(
+                    {"n_rows": n, "how": how, "filter": name, "runtime": runtime}
+                )
+    return pd.DataFrame.from_records(records)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the filters for experiments with valid outputs."
+    )
+    parser.add_argument(
+        "-n",
+        "--n_rows",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000, 1_000_000],
+        help="Numbers of experiments.",
+    )
+    parser.add_argument(
+        "-o", "--n_outputs", type=int, default=3, help="Number of output features."
+    )
+    parser.add_argument(
+        "-i", "--n_inputs", type=int, default=10, help="Number of input features."
+    )
+    parser.add_argument(
+        "--n_repeats",
+        type=int,
+        default=10,
+        help="Number of repeated evaluations per filter.",
+    )
+    args = parser.parse_args()
+
+    df = benchmark_output_filters(
+        n_rows=args.n_rows,
+        n_outputs=args.n_outputs,
+        n_inputs=args.n_inputs,
+        n_repeats=args.n_repeats,
+    )
+    print(df.pivot_table(index=["n_rows", "how"], columns="filter", values="runtime"))
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+import torch
+from botorch.acquisition import qExpectedImprovement
+from botorch.models.ensemble import EnsembleModel
+from sklearn.ensemble import RandomForestRegressor
+
+from bofire.benchmarks.single import Hartmann
+from bofire.surrogates.random_forest import _RandomForest
+from bofire.utils.torch_tools import tkwargs
+
+# Compares the number of acquisition function evaluations per second of a random forest
+# evaluated tree by tree with the compiled forest used in `_RandomForest.forward`.
+
+
+class _LoopRandomForest(_RandomForest):
+    """Reference implementation which calls `predict` for every batch and every tree."""
+
+    def forward(self, X: torch.Tensor):
+        nX = X.detach().numpy().reshape((-1, *X.shape[-2:]))
+        preds = np.stack(
+            [
+                np.stack(
+                    [
+                        estimator.predict(x).reshape((x.shape[0], 1))
+                        for estimator in self._rf.estimators_
+                    ],
+                    axis=0,
+                )
+                for x in nX
+            ],
+            axis=0,
+        )
+        return (
+            torch.from_numpy(preds)
+            .to(**tkwargs)
+            .reshape((*X.shape[:-2], *preds.shape[1:]))
+        )
+
+
+def benchmark_random_forest(
+    n_estimators: List[int],
+    raw_samples: int,
+    q: int,
+    n_experiments: int,
+    n_repeats: int,
+) -> pd.DataFrame:
+    benchmark = Hartmann()
+    experiments = benchmark.f(
+        benchmark.domain.inputs.sample(n_experiments), return_complete=True
+    )
+    keys = benchmark.domain.inputs.get_keys()
+    X_train = experiments[keys].values
+    y_train = experiments.y.values
+    X = torch.from_numpy(
+        benchmark.domain.inputs.sample(raw_samples * q)[keys].values
+    ).reshape((raw_samples, q, len(keys)))
+    records = []
+    for n in n_estimators:
+        rfr = RandomForestRegressor(n_estimators=n, random_state=42).fit(
+            X_train, y_train
+        )
+        for name, cls in [("loop", _LoopRandomForest), ("compiled", _RandomForest)]:
+            model: EnsembleModel = cls(rf=rfr)
+            acqf = qExpectedImprovement(model=model, best_f=float(y_train.min()))
+            with torch.no_grad():
+                t1 = time.time()
+                for _ in range(n_repeats):
+                    acqf(X)
+                elapsed_time = time.time() - t1
+            evals_per_second = n_repeats * raw_samples / elapsed_time
+            print(f"n_estimators={n}, {name}: {evals_per_second:.1f} evaluations/s")
+            records.append(
+                {
+                    "n_estimators": n,
+                    "forward": name,
+                    "runtime": elapsed_time / n_repeats,
+                    "evaluations_per_second": evals_per_second,
+                }
+            )
+    return pd.DataFrame.from_records(records)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the acquisition function evaluation of random forests."
+    )
+    parser.add_argument(
+        "-e",
+        "--n_estimators",
+        type=int,
+        nargs="+",
+        default=[100, 500],
+        help="Numbers of trees in the forest.",
+    )
+    parser.add_argument(
+        "-r",
+        "--raw_samples",
+        type=int,
+        default=1024,
+        help="Number of t-batches per acquisition function evaluation.",
+    )
+    parser.add_argument(
+        "-q", "--q", type=int, default=1, help="Number of candidates per t-batch."
+    )
+    parser.add_argument(
+        "-n",
+        "--n_experiments",
+        type=int,
+        default=100,
+        help="Number of experiments used to train the forest.",
+    )
+    parser.add_argument(
+        "--n_repeats",
+        type=int,
+        default=1,
+        help="Number of repeated acquisition function evaluations.",
+    )
+    args = parser.parse_args()
+
+    df = benchmark_random_forest(
+        n_estimators=args.n_estimators,
+        raw_samples=args.raw_samples,
+        q=args.q,
+        n_experiments=args.n_experiments,
+        n_repeats=args.n_repeats,
+    )
+    print(df.to_string(index=False))
@@ -1,12 +1,20 @@
+import os
+
 import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
 
 import bofire.benchmarks.benchmark as benchmark
 import bofire.strategies.api as strategies
 from bofire.benchmarks.multi import ZDT1
+from bofire.benchmarks.single import Himmelblau
 from bofire.data_models.domain.api import Domain
 from bofire.data_models.strategies.api import (
     QparegoStrategy as QparegoStrategyDataModel,
 )
+from bofire.data_models.strategies.api import (
+    RandomStrategy as RandomStrategyDataModel,
+)
 from bofire.data_models.strategies.api import (
     RejectionSampler as RejectionSamplerDataModel,
 )
@@ -48,3 +56,152 @@ def test_benchmark():
         assert best.shape[0] == n_iterations
         assert isinstance(best, pd.Series)
         assert isinstance(experiments, pd.DataFrame)
+
+
+def best(domain: Domain, experiments: pd.DataFrame) -> float:
+    return experiments.y.min()
+
+
+def sample(domain: Domain) -> pd.DataFrame:
+    return domain.inputs.sample(5)
+
+
+def test_benchmark_save_and_resume(tmp_path):
+    himmelblau = Himmelblau()
+    results = benchmark.run(
+        himmelblau,
+        strategy_factory=RandomStrategyDataModel,
+        n_iterations=4,
+        metric=best,
+        initial_sampler=sample,
+        n_runs=1,
+        n_procs=1,
+        seeds=[42],
+        save_dir=str(tmp_path),
+    )
+    log_file = os.path.join(str(tmp_path), "Himmelblau", "RandomStrategy_run0.jsonl")
+    with open(log_file) as f:
+        lines = f.readlines()
+    assert len(lines) == 5
+    experiments, iterations = benchmark.read_log(log_file)
+    assert_frame_equal(
+        experiments[["x_1", "x_2", "y"]],
+        results[0][0][["x_1", "x_2", "y"]].reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert list(iterations.iteration) == [0, 1, 2, 3]
+    assert (iterations.ask_time > 0).all()
+    assert (iterations.tell_time > 0).all()
+    assert iterations.metric.tolist() == results[0][1].tolist()
+    # simulate a crash during the third iteration
+    with open(log_file, "w") as f:
+        f.writelines(lines[:3] + [lines[3][:10]])
+    resumed = benchmark.run(
+        himmelblau,
+        strategy_factory=RandomStrategyDataModel,
+        n_iterations=4,
+        metric=best,
+        initial_sampler=sample,
+        n_runs=1,
+        n_procs=1,
+        seeds=[42],
+        save_dir=str(tmp_path),
+    )
+    experiments, iterations = benchmark.read_log(log_file)
+    assert list(iterations.iteration) == [0, 1, 2, 3]
+    assert len(experiments) == len(resumed[0][0]) == 9
+    # the resumed run proposes the same candidates as the uninterrupted one
+    assert_frame_equal(
+        experiments[["x_1", "x_2", "y"]],
+        results[0][0][["x_1", "x_2", "y"]].reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert_frame_equal(
+        resumed[0][0][["x_1", "x_2", "y"]].reset_index(drop=True),
+        results[0][0][["x_1", "x_2", "y"]].reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert resumed[0][1].tolist() == results[0][1].tolist()
+
+
+def test_benchmark_run_campaign(tmp_path):
+    himmelblau = Himmelblau()
+    with pytest.raises(ValueError):
+        benchmark.run(
+            himmelblau,
+            strategy_factory=RandomStrategyDataModel,
+            n_iterations=2,
+            metric=best,
+            n_runs=2,
+            seeds=[1],
+        )
+    results = benchmark.run_campaign(
+        himmelblau,
+        strategy_factories={
+            "random": RandomStrategyDataModel,
+            "random2": RandomStrategyDataModel,
+        },
+        n_iterations=2,
+        metric=best,
+        seeds=[1, 2],
+        initial_sampler=sample,
+        n_procs=2,
+        save_dir=str(tmp_path),
+    )
+    assert list(results.keys()) == ["random", "random2"]
+    for name in ["random", "random2"]:
+        assert len(results[name]) == 2
+        for seed, (experiments, metric_values) in zip([1, 2], results[name]):
+            assert len(experiments) == 7
+            assert len(metric_values) == 2
+            assert os.path.exists(
+                os.path.join(str(tmp_path), "Himmelblau", f"{name}_seed{seed}.jsonl")
+            )
+    # same seeds lead to the same runs
+    assert_frame_equal(results["random"][0][0], results["random2"][0][0])
+
+
+def test_benchmark_autosave_and_flush_interval(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    benchmark.run(
+        Himmelblau(),
+        strategy_factory=RandomStrategyDataModel,
+        n_iterations=4,
+        metric=best,
+        initial_sampler=sample,
+        n_runs=1,
+        n_procs=1,
+        safe_intervall=2,
+        save_dir=str(tmp_path),
+        flush_interval=3,
+    )
+    assert os.path.exists(os.path.join("bofire_autosaves", "Himmelblau", "run0.json"))
+    # buffered records are flushed after the last iteration
+    _, iterations = benchmark.read_log(
+        os.path.join(str(tmp_path), "Himmelblau", "RandomStrategy_run0.jsonl")
+    )
+    assert list(iterations.iteration) == [0, 1, 2, 3]
+
+
+def test_benchmark_log_files_per_strategy(tmp_path):
+    kwargs = {
+        "n_iterations": 2,
+        "metric": best,
+        "initial_sampler": sample,
+        "n_runs": 1,
+        "n_procs": 1,
+        "seeds": [1],
+        "save_dir": str(tmp_path),
+    }
+    benchmark.run(Himmelblau(), strategy_factory=RandomStrategyDataModel, **kwargs)
+    benchmark.run(
+        Himmelblau(),
+        strategy_factory=lambda domain: RandomStrategyDataModel(domain=domain),
+        strategy_name="random_lambda",
+        **kwargs,
+    )
+    assert sorted(os.listdir(os.path.join(str(tmp_path), "Himmelblau"))) == [
+        "RandomStrategy_run0.jsonl",
+        "random_lambda_run0.jsonl",
+    ]
+    assert benchmark._get_strategy_name(lambda domain: None) == "lambda"
@@ -17,6 +17,9 @@ strategy_commons = {
     "descriptor_method": CategoricalMethodEnum.EXHAUSTIVE,
     "categorical_method": CategoricalMethodEnum.EXHAUSTIVE,
     "discrete_method": CategoricalMethodEnum.EXHAUSTIVE,
+    "n_jobs": 1,
+    "max_categorical_combinations": None,
+    "num_screening_samples": 32,
     "surrogate_specs": None,
     "seed": 42,
 }
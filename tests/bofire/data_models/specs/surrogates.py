@@ -42,6 +42,14 @@ specs.add_valid(
         "num_samples": 4,
         "thinning": 2,
         "scaler": ScalerEnum.NORMALIZE,
+        "warm_start": False,
+        "warm_start_max_new_rows": 5,
+        "warm_start_warmup_steps": 8,
+        "n_chains": 1,
+        "latency_budget": None,
+        "cached_prediction": False,
+        "max_prediction_draws": None,
+        "prediction_batch_size": 1024,
         "input_preprocessing_specs": {"cat1": CategoricalEncodingEnum.ONE_HOT},
         "dump": None,
     },
@@ -89,10 +97,43 @@ specs.add_valid(
         ),
         "scaler": ScalerEnum.NORMALIZE,
         "noise_prior": BOTORCH_NOISE_PRIOR(),
+        "warm_start": False,
+        "refit_interval": 1,
         "input_preprocessing_specs": {},
         "dump": None,
     },
 )
+specs.add_valid(
+    models.SingleTaskVariationalGPSurrogate,
+    lambda: {
+        "inputs": Inputs(
+            features=[
+                features.valid(ContinuousInput).obj(),
+            ]
+            + [CategoricalInput(key="cat1", categories=["a", "b", "c"])]
+        ),
+        "outputs": Outputs(
+            features=[
+                features.valid(ContinuousOutput).obj(),
+            ]
+        ),
+        "kernel": ScaleKernel(
+            base_kernel=MaternKernel(
+                ard=True, nu=2.5, lengthscale_prior=BOTORCH_LENGTHCALE_PRIOR()
+            ),
+            outputscale_prior=BOTORCH_SCALE_PRIOR(),
+        ),
+        "noise_prior": BOTORCH_NOISE_PRIOR(),
+        "scaler": ScalerEnum.NORMALIZE,
+        "n_inducing_points": 64,
+        "learn_inducing_points": True,
+        "batch_size": 128,
+        "n_epochs": 20,
+        "lr": 0.01,
+        "input_preprocessing_specs": {"cat1": CategoricalEncodingEnum.ONE_HOT},
+        "dump": None,
+    },
+)
 specs.add_valid(
     models.RandomForestSurrogate,
     lambda: {
@@ -148,6 +189,10 @@ specs.add_valid(
         "subsample_fraction": 1.0,
         "shuffle": True,
         "scaler": ScalerEnum.NORMALIZE,
+        "early_stopping_patience": None,
+        "validation_fraction": 0.0,
+        "lr_schedule": "constant",
+        "full_batch": False,
         "input_preprocessing_specs": {},
         "dump": None,
     },
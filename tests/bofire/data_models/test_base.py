@@ -39,3 +39,16 @@ def test_assignment_validation_invalid(bla, b):
 def test_forbid_extra():
     with pytest.raises(ValidationError):
         Bla(a=2, mama="papa")
+
+
+def test_version(bla, a, b):
+    assert bla._version == 0
+    bla.a = a
+    assert bla._version == 1
+    # failed assignments do not change the version
+    with pytest.raises(ValidationError):
+        bla.a = b
+    assert bla._version == 1
+    # the version is not part of the data
+    assert bla == Bla(a=a)
+    assert "_version" not in bla.dict()
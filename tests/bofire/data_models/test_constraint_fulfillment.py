@@ -10,6 +10,7 @@ from bofire.data_models.constraints.api import (
     NonlinearEqualityConstraint,
     NonlinearInequalityConstraint,
 )
+from bofire.data_models.domain.api import Constraints
 
 F = FEATURES = ["f" + str(i) for i in range(1, 11)]
 
@@ -218,3 +219,5 @@ def get_row(features, value: float = None, values: List[float] = None):
 )
 def test_fulfillment(df, constraint, fulfilled):
     assert constraint.is_fulfilled(df).all() == fulfilled
+    evaluator = Constraints(constraints=[constraint]).get_evaluator()
+    assert evaluator.is_fulfilled(df).all() == fulfilled
@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
 import pytest
+from pandas.testing import assert_series_equal
 from pydantic.error_wrappers import ValidationError
 
 import tests.bofire.data_models.specs.api as specs
@@ -192,3 +193,99 @@ def test_constraints_jacobian(constraints, num_candidates):
                 if not hasattr(col, "__iter__"):
                     res[j] = pd.Series(np.repeat(col, candidates.shape[0]))
             assert np.allclose(returned[i], pd.DataFrame(res).transpose())
+
+
+def test_constraints_evaluator():
+    constraints = Constraints(
+        constraints=[
+            LinearEqualityConstraint(
+                features=["f1", "f2", "f3"], coefficients=[1, 1, 1], rhs=1
+            ),
+            NonlinearInequalityConstraint(expression="sqrt(f1) + exp(f2) - `f3`"),
+            LinearInequalityConstraint(
+                features=["f3", "f1"], coefficients=[2, -1], rhs=4
+            ),
+            NChooseKConstraint(
+                features=["f1", "f2", "f3"],
+                min_count=1,
+                max_count=2,
+                none_also_valid=True,
+            ),
+            NonlinearEqualityConstraint(expression="f1**2 + f2**2 - 1"),
+            NChooseKConstraint(
+                features=["f2", "f3"], min_count=1, max_count=1, none_also_valid=False
+            ),
+        ]
+    )
+    candidates = inputs.sample(50, SamplingMethodEnum.UNIFORM)
+    candidates.loc[:9, "f2"] = 0.0
+    candidates.loc[5:14, "f1"] = 0.0
+    candidates.loc[20:24, "f2"] = 1.0 - candidates.loc[20:24, "f1"] - 3.0
+    candidates.loc[20:24, "f3"] = 3.0
+    candidates.loc[30, "f1"] = np.nan
+    candidates.index = candidates.index + 100
+    evaluator = constraints.get_evaluator()
+    assert evaluator.keys == ["f1", "f2", "f3"]
+    expected = np.column_stack([c(candidates).values for c in constraints])
+    returned = constraints(candidates)
+    assert returned.shape == (50, 6)
+    assert (returned.index == candidates.index).all()
+    assert np.allclose(returned.values, expected, equal_nan=True)
+    violations = evaluator.get_violations(candidates, tol=1e-6)
+    fulfilled = np.column_stack(
+        [c.is_fulfilled(candidates, tol=1e-6).values for c in constraints]
+    )
+    assert violations.shape == (50, 6)
+    assert (violations == ~fulfilled).all()
+    assert violations.any(axis=0).all()
+    assert_series_equal(
+        evaluator.is_fulfilled(candidates),
+        pd.Series(fulfilled.all(axis=1), index=candidates.index),
+    )
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "f1 + f2.__class__.__name__.__len__()",
+        "().__class__.__base__.__subclasses__()",
+        "__import__('os').getcwd()",
+        "f1 + (lambda: 1)()",
+    ],
+)
+def test_constraints_evaluator_rejects_attributes(expression):
+    constraints = Constraints(
+        constraints=[NonlinearInequalityConstraint(expression=expression)]
+    )
+    candidates = inputs.sample(2, SamplingMethodEnum.UNIFORM)
+    # the expressions are only evaluated by pandas, which refuses them
+    with pytest.raises(Exception):
+        constraints(candidates)
+    with pytest.raises(Exception):
+        constraints.is_fulfilled(candidates)
+
+
+def test_constraints_evaluator_cache():
+    constraints = Constraints(
+        constraints=[
+            LinearInequalityConstraint(
+                features=["f1", "f2"], coefficients=[1, 1], rhs=1
+            ),
+            NonlinearInequalityConstraint(expression="f1**2 + f2**2 - 1"),
+        ]
+    )
+    evaluator = constraints.get_evaluator()
+    assert constraints.get_evaluator() is evaluator
+    candidates = pd.DataFrame({"f1": [0.2, 0.8], "f2": [0.2, 0.8], "f3": [3, 3]})
+    assert constraints.is_fulfilled(candidates).tolist() == [True, False]
+    # changes of the constraints invalidate the cached evaluator
+    constraints.constraints[0].rhs = 2
+    constraints.constraints[1].expression = "f1**2 + f2**2 - 2"
+    assert constraints.get_evaluator() is not evaluator
+    assert constraints.is_fulfilled(candidates).tolist() == [True, True]
+    evaluator = constraints.get_evaluator()
+    constraints.constraints = [
+        LinearInequalityConstraint(features=["f1", "f2"], coefficients=[1, 1], rhs=1)
+    ]
+    assert constraints.get_evaluator() is not evaluator
+    assert constraints.is_fulfilled(candidates).tolist() == [True, False]
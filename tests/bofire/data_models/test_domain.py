@@ -308,6 +308,7 @@ def test_unknown_features_in_domain(outputs, inputs, constraints):
 def test_categorical_combinations_of_domain_defaults(domain, data):
     expected = list(itertools.product(*data))
     assert domain.inputs.get_categorical_combinations() == expected
+    assert domain.inputs.get_number_of_categorical_combinations() == len(expected)
 
 
 @pytest.mark.parametrize(
@@ -412,6 +413,9 @@ def test_categorical_combinations_of_domain_filtered(domain, data, include, excl
         domain.inputs.get_categorical_combinations(include=include, exclude=exclude)
         == expected
     )
+    assert domain.inputs.get_number_of_categorical_combinations(
+        include=include, exclude=exclude
+    ) == len(expected)
 
 
 data = pd.DataFrame.from_dict(
@@ -555,6 +559,31 @@ def test_preprocess_experiments_any_valid_output(domain, data, expected):
     assert experiments["out2"].tolist() == expected["out2"].tolist()
 
 
+@pytest.mark.parametrize("valid_dtype", ["int64", "float64", "bool", "boolean"])
+@pytest.mark.parametrize(
+    "output_feature_keys, how",
+    [(None, "all"), (["out2"], "all"), (None, "any"), (["out1"], "any")],
+)
+def test_get_valid_outputs_mask(valid_dtype, output_feature_keys, how):
+    df = data.astype({"valid_out1": valid_dtype, "valid_out2": valid_dtype})
+    if valid_dtype == "boolean":
+        df.loc[0, "valid_out2"] = pd.NA
+    keys = output_feature_keys or ["out1", "out2"]
+    expected = df.query(
+        (" & " if how == "all" else " | ").join(
+            [f"((`valid_{key}` > 0) & `{key}`.notna())" for key in keys]
+        )
+    )
+    outputs = Outputs(
+        features=[ContinuousOutput(key="out1"), ContinuousOutput(key="out2")]
+    )
+    mask = outputs.get_valid_outputs_mask(
+        df, output_feature_keys=output_feature_keys, how=how
+    )
+    assert mask.dtype == bool
+    assert_frame_equal(df.loc[mask], expected)
+
+
 @pytest.mark.parametrize(
     "domain, data, expected",
     [
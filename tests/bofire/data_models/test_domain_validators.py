@@ -247,6 +247,57 @@ def test_domain_validate_experiments_invalid_labcode():
         domain4.validate_experiments(experiments)
 
 
+def test_domain_validate_experiments_validated_rows():
+    experiments = generate_experiments(domain4, row_count=6, include_labcode=True)
+    experiments["cont"] = experiments["cont"].astype(object)
+    experiments.loc[0, "cont"] = "a"
+    experiments.loc[1, "cat"] = "unknown"
+    # the invalid values are in the already validated rows
+    domain4.validate_experiments(experiments, validated_rows=2)
+    with pytest.raises(ValueError, match="are numerical"):
+        domain4.validate_experiments(experiments, validated_rows=0)
+    with pytest.raises(ValueError, match="invalid values for `cat`"):
+        domain4.validate_experiments(experiments, validated_rows=1)
+    # the labcodes have to be unique over all rows
+    experiments.loc[5, "labcode"] = experiments.loc[0, "labcode"]
+    with pytest.raises(ValueError, match="labcodes are not unique"):
+        domain4.validate_experiments(experiments, validated_rows=2)
+
+
+def test_domain_validate_experiments_validated_rows_strict():
+    experiments = generate_experiments(domain6, row_count=4)
+    experiments["if6"] = ["c1", "c2", "c3", "c1"]
+    domain6.validate_experiments(experiments, strict=True, validated_rows=3)
+    # the strict checks take all rows into account
+    with pytest.raises(ValueError, match="not used"):
+        domain6.validate_experiments(
+            experiments.iloc[2:].reset_index(drop=True), strict=True, validated_rows=1
+        )
+
+
+def test_inputs_validator_cache():
+    inputs = Domain(
+        inputs=[
+            ContinuousInput(key="x", bounds=(0, 1)),
+            CategoricalInput(key="c", categories=["a", "b"]),
+        ]
+    ).inputs
+    validator = inputs.get_validator()
+    assert inputs.get_validator() is validator
+    candidates = pd.DataFrame({"x": [0.5, 1.5], "c": ["a", "b"]})
+    with pytest.raises(ValueError, match="smaller than upper bound"):
+        inputs.validate_inputs(candidates)
+    # changes of the features invalidate the cached validator
+    inputs.features[0].bounds = (0, 2)
+    assert inputs.get_validator() is not validator
+    inputs.validate_inputs(candidates)
+    validator = inputs.get_validator()
+    inputs.features = [ContinuousInput(key="x", bounds=(0, 1))]
+    assert inputs.get_validator() is not validator
+    with pytest.raises(ValueError, match="smaller than upper bound"):
+        inputs.validate_inputs(candidates)
+
+
 @pytest.mark.parametrize(
     "domain, candidates", [(d, generate_candidates(d)) for d in domains]
 )
@@ -1503,6 +1503,92 @@ def test_inputs_transform(specs):
     assert_frame_equal(samples, untransformed)
 
 
+@pytest.mark.parametrize(
+    "specs",
+    [
+        (
+            {
+                "x2": CategoricalEncodingEnum.ONE_HOT,
+                "x3": CategoricalEncodingEnum.DESCRIPTOR,
+            }
+        ),
+        (
+            {
+                "x2": CategoricalEncodingEnum.DUMMY,
+                "x3": CategoricalEncodingEnum.ONE_HOT,
+            }
+        ),
+        (
+            {
+                "x2": CategoricalEncodingEnum.ORDINAL,
+                "x3": CategoricalEncodingEnum.DUMMY,
+            }
+        ),
+    ],
+)
+def test_inputs_encoder(specs):
+    inps = Inputs(
+        features=[
+            ContinuousInput(key="x1", bounds=(0, 1)),
+            CategoricalInput(key="x2", categories=["apple", "banana", "orange"]),
+            CategoricalDescriptorInput(
+                key="x3",
+                categories=["apple", "banana", "orange", "cherry"],
+                descriptors=["d1", "d2"],
+                values=[[1, 2], [3, 4], [5, 6], [7, 8]],
+            ),
+        ]
+    )
+    samples = inps.sample(n=20)
+    encoder = inps.get_encoder(specs)
+    transformed = encoder.transform_array(samples)
+    assert transformed.dtype == np.float64
+    assert transformed.shape == (20, encoder.n_columns)
+    # compare with the featurewise encodings
+    for key, enc in specs.items():
+        feat = inps.get_by_key(key)
+        if enc == CategoricalEncodingEnum.ONE_HOT:
+            expected = feat.to_onehot_encoding(samples[key])
+        elif enc == CategoricalEncodingEnum.DUMMY:
+            expected = feat.to_dummy_encoding(samples[key])
+        elif enc == CategoricalEncodingEnum.ORDINAL:
+            expected = feat.to_ordinal_encoding(samples[key]).to_frame()
+        else:
+            expected = feat.to_descriptor_encoding(samples[key])
+        np.testing.assert_allclose(
+            transformed[:, list(encoder.features2idx[key])], expected.values
+        )
+        assert list(expected.columns) == list(encoder.features2names[key])
+    untransformed = encoder.inverse_transform(
+        pd.DataFrame(transformed, columns=encoder.columns)
+    )
+    assert_frame_equal(samples, untransformed)
+
+
+def test_inputs_encoder_cache():
+    inps = Inputs(
+        features=[
+            ContinuousInput(key="x1", bounds=(0, 1)),
+            CategoricalInput(key="x2", categories=["apple", "banana", "orange"]),
+        ]
+    )
+    one_hot = {"x2": CategoricalEncodingEnum.ONE_HOT}
+    encoder = inps.get_encoder(one_hot)
+    # the encoder is cached per specs
+    assert inps.get_encoder({"x2": CategoricalEncodingEnum.ONE_HOT}) is encoder
+    ordinal = inps.get_encoder({"x2": CategoricalEncodingEnum.ORDINAL})
+    assert ordinal is not encoder
+    assert inps.get_encoder(one_hot) is encoder
+    # changes of the features invalidate the cached encoders
+    inps.features[1] = CategoricalInput(key="x2", categories=["apple", "banana"])
+    encoder = inps.get_encoder(one_hot)
+    assert encoder.columns == ["x1", "x2_apple", "x2_banana"]
+    inps.features[0].bounds = (0, 2)
+    assert inps.get_encoder(one_hot) is not encoder
+    inps.features = [ContinuousInput(key="x1", bounds=(0, 1))]
+    assert inps.get_encoder({}).columns == ["x1"]
+
+
 if1 = specs.features.valid(ContinuousInput).obj(key="if1")
 if2 = specs.features.valid(ContinuousInput).obj(key="if2", bounds=(3, 3))
 if3 = specs.features.valid(CategoricalInput).obj(
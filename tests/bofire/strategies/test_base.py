@@ -641,6 +641,7 @@ def test_base_get_categorical_combinations(
     c = unittest.TestCase()
     combo = myStrategy.get_categorical_combinations()
     c.assertCountEqual(combo, expected)
+    assert myStrategy.get_number_of_categorical_combinations() == len(expected)
 
 
 @pytest.mark.parametrize("domain", [(domains[0])])
@@ -70,6 +70,24 @@ def test_generate_surrogate_specs(strategy: Strategy, expected_count: int):
     assert len(surrogate_specs.surrogates) == expected_count
 
 
+def test_generate_surrogate_specs_keeps_options():
+    domain = VALID_BOTORCH_QEHVI_STRATEGY_SPEC["domain"]
+    specs = surrogate_data_models.BotorchSurrogates(
+        surrogates=[
+            surrogate_data_models.SingleTaskGPSurrogate(
+                inputs=domain.inputs,
+                outputs=Outputs(features=[domain.outputs.get_by_key("of1")]),
+            ),
+        ],
+        n_jobs=2,
+    )
+    surrogate_specs = data_models.BotorchStrategy._generate_surrogate_specs(
+        domain, specs
+    )
+    assert len(surrogate_specs.surrogates) == 2
+    assert surrogate_specs.n_jobs == 2
+
+
 @pytest.mark.parametrize(
     "strategy, specs",
     [
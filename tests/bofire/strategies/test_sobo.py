@@ -1,6 +1,7 @@
 import math
 from itertools import chain
 
+import numpy as np
 import pytest
 import torch
 from botorch.acquisition import (
@@ -10,15 +11,19 @@ from botorch.acquisition import (
     qSimpleRegret,
     qUpperConfidenceBound,
 )
+from pandas.testing import assert_frame_equal
 
 import bofire.data_models.strategies.api as data_models
 import tests.bofire.data_models.specs.api as specs
-from bofire.benchmarks.single import Himmelblau
+from bofire.benchmarks.single import Ackley, Himmelblau
 from bofire.data_models.acquisition_functions.api import qEI, qNEI, qPI, qSR, qUCB
 from bofire.data_models.strategies.api import (
     PolytopeSampler as PolytopeSamplerDataModel,
 )
+from bofire.data_models.surrogates.api import BotorchSurrogates, SingleTaskGPSurrogate
 from bofire.strategies.api import PolytopeSampler, SoboStrategy
+from bofire.utils.memmap import MemmapExperiments
+from bofire.utils.torch_tools import tkwargs
 from tests.bofire.strategies.test_base import domains
 
 # from tests.bofire.strategies.botorch.test_model_spec import VALID_MODEL_SPEC_LIST
@@ -178,3 +183,141 @@ def test_get_acqf_input(acqf, num_experiments, num_candidates):
         num_candidates,
         len(set(chain(*names.values()))),
     )
+
+
+def test_get_acqf_input_cache():
+    benchmark = Himmelblau()
+    experiments = benchmark.f(benchmark.domain.inputs.sample(10), return_complete=True)
+    data_model = data_models.SoboStrategy(
+        domain=benchmark.domain, acquisition_function=qEI()
+    )
+    strategy = SoboStrategy(data_model=data_model)
+    strategy.tell(experiments.iloc[:8])
+    X_train, X_pending = strategy.get_acqf_input_tensors()
+    assert X_pending is None
+    # unchanged data returns the cached tensors
+    X_train2, _ = strategy.get_acqf_input_tensors()
+    assert X_train2 is X_train
+    assert strategy._features2idx is strategy._features2idx
+    # changes of the experiments invalidate the cache
+    strategy.tell(experiments.iloc[8:])
+    X_train3, _ = strategy.get_acqf_input_tensors()
+    assert X_train3.shape == (10, 2)
+    strategy.tell(experiments.iloc[:5], replace=True)
+    X_train4, _ = strategy.get_acqf_input_tensors()
+    assert X_train4.shape == (5, 2)
+    # changes of the candidates invalidate the cache
+    strategy.add_candidates(benchmark.domain.inputs.sample(2))
+    _, X_pending = strategy.get_acqf_input_tensors()
+    assert X_pending.shape == (2, 2)
+    strategy.reset_candidates()
+    _, X_pending = strategy.get_acqf_input_tensors()
+    assert X_pending is None
+
+
+def test_sobo_ask_n_jobs():
+    benchmark = Himmelblau()
+    experiments = benchmark.f(benchmark.domain.inputs.sample(10), return_complete=True)
+    candidates = []
+    for _ in range(2):
+        data_model = data_models.SoboStrategy(
+            domain=benchmark.domain,
+            acquisition_function=qEI(),
+            n_jobs=2,
+            num_restarts=4,
+            num_raw_samples=64,
+            seed=42,
+        )
+        strategy = SoboStrategy(data_model=data_model)
+        strategy.tell(experiments)
+        candidates.append(strategy.ask(candidate_count=2))
+    assert len(candidates[0]) == 2
+    assert_frame_equal(candidates[0], candidates[1])
+
+
+def test_sobo_screen_categorical_combinations():
+    benchmark = Ackley(categorical=True, dim=3)
+    experiments = benchmark.f(benchmark.domain.inputs.sample(10), return_complete=True)
+    data_model = data_models.SoboStrategy(
+        domain=benchmark.domain,
+        acquisition_function=qEI(),
+        max_categorical_combinations=2,
+        num_restarts=2,
+        num_raw_samples=32,
+    )
+    strategy = SoboStrategy(data_model=data_model)
+    strategy.tell(experiments)
+    assert strategy.get_number_of_categorical_combinations() == 3
+    _, _, _, _, _, fixed_features_list = strategy._setup_ask()
+    screened = strategy._screen_categorical_combinations(
+        acqfs=strategy._get_acqfs(1),
+        bounds=torch.tensor(
+            strategy.domain.inputs.get_bounds(specs=strategy.input_preprocessing_specs)
+        ).to(**tkwargs),
+        fixed_features_list=fixed_features_list,
+    )
+    assert len(screened) == 2
+    all_combinations = strategy.get_categorical_combinations()
+    assert all(combination in all_combinations for combination in screened)
+    candidates = strategy.ask(candidate_count=1)
+    assert len(candidates) == 1
+
+
+def test_sobo_tell_refit_interval():
+    benchmark = Himmelblau()
+    experiments = benchmark.f(benchmark.domain.inputs.sample(15), return_complete=True)
+    data_model = data_models.SoboStrategy(
+        domain=benchmark.domain,
+        acquisition_function=qEI(),
+        surrogate_specs=BotorchSurrogates(
+            surrogates=[
+                SingleTaskGPSurrogate(
+                    inputs=benchmark.domain.inputs,
+                    outputs=benchmark.domain.outputs,
+                    refit_interval=2,
+                )
+            ]
+        ),
+        num_restarts=2,
+        num_raw_samples=32,
+    )
+    strategy = SoboStrategy(data_model=data_model)
+    strategy.tell(experiments.iloc[:10])
+    strategy.tell(experiments.iloc[10:])
+    surrogate = strategy.surrogate_specs.surrogates[0]
+    assert surrogate._n_updates == 1
+    assert surrogate.model.train_inputs[0].shape == (15, 2)
+    candidates = strategy.ask(candidate_count=1)
+    assert len(candidates) == 1
+
+
+def test_sobo_tell_memmap(tmp_path):
+    benchmark = Himmelblau()
+    experiments = benchmark.f(benchmark.domain.inputs.sample(15), return_complete=True)
+    stored = MemmapExperiments.write(experiments, tmp_path)
+    data_model = data_models.SoboStrategy(
+        domain=benchmark.domain,
+        acquisition_function=qEI(),
+        num_restarts=2,
+        num_raw_samples=32,
+    )
+    strategy = SoboStrategy(data_model=data_model)
+    strategy.tell(stored)
+    assert strategy._experiments_source is stored
+    assert strategy.num_experiments == 15
+    # the experiments are not loaded into memory
+    assert np.shares_memory(
+        strategy.experiments["x_1"].to_numpy(), stored.to_frame()["x_1"].to_numpy()
+    )
+    assert strategy.surrogate_specs.surrogates[0].model.train_inputs[0].shape == (
+        15,
+        2,
+    )
+    candidates = strategy.ask(candidate_count=1)
+    strategy.tell(
+        benchmark.f(
+            candidates[benchmark.domain.inputs.get_keys()], return_complete=True
+        )
+    )
+    assert strategy.num_experiments == 16
+    assert strategy._experiments_source is strategy.experiments
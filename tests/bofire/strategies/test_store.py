@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from bofire.strategies.store import ExperimentStore
+
+
+def _frame(n: int, offset: int = 0) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "x": np.arange(offset, offset + n, dtype=float),
+            "cat": [f"c{i % 3}" for i in range(n)],
+            "count": np.arange(n, dtype=int),
+            "valid_y": np.ones(n, dtype=bool),
+        }
+    )
+
+
+def test_experiment_store_append():
+    store = ExperimentStore(initial_capacity=2)
+    assert store.is_empty
+    assert store.frame is None
+    assert len(store) == 0
+    frames = [_frame(n, offset=10 * i) for i, n in enumerate([1, 3, 0, 5, 2])]
+    versions = [store.version]
+    for df in frames:
+        store.append(df)
+        versions.append(store.version)
+        assert_frame_equal(
+            store.frame, pd.concat(frames[: len(versions) - 1], ignore_index=True)
+        )
+    assert len(store) == 11
+    assert store.capacity == 16
+    assert versions == sorted(set(versions))
+    # the dataframe is cached until the data changes
+    assert store.frame is store.frame
+
+
+def test_experiment_store_set_keeps_index_and_returned_frames():
+    store = ExperimentStore()
+    df = _frame(3)
+    df.index = [5, 6, 7]
+    store.set(df)
+    assert_frame_equal(store.frame, df)
+    frame = store.frame
+    store.set(_frame(2, offset=100))
+    # already returned dataframes keep their values
+    assert_frame_equal(frame, df)
+    store.append(_frame(1))
+    assert list(store.frame.index) == [0, 1, 2]
+    store.reset()
+    assert store.is_empty
+    assert store.frame is None
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        (pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [0.5]})),
+        (pd.DataFrame({"a": [1.0, 2.0]}), pd.DataFrame({"a": ["b"]})),
+        (pd.DataFrame({"a": [True]}), pd.DataFrame({"a": [1.5]})),
+        (pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"b": ["x"]})),
+        (pd.DataFrame({"a": [1, 2], "b": [True, False]}), pd.DataFrame({"a": [3]})),
+    ],
+)
+def test_experiment_store_append_upcasts(old, new):
+    store = ExperimentStore(initial_capacity=1)
+    store.append(old)
+    store.append(new)
+    expected = pd.concat((old, new), ignore_index=True)
+    assert_frame_equal(store.frame, expected, check_dtype=False)
+    assert list(store.columns) == list(expected.columns)
+
+
+def test_experiment_store_set_without_copy():
+    df = _frame(4)
+    for key in df:
+        df[key].to_numpy().flags.writeable = False
+    store = ExperimentStore(initial_capacity=2)
+    store.set(df, copy=False)
+    assert np.shares_memory(store.frame["x"].to_numpy(), df["x"].to_numpy())
+    assert store.capacity == 4
+    # read-only arrays are copied on the next append
+    store.append(df.iloc[:0])
+    assert not np.shares_memory(store.frame["x"].to_numpy(), df["x"].to_numpy())
+    store.append(_frame(2, offset=4))
+    assert_frame_equal(
+        store.frame, pd.concat([df, _frame(2, offset=4)], ignore_index=True)
+    )
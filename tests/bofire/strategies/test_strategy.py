@@ -262,7 +262,7 @@ def test_strategy_set_experiments():
     experiments = generate_experiments(domain, 2)
     strategy.set_experiments(experiments=experiments)
     assert_frame_equal(strategy.experiments, experiments)
-    assert_frame_equal(strategy._experiments, experiments)
+    assert_frame_equal(strategy._experiment_store.frame, experiments)
     assert strategy.num_experiments == 2
 
 
@@ -283,6 +283,25 @@ def test_strategy_add_experiments():
     )
 
 
+def test_strategy_valid_outputs_mask_cache():
+    strategy = dummy.DummyStrategy(
+        data_model=dummy.DummyStrategyDataModel(domain=domain)
+    )
+    experiments = generate_experiments(domain, 4)
+    for key in domain.outputs.get_keys():
+        experiments[f"valid_{key}"] = 1
+    experiments.loc[1, f"valid_{domain.outputs.get_keys()[0]}"] = 0
+    strategy.set_experiments(experiments=experiments)
+    mask = strategy._valid_outputs_mask()
+    assert mask.tolist() == [True, False, True, True]
+    # the mask is cached until the experiments change
+    assert strategy._valid_outputs_mask() is mask
+    assert strategy._valid_outputs_mask(how="any") is not mask
+    assert not mask.flags.writeable
+    strategy.add_experiments(experiments=experiments.iloc[2:])
+    assert strategy._valid_outputs_mask().tolist() == [True, False] + [True] * 4
+
+
 def test_strategy_set_candidates():
     strategy = dummy.DummyStrategy(
         data_model=dummy.DummyStrategyDataModel(domain=domain)
@@ -291,7 +310,9 @@ def test_strategy_set_candidates():
     candidates = generate_candidates(domain, 2)
     strategy.set_candidates(candidates=candidates)
     assert_frame_equal(strategy.candidates, candidates[domain.inputs.get_keys()])
-    assert_frame_equal(strategy._candidates, candidates[domain.inputs.get_keys()])
+    assert_frame_equal(
+        strategy._candidate_store.frame, candidates[domain.inputs.get_keys()]
+    )
     assert strategy.num_candidates == 2
     strategy.reset_candidates()
     assert strategy.num_candidates == 0
@@ -533,6 +554,23 @@ def test_predictive_strategy_predict(domain, experiments):
     )
 
 
+def test_predictive_strategy_predict_chunks():
+    domain = Domain.from_lists(inputs=[if1, if2], outputs=[of1, of2], constraints=[])
+    strategy = dummy.DummyPredictiveStrategy(
+        data_model=dummy.DummyPredictiveStrategyDataModel(domain=domain)
+    )
+    strategy.tell(e3)
+    candidates = pd.concat([generate_candidates(domain=domain, row_count=5)] * 3)
+    candidates.index = range(10, 25)
+    preds = strategy.predict(candidates)
+    chunked_preds = strategy.predict(candidates, chunk_size=4)
+    assert list(chunked_preds.columns) == list(preds.columns)
+    assert list(chunked_preds.index) == list(candidates.index)
+    batches = list(strategy.predict_batches(candidates, chunk_size=4))
+    assert [len(batch) for batch in batches] == [4, 4, 4, 3]
+    assert list(pd.concat(batches).index) == list(candidates.index)
+
+
 @pytest.mark.parametrize(
     "domain",
     [
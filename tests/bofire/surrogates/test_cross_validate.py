@@ -1,4 +1,8 @@
+import copy
+
+import numpy as np
 import pytest
+import torch
 
 import bofire.surrogates.api as surrogates
 from bofire.data_models.domain.api import Inputs, Outputs
@@ -8,7 +12,11 @@ from bofire.data_models.features.api import (
     ContinuousInput,
     ContinuousOutput,
 )
-from bofire.data_models.surrogates.api import SingleTaskGPSurrogate
+from bofire.data_models.surrogates.api import (
+    RandomForestSurrogate,
+    SingleTaskGPSurrogate,
+)
+from bofire.utils.torch_tools import tkwargs
 
 
 @pytest.mark.parametrize("folds", [5, 3, 10, -1])
@@ -179,6 +187,180 @@ def test_model_cross_validate_hooks():
     assert hook_results["hook2"] == [(8, 2), (8, 2), (8, 2), (8, 2), (8, 2)]
 
 
+def test_model_cross_validate_n_jobs():
+    def hook(model, X_train, y_train, X_test, y_test):
+        assert isinstance(model, surrogates.SingleTaskGPSurrogate)
+        return list(X_test.index)
+
+    inputs = Inputs(
+        features=[
+            ContinuousInput(
+                key=f"x_{i+1}",
+                bounds=(-4, 4),
+            )
+            for i in range(2)
+        ]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=10)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments["valid_y"] = 1
+    model = surrogates.map(SingleTaskGPSurrogate(inputs=inputs, outputs=outputs))
+    results = []
+    for n_jobs in [1, 2]:
+        np.random.seed(42)
+        results.append(
+            model.cross_validate(
+                experiments, folds=5, hooks={"hook": hook}, n_jobs=n_jobs
+            )
+        )
+    (_, test_cv, hook_results), (_, test_cv_parallel, hook_results_parallel) = results
+    assert len(test_cv_parallel.results) == 5
+    assert hook_results == hook_results_parallel
+    # the parallel folds are run with one thread per process
+    num_threads = torch.get_num_threads()
+    torch.set_num_threads(2)
+    try:
+        _, _, thread_results = model.cross_validate(
+            experiments,
+            folds=5,
+            hooks={"threads": lambda **kwargs: torch.get_num_threads()},
+            n_jobs=2,
+        )
+    finally:
+        torch.set_num_threads(num_threads)
+    assert thread_results["threads"] == [1] * 5
+    for result, result_parallel in zip(test_cv.results, test_cv_parallel.results):
+        assert list(result.observed.index) == list(result_parallel.observed.index)
+        np.testing.assert_allclose(
+            result.predicted, result_parallel.predicted, rtol=1e-3
+        )
+
+
+@pytest.mark.parametrize("include_X, include_labcodes", [[True, True], [False, False]])
+def test_model_cross_validate_analytic_loo(include_X, include_labcodes):
+    inputs = Inputs(
+        features=[
+            ContinuousInput(
+                key=f"x_{i+1}",
+                bounds=(-4, 4),
+            )
+            for i in range(2)
+        ]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=10)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments["valid_y"] = 1
+    experiments["labcode"] = [str(i) for i in range(10)]
+    model = surrogates.map(SingleTaskGPSurrogate(inputs=inputs, outputs=outputs))
+    train_cv, test_cv, hook_results = model.cross_validate(
+        experiments,
+        folds=-1,
+        include_X=include_X,
+        include_labcodes=include_labcodes,
+        method="analytic_loo",
+    )
+    assert hook_results == {}
+    assert len(train_cv.results) == 10
+    assert len(test_cv.results) == 10
+    for i, (train_result, test_result) in enumerate(
+        zip(train_cv.results, test_cv.results)
+    ):
+        assert train_result.n_samples == 9
+        assert test_result.n_samples == 1
+        assert list(test_result.observed.index) == [experiments.index[i]]
+        assert np.all(np.isfinite(train_result.predicted.values))
+        assert np.all(train_result.standard_deviation.values > 0)
+        if include_X:
+            assert train_result.X.shape == (9, 2)
+            assert test_result.X.shape == (1, 2)
+        else:
+            assert train_result.X is None
+        if include_labcodes:
+            assert list(test_result.labcodes) == [str(i)]
+        else:
+            assert test_result.labcodes is None
+    # the test predictions match the ones of a model with the same hyperparameters
+    # which is conditioned on the training data of the fold only
+    fold_model = copy.deepcopy(model.model)
+    train_X, train_y = fold_model.train_inputs[0], fold_model.train_targets
+    fold_model.set_train_data(train_X[1:], train_y[1:], strict=False)
+    with torch.no_grad():
+        posterior = fold_model.posterior(
+            torch.from_numpy(experiments.iloc[:1][["x_1", "x_2"]].values).to(**tkwargs),
+            observation_noise=True,
+        )
+    assert np.allclose(
+        test_cv.results[0].predicted.values, posterior.mean.detach().numpy()
+    )
+    assert np.allclose(
+        test_cv.results[0].standard_deviation.values,
+        posterior.variance.sqrt().detach().numpy(),
+    )
+
+
+def test_model_cross_validate_analytic_loo_refit_interval():
+    inputs = Inputs(
+        features=[
+            ContinuousInput(
+                key=f"x_{i+1}",
+                bounds=(-4, 4),
+            )
+            for i in range(2)
+        ]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=10)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments["valid_y"] = 1
+    model = surrogates.map(
+        SingleTaskGPSurrogate(inputs=inputs, outputs=outputs, refit_interval=5)
+    )
+    model.fit(experiments.iloc[:8])
+    # the appended experiments would be conditioned on, but LOO needs a full refit
+    _, test_cv, _ = model.cross_validate(experiments, folds=-1, method="analytic_loo")
+    assert model._n_updates == 0
+    reference = surrogates.map(SingleTaskGPSurrogate(inputs=inputs, outputs=outputs))
+    _, reference_cv, _ = reference.cross_validate(
+        experiments, folds=-1, method="analytic_loo"
+    )
+    for result, reference_result in zip(test_cv.results, reference_cv.results):
+        np.testing.assert_allclose(
+            result.predicted.values, reference_result.predicted.values, rtol=1e-5
+        )
+
+
+def test_model_cross_validate_analytic_loo_invalid():
+    inputs = Inputs(
+        features=[
+            ContinuousInput(
+                key=f"x_{i+1}",
+                bounds=(-4, 4),
+            )
+            for i in range(2)
+        ]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=10)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments["valid_y"] = 1
+    model = surrogates.map(SingleTaskGPSurrogate(inputs=inputs, outputs=outputs))
+    with pytest.raises(ValueError, match="Unknown cross validation method"):
+        model.cross_validate(experiments, method="magic")
+    with pytest.raises(ValueError, match="only available for LOO"):
+        model.cross_validate(experiments, folds=5, method="analytic_loo")
+    with pytest.raises(ValueError, match="Hooks are not supported"):
+        model.cross_validate(
+            experiments,
+            method="analytic_loo",
+            hooks={"hook": lambda model, X_train, y_train, X_test, y_test: None},
+        )
+    model = surrogates.map(RandomForestSurrogate(inputs=inputs, outputs=outputs))
+    with pytest.raises(NotImplementedError):
+        model.cross_validate(experiments, method="analytic_loo")
+
+
 @pytest.mark.parametrize("folds", [-2, 0, 1])
 def test_model_cross_validate_invalid(folds):
     inputs = Inputs(
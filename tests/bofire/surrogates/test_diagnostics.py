@@ -21,6 +21,7 @@ from bofire.surrogates.diagnostics import (
     _pearson,
     _r2_score,
     _spearman,
+    batched_metrics,
     metrics,
 )
 
@@ -101,8 +102,21 @@ def test_scipy_metrics(bofire, scipy):
     predicted = observed + np.random.normal(0, 1, size=n_samples)
     sd = np.random.normal(0, 1, size=n_samples)
     s, _ = scipy(predicted, observed)
-    assert bofire(observed, predicted, sd) == s
-    assert bofire(observed, predicted) == s
+    # the batched implementation may differ from scipy in the last bit
+    assert bofire(observed, predicted, sd) == pytest.approx(s, rel=1e-12)
+    assert bofire(observed, predicted) == pytest.approx(s, rel=1e-12)
+
+
+def test_batched_metrics():
+    rng = np.random.default_rng(42)
+    observed = rng.normal(size=20)
+    predicted = observed + rng.normal(scale=0.5, size=(4, 20))
+    for metricenum, metric in metrics.items():
+        scores = batched_metrics[metricenum](observed, predicted)
+        assert scores.shape == (4,)
+        np.testing.assert_allclose(
+            scores, [metric(observed, pred) for pred in predicted]
+        )
 
 
 def test_cvresult_not_numeric():
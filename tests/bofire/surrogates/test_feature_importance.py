@@ -1,8 +1,10 @@
+import numpy as np
 import pandas as pd
 import pytest
 
 import bofire.surrogates.api as surrogates
 from bofire.data_models.domain.api import Inputs, Outputs
+from bofire.data_models.enum import RegressionMetricsEnum
 from bofire.data_models.features.api import ContinuousInput, ContinuousOutput
 from bofire.data_models.surrogates.api import SingleTaskGPSurrogate
 from bofire.surrogates.diagnostics import metrics
@@ -61,6 +63,45 @@ def test_permutation_importance():
         assert list(results[m.name].index) == ["mean", "std"]
 
 
+def test_permutation_importance_chunk_size():
+    model, experiments = get_model_and_data()
+    X = experiments[model.inputs.get_keys()]
+    y = experiments[["y"]]
+    model.fit(experiments=experiments)
+    results = permutation_importance(model=model, X=X, y=y, n_repeats=2, seed=1)
+    chunked = permutation_importance(
+        model=model, X=X, y=y, n_repeats=2, seed=1, chunk_size=7
+    )
+    for m in metrics.keys():
+        pd.testing.assert_frame_equal(results[m.name], chunked[m.name])
+
+
+def test_permutation_importance_matches_featurewise_predictions():
+    model, experiments = get_model_and_data()
+    X = experiments[model.inputs.get_keys()]
+    y = experiments[["y"]]
+    model.fit(experiments=experiments)
+    results = permutation_importance(model=model, X=X, y=y, n_repeats=2, seed=1)
+    # recompute the importances with one prediction per permutation
+    rng = np.random.default_rng(1)
+    original = metrics[RegressionMetricsEnum.MAE](
+        y["y"].values, model.predict(X)["y_pred"].values
+    )
+    for feature in model.inputs:
+        scores = []
+        for _ in range(2):
+            X_i = X.copy()
+            X_i[feature.key] = rng.permutation(X_i[feature.key].values)
+            scores.append(
+                metrics[RegressionMetricsEnum.MAE](
+                    y["y"].values, model.predict(X_i)["y_pred"].values
+                )
+            )
+        assert np.isclose(
+            results["MAE"].loc["mean", feature.key], np.mean(scores) - original
+        )
+
+
 @pytest.mark.parametrize("use_test", [True, False])
 def test_permutation_importance_hook(use_test):
     model, experiments = get_model_and_data()
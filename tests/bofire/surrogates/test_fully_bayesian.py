@@ -1,7 +1,10 @@
+import numpy as np
 import pytest
+import torch
 from pandas.testing import assert_frame_equal
 
 import bofire.surrogates.api as surrogates
+import bofire.surrogates.fully_bayesian as fully_bayesian
 from bofire.benchmarks.single import Himmelblau
 from bofire.data_models.surrogates.api import SaasSingleTaskGPSurrogate
 
@@ -38,3 +41,190 @@ def test_SaasSingleTaskGPSurrogate():
     assert preds.shape == (10, 2)
     preds2 = gp.predict(experiments)
     assert_frame_equal(preds, preds2)
+
+
+def test_SaasSingleTaskGPSurrogate_predict_posterior():
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(10), return_complete=True)
+    gp = surrogates.map(
+        SaasSingleTaskGPSurrogate(
+            inputs=bench.domain.inputs,
+            outputs=bench.domain.outputs,
+            warmup_steps=32,
+            num_samples=16,
+            thinning=4,
+        )
+    )
+    gp.fit(experiments=experiments)
+    X = bench.domain.inputs.sample(5)
+    preds = gp.predict(X)
+    stats = gp.predict_posterior(X, covariance=True, quantiles=[0.5], n_samples=3)
+    assert np.allclose(stats["mean"][:, 0], preds.y_pred)
+    assert np.allclose(stats["std"][:, 0], preds.y_sd)
+    # the covariance of the mixture is consistent with its variance
+    assert np.allclose(np.diagonal(stats["covariance"][0]), stats["std"][:, 0] ** 2)
+    assert stats["quantiles"].shape == (1, 5, 1)
+    assert stats["samples"].shape == (3, 5, 1)
+
+
+@pytest.mark.parametrize("n_chains", [1, 2])
+def test_SaasSingleTaskGPSurrogate_warm_start(n_chains):
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(12), return_complete=True)
+    gp = surrogates.map(
+        SaasSingleTaskGPSurrogate(
+            inputs=bench.domain.inputs,
+            outputs=bench.domain.outputs,
+            warmup_steps=32,
+            num_samples=16,
+            thinning=4,
+            warm_start=True,
+            warm_start_max_new_rows=2,
+            warm_start_warmup_steps=4,
+            n_chains=n_chains,
+        )
+    )
+    gp.fit(experiments=experiments.iloc[:10])
+    assert gp.fit_method == "nuts"
+    assert not gp.warm_started
+    assert len(gp._nuts_adaptations) == n_chains
+    assert gp.model.num_mcmc_samples == 4
+    assert gp.fit_time > 0
+    assert gp.ess_per_second == pytest.approx(gp.ess / gp.fit_time)
+    gp.fit(experiments=experiments)
+    assert gp.warm_started
+    assert gp.model.num_mcmc_samples == 4
+    assert gp.predict(experiments).shape == (12, 2)
+    # too many new experiments
+    gp.fit(experiments=bench.f(bench.domain.inputs.sample(15), return_complete=True))
+    assert not gp.warm_started
+
+
+def test_SaasSingleTaskGPSurrogate_warm_start_adaptation(monkeypatch):
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(12), return_complete=True)
+    gp = surrogates.map(
+        SaasSingleTaskGPSurrogate(
+            inputs=bench.domain.inputs,
+            outputs=bench.domain.outputs,
+            warmup_steps=32,
+            num_samples=16,
+            thinning=4,
+            warm_start=True,
+            warm_start_max_new_rows=2,
+            warm_start_warmup_steps=4,
+        )
+    )
+    gp.fit(experiments=experiments.iloc[:10])
+    previous = gp._nuts_adaptations[0]
+    # record the inverse mass matrix and step size from which the warmup starts
+    initial = {}
+    init = fully_bayesian._WarmStartedNUTS.__init__
+    setup = fully_bayesian._WarmStartedNUTS.setup
+
+    def init_spy(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        initial["init_step_size"] = kwargs["step_size"]
+
+    def setup_spy(self, *args, **kwargs):
+        setup(self, *args, **kwargs)
+        initial["inverse_mass_matrix"] = self.inverse_mass_matrix
+
+    monkeypatch.setattr(fully_bayesian._WarmStartedNUTS, "__init__", init_spy)
+    monkeypatch.setattr(fully_bayesian._WarmStartedNUTS, "setup", setup_spy)
+    gp.fit(experiments=experiments)
+    assert gp.warm_started
+    assert initial["init_step_size"] == previous["step_size"]
+    for sites, value in previous["inverse_mass_matrix"].items():
+        assert torch.allclose(initial["inverse_mass_matrix"][sites], value)
+    # the mass matrix is not adapted again
+    assert torch.allclose(gp._nuts_adaptations[0]["inverse_mass_matrix"][sites], value)
+
+
+def test_SaasSingleTaskGPSurrogate_warm_start_adaptation_unsupported(monkeypatch):
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(12), return_complete=True)
+    gp = surrogates.map(
+        SaasSingleTaskGPSurrogate(
+            inputs=bench.domain.inputs,
+            outputs=bench.domain.outputs,
+            warmup_steps=32,
+            num_samples=16,
+            thinning=4,
+            warm_start=True,
+            warm_start_max_new_rows=2,
+            warm_start_warmup_steps=4,
+        )
+    )
+    gp.fit(experiments=experiments.iloc[:10])
+    # pyro versions without the public mass matrix adapter fall back to a cold
+    # started adaptation
+    monkeypatch.setattr(
+        fully_bayesian._WarmStartedNUTS, "is_supported", staticmethod(lambda: False)
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError("warm started kernel is not supported")
+
+    monkeypatch.setattr(fully_bayesian._WarmStartedNUTS, "setup", fail)
+    gp.fit(experiments=experiments)
+    assert gp.warm_started
+    assert gp.fit_method == "nuts"
+
+
+def test_SaasSingleTaskGPSurrogate_latency_budget():
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(10), return_complete=True)
+    gp = surrogates.map(
+        SaasSingleTaskGPSurrogate(
+            inputs=bench.domain.inputs,
+            outputs=bench.domain.outputs,
+            warmup_steps=10000,
+            num_samples=16,
+            thinning=4,
+            latency_budget=0.01,
+        )
+    )
+    gp.fit(experiments=experiments)
+    assert gp.fit_method == "map"
+    assert gp.model.num_mcmc_samples == 1
+    assert np.isnan(gp.ess)
+    preds = gp.predict(experiments)
+    assert preds.shape == (10, 2)
+    assert np.all(np.isfinite(preds.values))
+
+
+def test_SaasSingleTaskGPSurrogate_cached_prediction():
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(10), return_complete=True)
+    gp = surrogates.map(
+        SaasSingleTaskGPSurrogate(
+            inputs=bench.domain.inputs,
+            outputs=bench.domain.outputs,
+            warmup_steps=32,
+            num_samples=16,
+            thinning=4,
+        )
+    )
+    gp.fit(experiments=experiments)
+    X = bench.domain.inputs.sample(25)
+    preds = gp.predict(X)
+    gp.cached_prediction = True
+    gp.prediction_batch_size = 7
+    assert_frame_equal(gp.predict(X), preds)
+    cache = gp._prediction_cache
+    assert cache["L"].shape == (4, 10, 10)
+    stats = gp.predict_posterior(X, quantiles=[0.5])
+    assert gp._prediction_cache is cache
+    assert np.allclose(stats["quantiles"][0, :, 0], preds.y_pred)
+    # a new fit invalidates the cache
+    gp.fit(experiments=experiments)
+    gp.predict(X)
+    assert gp._prediction_cache is not cache
+    # subsampling of the draws
+    cache = gp._prediction_cache
+    gp.max_prediction_draws = 2
+    preds = gp.predict(X)
+    assert gp._prediction_cache is not cache
+    assert gp._prediction_cache["L"].shape == (2, 10, 10)
+    assert np.all(np.isfinite(preds.values))
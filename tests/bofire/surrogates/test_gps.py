@@ -1,3 +1,5 @@
+import botorch
+import pandas as pd
 import pytest
 import torch
 from botorch.models import MixedSingleTaskGP, SingleTaskGP
@@ -12,6 +14,8 @@ from pandas.testing import assert_frame_equal
 from pydantic import ValidationError
 
 import bofire.surrogates.api as surrogates
+import bofire.surrogates.single_task_gp as single_task_gp
+import bofire.surrogates.trainable as trainable
 from bofire.data_models.domain.api import Inputs, Outputs
 from bofire.data_models.enum import CategoricalEncodingEnum
 from bofire.data_models.features.api import (
@@ -27,6 +31,7 @@ from bofire.data_models.surrogates.api import (
     SingleTaskGPSurrogate,
 )
 from bofire.surrogates.single_task_gp import get_scaler
+from bofire.utils.memmap import MemmapExperiments
 from bofire.utils.torch_tools import tkwargs
 
 
@@ -314,3 +319,169 @@ def test_MixedGPModel(kernel, scaler):
     model2.loads(dump)
     preds2 = model2.predict(samples)
     assert_frame_equal(preds, preds2)
+
+
+def test_SingleTaskGPModel_refit_interval():
+    inputs = Inputs(
+        features=[
+            ContinuousInput(
+                key=f"x_{i+1}",
+                bounds=(-4, 4),
+            )
+            for i in range(2)
+        ]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=20)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments["valid_y"] = 1
+    model = SingleTaskGPSurrogate(inputs=inputs, outputs=outputs, refit_interval=3)
+    model = surrogates.map(model)
+    model.fit(experiments.iloc[:10])
+    lengthscale = model.model.covar_module.base_kernel.lengthscale.detach().clone()
+    # appended experiments are used to condition the model with frozen hyperparameters
+    model.fit(experiments.iloc[:15])
+    assert model._n_updates == 1
+    assert model.model.train_inputs[0].shape == (15, 2)
+    assert torch.allclose(model.model.covar_module.base_kernel.lengthscale, lengthscale)
+    preds = model.predict(experiments.iloc[10:15])
+    assert preds.shape == (5, 2)
+    # the conditioned model has to match a model with the same hyperparameters
+    reference = botorch.models.SingleTaskGP(
+        train_X=model._train_X,
+        train_Y=model._train_Y,
+        covar_module=model.model.covar_module,
+        likelihood=model.model.likelihood,
+        mean_module=model.model.mean_module,
+        outcome_transform=model.model.outcome_transform,
+        input_transform=model.model.input_transform,
+    )
+    reference.eval()
+    X = torch.from_numpy(experiments[inputs.get_keys()].values).to(**tkwargs)
+    assert torch.allclose(
+        reference.posterior(X).mean, model.model.posterior(X).mean, atol=1e-6
+    )
+    # the full refit is done according to the refit interval
+    model.fit(experiments.iloc[:17])
+    assert model._n_updates == 2
+    model.fit(experiments.iloc[:20])
+    assert model._n_updates == 0
+    assert model.model.train_inputs[0].shape == (20, 2)
+    # data which does not extend the previous data triggers a full refit
+    model.fit(experiments.iloc[:18])
+    model.fit(experiments.iloc[5:])
+    assert model._n_updates == 0
+
+
+@pytest.mark.parametrize("warm_start", [True, False])
+def test_SingleTaskGPModel_warm_start(monkeypatch, warm_start):
+    inputs = Inputs(
+        features=[
+            ContinuousInput(
+                key=f"x_{i+1}",
+                bounds=(-4, 4),
+            )
+            for i in range(2)
+        ]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=15)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments["valid_y"] = 1
+    model = SingleTaskGPSurrogate(inputs=inputs, outputs=outputs, warm_start=warm_start)
+    model = surrogates.map(model)
+    model.fit(experiments.iloc[:10])
+    previous_model = model.model
+    # record the hyperparameters from which the optimizer starts
+    initial = {}
+    fit_gpytorch_mll = single_task_gp.fit_gpytorch_mll
+
+    def spy(mll, **kwargs):
+        initial[
+            "raw_lengthscale"
+        ] = mll.model.covar_module.base_kernel.raw_lengthscale.detach().clone()
+        initial[
+            "raw_noise"
+        ] = mll.model.likelihood.noise_covar.raw_noise.detach().clone()
+        return fit_gpytorch_mll(mll, **kwargs)
+
+    monkeypatch.setattr(single_task_gp, "fit_gpytorch_mll", spy)
+    model.fit(experiments)
+    assert model.model is not previous_model
+    assert model._n_updates == 0
+    assert model.model.train_inputs[0].shape == (15, 2)
+    assert (
+        torch.allclose(
+            initial["raw_lengthscale"],
+            previous_model.covar_module.base_kernel.raw_lengthscale,
+        )
+        is warm_start
+    )
+    assert (
+        torch.allclose(
+            initial["raw_noise"], previous_model.likelihood.noise_covar.raw_noise
+        )
+        is warm_start
+    )
+
+
+def test_SingleTaskGPModel_predict_chunks():
+    inputs = Inputs(
+        features=[
+            ContinuousInput(
+                key=f"x_{i+1}",
+                bounds=(-4, 4),
+            )
+            for i in range(2)
+        ]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=10)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments["valid_y"] = 1
+    model = surrogates.map(SingleTaskGPSurrogate(inputs=inputs, outputs=outputs))
+    samples = inputs.sample(25)
+    with pytest.raises(ValueError):
+        model.predict_batches(samples, chunk_size=10)
+    model.fit(experiments)
+    preds = model.predict(samples)
+    assert_frame_equal(preds, model.predict(samples, chunk_size=10))
+    batches = list(model.predict_batches(samples, chunk_size=10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert_frame_equal(preds, pd.concat(batches))
+    # iterables of dataframes are accepted
+    batches = list(model.predict_batches(iter([samples[:5], samples[5:]])))
+    assert [len(batch) for batch in batches] == [5, 20]
+    assert_frame_equal(preds, pd.concat(batches))
+
+
+def test_SingleTaskGPModel_fit_memmap(tmp_path, monkeypatch):
+    inputs = Inputs(
+        features=[
+            ContinuousInput(
+                key=f"x_{i+1}",
+                bounds=(-4, 4),
+            )
+            for i in range(2)
+        ]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=20)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments["valid_y"] = 1
+    experiments.loc[[3, 11], "valid_y"] = 0
+    experiments.loc[17, "y"] = None
+    experiments["comment"] = "not needed for the fit"
+    stored = MemmapExperiments.write(experiments, tmp_path)
+    # the experiments are streamed in several chunks
+    monkeypatch.setattr(trainable, "FIT_CHUNK_SIZE", 6)
+    model = surrogates.map(SingleTaskGPSurrogate(inputs=inputs, outputs=outputs))
+    model.fit(stored)
+    assert model.model.train_inputs[0].shape == (17, 2)
+    expected = surrogates.map(SingleTaskGPSurrogate(inputs=inputs, outputs=outputs))
+    expected.fit(experiments)
+    assert torch.allclose(
+        model.model.train_inputs[0], expected.model.train_inputs[0], atol=1e-6
+    )
+    samples = inputs.sample(5)
+    assert_frame_equal(model.predict(samples), expected.predict(samples), atol=1e-4)
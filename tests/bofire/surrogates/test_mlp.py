@@ -1,6 +1,10 @@
+import io
+
+import numpy as np
 import pytest
 import torch
 import torch.nn as nn
+from botorch.models.ensemble import EnsembleModel
 from botorch.models.transforms.input import InputStandardize, Normalize
 from pandas.testing import assert_frame_equal
 
@@ -13,7 +17,14 @@ from bofire.data_models.features.api import (
     ContinuousOutput,
 )
 from bofire.data_models.surrogates.api import MLPEnsemble, ScalerEnum
-from bofire.surrogates.mlp import MLP, RegressionDataSet, _MLPEnsemble, fit_mlp
+from bofire.surrogates.mlp import (
+    MLP,
+    RegressionDataSet,
+    StackedMLP,
+    _MLPEnsemble,
+    fit_mlp,
+    fit_stacked_mlp,
+)
 from bofire.utils.torch_tools import tkwargs
 
 
@@ -114,7 +125,7 @@ def test_fit_mlp(mlp, weight_decay, n_epoches, lr, shuffle):
         experiments[["y"]].values
     )
     dset = RegressionDataSet(X=X, y=y)
-    fit_mlp(
+    losses = fit_mlp(
         mlp=mlp,
         dataset=dset,
         weight_decay=weight_decay,
@@ -122,6 +133,98 @@ def test_fit_mlp(mlp, weight_decay, n_epoches, lr, shuffle):
         lr=lr,
         shuffle=shuffle,
     )
+    assert len(losses) == n_epoches
+
+
+def test_stacked_mlp_activation_invalid():
+    with pytest.raises(ValueError):
+        StackedMLP(n_estimators=2, input_size=2, activation="mama")
+
+
+@pytest.mark.parametrize("dropout", [0.0, 0.2])
+def test_stacked_mlp(dropout):
+    mlp = StackedMLP(
+        n_estimators=3,
+        input_size=2,
+        output_size=2,
+        hidden_layer_sizes=(8, 4),
+        dropout=dropout,
+    )
+    assert len(mlp.layers) == (5 if dropout == 0.0 else 7)
+    assert mlp.layers[0].weight.shape == torch.Size((3, 2, 8))
+    assert mlp.layers[0].bias.shape == torch.Size((3, 1, 8))
+    assert mlp.layers[-1].weight.shape == torch.Size((3, 4, 2))
+    # same data for all members and individual data per member
+    assert mlp(torch.rand(1, 5, 2).to(**tkwargs)).shape == torch.Size((3, 5, 2))
+    assert mlp(torch.rand(3, 5, 2).to(**tkwargs)).shape == torch.Size((3, 5, 2))
+
+
+def test_fit_stacked_mlp():
+    benchmark = Himmelblau()
+    experiments = benchmark.f(benchmark.domain.inputs.sample(10), return_complete=True)
+    X = torch.from_numpy(experiments[["x_1", "x_2"]].values).to(**tkwargs)
+    y = torch.from_numpy(experiments[["y"]].values).to(**tkwargs)
+    mlps = [
+        MLP(input_size=2, output_size=1, hidden_layer_sizes=(8, 4)) for _ in range(3)
+    ]
+    stacked = StackedMLP.from_mlps(mlps)
+    idx = torch.randint(10, (3, 10))
+    fit_stacked_mlp(
+        mlp=stacked, X=X[idx], y=y[idx], batch_size=4, n_epoches=5, shuffle=False
+    )
+    # training the members together is the same as training them one by one
+    for i, mlp in enumerate(mlps):
+        fit_mlp(
+            mlp=mlp,
+            dataset=RegressionDataSet(X=X[idx[i]], y=y[idx[i]]),
+            batch_size=4,
+            n_epoches=5,
+            shuffle=False,
+        )
+    mlp = StackedMLP.from_mlps(mlps)
+    for param, expected in zip(stacked.parameters(), mlp.parameters()):
+        assert torch.allclose(param, expected)
+
+
+@pytest.mark.parametrize("lr_schedule", ["constant", "cosine"])
+def test_fit_stacked_mlp_early_stopping(lr_schedule):
+    benchmark = Himmelblau()
+    experiments = benchmark.f(benchmark.domain.inputs.sample(20), return_complete=True)
+    X = torch.from_numpy(experiments[["x_1", "x_2"]].values).to(**tkwargs)
+    y = torch.from_numpy(experiments[["y"]].values).to(**tkwargs)
+    mlp = StackedMLP(n_estimators=3, input_size=2, hidden_layer_sizes=(8,))
+    val_mask = torch.ones(3, 20, dtype=torch.bool)
+    val_mask[0, :10] = False
+    # the last member has no validation data and is stopped by its training loss
+    val_mask[2] = False
+    train_losses, val_losses, n_epochs = fit_stacked_mlp(
+        mlp=mlp,
+        X=X[:10].expand(3, -1, -1),
+        y=y[:10].expand(3, -1, -1),
+        batch_size=20,
+        n_epoches=500,
+        lr=0.1,
+        X_val=X.unsqueeze(0),
+        y_val=y.unsqueeze(0),
+        val_mask=val_mask,
+        patience=5,
+        lr_schedule=lr_schedule,
+    )
+    assert n_epochs.shape == torch.Size((3,))
+    assert train_losses.shape == val_losses.shape
+    assert train_losses.shape == torch.Size((3, int(n_epochs.max())))
+    for i in range(3):
+        assert not torch.isnan(train_losses[i, : n_epochs[i]]).any()
+        assert torch.isnan(train_losses[i, n_epochs[i] :]).all()
+    assert torch.isnan(val_losses[2]).all()
+    # the parameters of the best epoch are restored
+    mlp.eval()
+    with torch.no_grad():
+        errors = (mlp(X.unsqueeze(0)) - y).abs().squeeze(-1)
+    for i in range(2):
+        assert torch.allclose(
+            errors[i][val_mask[i]].mean(), val_losses[i, : n_epochs[i]].min()
+        )
 
 
 def test_mlp_ensemble_no_mls():
@@ -160,6 +263,32 @@ def test_mlp_ensemble_forward():
     batch = torch.from_numpy(experiments[["x_1", "x_2"]].values).unsqueeze(0)
     pred = ens.forward(batch)
     assert pred.shape == torch.Size((1, 2, 10, 1))
+    # the stacked forward pass matches the individual mlps
+    X = torch.from_numpy(experiments[["x_1", "x_2"]].values).reshape((2, 5, 2))
+    expected = torch.stack([mlp1(X), mlp2(X)], dim=-3)
+    assert torch.allclose(ens.forward(X), expected)
+    ens2 = _MLPEnsemble(mlps=ens.mlps)
+    assert ens2.mlps is ens.mlps
+
+
+def test_mlp_ensemble_load_unstacked():
+    mlps = [MLP(input_size=2, output_size=1) for _ in range(2)]
+    for mlp in mlps:
+        mlp.eval()
+    # ensembles dumped before the members were stacked held a list of MLPs
+    ens = _MLPEnsemble.__new__(_MLPEnsemble)
+    EnsembleModel.__init__(ens)
+    ens.__dict__["mlps"] = mlps
+    buffer = io.BytesIO()
+    torch.save(ens, buffer)
+    buffer.seek(0)
+    loaded = torch.load(buffer)
+    assert isinstance(loaded.mlps, StackedMLP)
+    assert not loaded.mlps.training
+    X = torch.rand(5, 2).to(**tkwargs)
+    assert torch.allclose(
+        loaded.forward(X), torch.stack([mlp(X) for mlp in mlps], dim=-3)
+    )
 
 
 @pytest.mark.parametrize(
@@ -194,6 +323,44 @@ def test_mlp_ensemble_fit(scaler):
     assert_frame_equal(preds, preds2)
 
 
+@pytest.mark.parametrize(
+    "early_stopping_patience, validation_fraction, full_batch",
+    [(None, 0.0, False), (None, 0.2, True), (5, 0.0, True), (5, 0.2, False)],
+)
+def test_mlp_ensemble_fit_history(
+    early_stopping_patience, validation_fraction, full_batch
+):
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(20), return_complete=True)
+    surrogate = surrogates.map(
+        MLPEnsemble(
+            inputs=bench.domain.inputs,
+            outputs=bench.domain.outputs,
+            n_estimators=3,
+            n_epochs=50,
+            lr=1e-2,
+            early_stopping_patience=early_stopping_patience,
+            validation_fraction=validation_fraction,
+            full_batch=full_batch,
+            lr_schedule="cosine",
+        )
+    )
+    assert surrogate.n_epochs_used is None
+    surrogate.fit(experiments=experiments)
+    assert len(surrogate.n_epochs_used) == 3
+    for n_epochs, train_losses, validation_losses in zip(
+        surrogate.n_epochs_used, surrogate.train_losses, surrogate.validation_losses
+    ):
+        if early_stopping_patience is None:
+            assert n_epochs == 50
+        assert train_losses.shape == validation_losses.shape == (n_epochs,)
+        assert not np.isnan(train_losses).any()
+        if validation_fraction == 0.0 and early_stopping_patience is None:
+            assert np.isnan(validation_losses).all()
+        else:
+            assert not np.isnan(validation_losses).any()
+
+
 @pytest.mark.parametrize(
     "scaler", [ScalerEnum.NORMALIZE, ScalerEnum.STANDARDIZE, ScalerEnum.IDENTITY]
 )
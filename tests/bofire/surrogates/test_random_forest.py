@@ -55,6 +55,29 @@ def test_random_forest_forward():
     assert rf.num_outputs == 1
 
 
+@pytest.mark.parametrize("batch_shape", [(), (3,), (2, 3)])
+def test_random_forest_forward_compiled(batch_shape):
+    bench = Himmelblau()
+    experiments = bench.f(bench.domain.inputs.sample(30), return_complete=True)
+    rfr = RandomForestRegressor(n_estimators=20, max_depth=5, random_state=42).fit(
+        experiments[["x_1", "x_2"]].values, experiments.y.values.ravel()
+    )
+    rf = _RandomForest(rf=rfr)
+    X = torch.from_numpy(
+        bench.domain.inputs.sample(int(np.prod(batch_shape)) * 4)[["x_1", "x_2"]].values
+    )
+    pred = rf.forward(X.reshape((*batch_shape, 4, 2)))
+    assert pred.shape == torch.Size((*batch_shape, 20, 4, 1))
+    expected = np.stack(
+        [estimator.predict(X.numpy()) for estimator in rfr.estimators_], axis=0
+    )
+    expected = np.moveaxis(expected.reshape((20, -1, 4)), 0, 1)
+    assert np.allclose(
+        pred.numpy().reshape((-1, 20, 4)),
+        expected,
+    )
+
+
 def test_random_forest():
     # test only continuous
     bench = Himmelblau()
@@ -951,3 +951,101 @@ def test_empirical_model_io():
     surrogate3 = surrogates.map(data_model)
     preds3 = surrogate3.predict(samples)
     assert_frame_equal(preds, preds3)
+
+
+@pytest.mark.parametrize(
+    "surrogate_data",
+    [
+        data_models.SingleTaskGPSurrogate,
+        data_models.RandomForestSurrogate,
+        data_models.MLPEnsemble,
+    ],
+)
+def test_botorch_surrogate_predict_posterior(surrogate_data):
+    inputs = Inputs(
+        features=[ContinuousInput(key=f"x_{i+1}", bounds=(-4, 4)) for i in range(2)]
+        + [CategoricalInput(key="x_cat", categories=["mama", "papa"])]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=10)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments["valid_y"] = 1
+    kwargs = (
+        {"n_estimators": 5, "n_epochs": 5}
+        if surrogate_data is data_models.MLPEnsemble
+        else {}
+    )
+    surrogate = surrogates.map(surrogate_data(inputs=inputs, outputs=outputs, **kwargs))
+    with pytest.raises(ValueError, match="Model is not fitted"):
+        surrogate.predict_posterior(experiments)
+    surrogate.fit(experiments)
+    X = inputs.sample(n=4)
+    preds = surrogate.predict(X)
+    stats = surrogate.predict_posterior(
+        X, covariance=True, quantiles=[0.05, 0.5, 0.95], n_samples=6
+    )
+    assert np.allclose(stats["mean"][:, 0], preds.y_pred)
+    assert np.allclose(stats["std"][:, 0], preds.y_sd)
+    assert stats["covariance"].shape == (1, 4, 4)
+    assert np.allclose(np.diagonal(stats["covariance"][0]), stats["std"][:, 0] ** 2)
+    assert stats["quantiles"].shape == (3, 4, 1)
+    assert np.all(stats["quantiles"][0] <= stats["quantiles"][1])
+    assert np.all(stats["quantiles"][1] <= stats["quantiles"][2])
+    assert stats["samples"].shape == (6, 4, 1)
+    # the tensor api works on the transformed inputs
+    transformed = torch.from_numpy(
+        inputs.transform(X, surrogate.input_preprocessing_specs).values
+    ).to(**tkwargs)
+    tensor_preds = surrogate.predict_tensor(transformed)
+    assert set(tensor_preds.keys()) == {"mean", "std"}
+    assert torch.allclose(tensor_preds["mean"], torch.from_numpy(stats["mean"]))
+
+
+def test_botorch_surrogates_fit_parallel():
+    inputs = Inputs(
+        features=[ContinuousInput(key=f"x_{i+1}", bounds=(-4, 4)) for i in range(3)]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key=f"y_{i+1}") for i in range(3)])
+    experiments = inputs.sample(n=12)
+    experiments.eval("y_1=x_1**2 + x_2", inplace=True)
+    experiments.eval("y_2=x_2 - x_3", inplace=True)
+    experiments.eval("y_3=x_1 * x_3", inplace=True)
+    for i in range(3):
+        experiments[f"valid_y_{i+1}"] = 1
+    compatibilized = []
+    for n_jobs in [1, 2]:
+        surrogate_specs = BotorchSurrogates(
+            data_model=data_models.BotorchSurrogates(
+                surrogates=[
+                    data_models.SingleTaskGPSurrogate(
+                        inputs=inputs,
+                        outputs=Outputs(features=[outputs.get_by_key("y_1")]),
+                        refit_interval=2,
+                    ),
+                    data_models.SingleTaskGPSurrogate(
+                        inputs=Inputs(features=inputs.get()[:2]),
+                        outputs=Outputs(features=[outputs.get_by_key("y_2")]),
+                    ),
+                    data_models.RandomForestSurrogate(
+                        inputs=inputs,
+                        outputs=Outputs(features=[outputs.get_by_key("y_3")]),
+                        random_state=42,
+                    ),
+                ],
+                n_jobs=n_jobs,
+            )
+        )
+        assert surrogate_specs.n_jobs == n_jobs
+        surrogate_specs.fit(experiments.iloc[:10])
+        surrogate_specs.fit(experiments)
+        # the state of the incremental fit is shipped back from the workers
+        assert surrogate_specs.surrogates[0]._n_updates == 1
+        assert all(surrogate.is_fitted for surrogate in surrogate_specs.surrogates)
+        compatibilized.append(
+            surrogate_specs.compatibilize(inputs=inputs, outputs=outputs)
+        )
+    X = torch.from_numpy(inputs.sample(5).values).to(**tkwargs)
+    with torch.no_grad():
+        assert torch.allclose(
+            compatibilized[0].posterior(X).mean, compatibilized[1].posterior(X).mean
+        )
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+import torch
+from botorch.models.approximate_gp import SingleTaskVariationalGP
+from botorch.models.transforms.input import InputStandardize, Normalize
+from pandas.testing import assert_frame_equal
+
+import bofire.strategies.api as strategies
+import bofire.surrogates.api as surrogates
+from bofire.benchmarks.multi import DTLZ2
+from bofire.data_models.domain.api import Inputs, Outputs
+from bofire.data_models.enum import CategoricalEncodingEnum
+from bofire.data_models.features.api import (
+    CategoricalInput,
+    ContinuousInput,
+    ContinuousOutput,
+)
+from bofire.data_models.strategies.api import QnehviStrategy
+from bofire.data_models.surrogates.api import (
+    BotorchSurrogates,
+    ScalerEnum,
+    SingleTaskGPSurrogate,
+    SingleTaskVariationalGPSurrogate,
+)
+
+
+@pytest.mark.parametrize(
+    "scaler, n_inducing_points",
+    [(ScalerEnum.NORMALIZE, 5), (ScalerEnum.STANDARDIZE, 50)],
+)
+def test_SingleTaskVariationalGPSurrogate(scaler, n_inducing_points):
+    inputs = Inputs(
+        features=[ContinuousInput(key=f"x_{i+1}", bounds=(-4, 4)) for i in range(2)]
+        + [CategoricalInput(key="x_cat", categories=["mama", "papa"])]
+    )
+    outputs = Outputs(features=[ContinuousOutput(key="y")])
+    experiments = inputs.sample(n=20)
+    experiments.eval("y=((x_1**2 + x_2 - 11)**2+(x_1 + x_2**2 -7)**2)", inplace=True)
+    experiments.loc[experiments.x_cat == "mama", "y"] *= 5.0
+    experiments["valid_y"] = 1
+    data_model = SingleTaskVariationalGPSurrogate(
+        inputs=inputs,
+        outputs=outputs,
+        scaler=scaler,
+        n_inducing_points=n_inducing_points,
+        batch_size=8,
+        n_epochs=5,
+        input_preprocessing_specs={"x_cat": CategoricalEncodingEnum.ONE_HOT},
+    )
+    surrogate = surrogates.map(data_model)
+    assert isinstance(surrogate, surrogates.SingleTaskVariationalGPSurrogate)
+    surrogate.fit(experiments)
+    assert isinstance(surrogate.model, SingleTaskVariationalGP)
+    assert isinstance(
+        surrogate.model.input_transform,
+        Normalize if scaler == ScalerEnum.NORMALIZE else InputStandardize,
+    )
+    assert torch.equal(surrogate.model.input_transform.indices, torch.tensor([0, 1]))
+    # there are never more inducing points than experiments
+    inducing_points = surrogate.model.model.variational_strategy.inducing_points
+    assert inducing_points.shape == (min(n_inducing_points, 20), 4)
+    preds = surrogate.predict(experiments)
+    assert preds.shape == (20, 2)
+    assert np.all(preds.y_sd > 0)
+    dump = surrogate.dumps()
+    surrogate2 = surrogates.map(data_model)
+    surrogate2.loads(dump)
+    assert_frame_equal(preds, surrogate2.predict(experiments))
+
+
+def test_SingleTaskVariationalGPSurrogate_in_strategy():
+    benchmark = DTLZ2(dim=3)
+    experiments = benchmark.f(benchmark.domain.inputs.sample(10), return_complete=True)
+    strategy = strategies.map(
+        QnehviStrategy(
+            domain=benchmark.domain,
+            surrogate_specs=BotorchSurrogates(
+                surrogates=[
+                    SingleTaskVariationalGPSurrogate(
+                        inputs=benchmark.domain.inputs,
+                        outputs=Outputs(features=[benchmark.domain.outputs[0]]),
+                        n_epochs=5,
+                    ),
+                    SingleTaskGPSurrogate(
+                        inputs=benchmark.domain.inputs,
+                        outputs=Outputs(features=[benchmark.domain.outputs[1]]),
+                    ),
+                ]
+            ),
+            num_restarts=1,
+            num_raw_samples=16,
+        )
+    )
+    strategy.tell(experiments)
+    candidates = strategy.ask(candidate_count=1)
+    assert len(candidates) == 1
@@ -68,3 +68,49 @@ def test_XGBoostSurrogate_categorical():
     }
     surrogate = surrogates.map(data_model)
     surrogate.fit(experiments)
+
+
+@pytest.mark.skipif(not XGB_AVAILABLE, reason="requires xgboost")
+def test_XGBoostSurrogate_incremental_fit():
+    benchmark = Himmelblau()
+    experiments = benchmark.f(benchmark.domain.inputs.sample(20), return_complete=True)
+    data_model = XGBoostSurrogate(
+        inputs=benchmark.domain.inputs,
+        outputs=benchmark.domain.outputs,
+        n_estimators=5,
+        refit_interval=3,
+        update_n_estimators=2,
+    )
+    surrogate = surrogates.map(data_model)
+    surrogate.fit(experiments=experiments.iloc[:10])
+    assert surrogate.model.get_booster().num_boosted_rounds() == 5
+    surrogate.fit(experiments=experiments.iloc[:15])
+    assert surrogate._n_updates == 1
+    assert surrogate.model.get_booster().num_boosted_rounds() == 7
+    surrogate.fit(experiments=experiments)
+    assert surrogate._n_updates == 2
+    assert surrogate.model.get_booster().num_boosted_rounds() == 9
+    # the refit is due
+    surrogate.fit(experiments=experiments)
+    assert surrogate._n_updates == 0
+    assert surrogate.model.get_booster().num_boosted_rounds() == 5
+    # changed experiments lead to a refit
+    surrogate.fit(experiments=experiments.iloc[:15])
+    surrogate.fit(experiments=experiments.iloc[5:])
+    assert surrogate._n_updates == 0
+
+
+@pytest.mark.skipif(not XGB_AVAILABLE, reason="requires xgboost")
+def test_XGBoostSurrogate_loads_json(tmp_path):
+    benchmark = Himmelblau()
+    experiments = benchmark.f(benchmark.domain.inputs.sample(10), return_complete=True)
+    data_model = XGBoostSurrogate(
+        inputs=benchmark.domain.inputs, outputs=benchmark.domain.outputs, n_estimators=2
+    )
+    surrogate = surrogates.map(data_model)
+    surrogate.fit(experiments=experiments)
+    fname = tmp_path / "model.json"
+    surrogate.model.save_model(fname)
+    surrogate2 = surrogates.map(data_model)
+    surrogate2.loads(fname.read_text())
+    assert_frame_equal(surrogate.predict(experiments), surrogate2.predict(experiments))
@@ -0,0 +1,61 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from bofire.utils.chunking import iter_chunks
+from bofire.utils.memmap import MemmapExperiments
+
+
+@pytest.fixture
+def experiments() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "x": np.linspace(0, 1, 7),
+            "n": np.arange(7),
+            "cat": ["a", "b", None, "a", "c", "b", "a"],
+            "valid_y": [True] * 6 + [False],
+            "time": pd.date_range("2023-01-01", periods=7),
+        }
+    )
+
+
+def test_memmap_experiments_roundtrip(tmp_path, experiments):
+    stored = MemmapExperiments.write(experiments, tmp_path / "experiments")
+    assert len(stored) == 7
+    assert stored.columns == list(experiments.columns)
+    df = MemmapExperiments(tmp_path / "experiments").to_frame()
+    assert_frame_equal(df, experiments.fillna(np.nan))
+    # numerical columns are views on the memory mapped files
+    assert not df["x"].to_numpy().flags.writeable
+    assert_frame_equal(
+        stored.to_frame(columns=["cat", "x"], rows=slice(2, 5)),
+        experiments[["cat", "x"]].iloc[2:5].fillna(np.nan),
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 10])
+def test_memmap_experiments_iter_chunks(tmp_path, experiments, chunk_size):
+    stored = MemmapExperiments.write(experiments, tmp_path)
+    chunks = list(iter_chunks(stored, chunk_size=chunk_size))
+    assert len(chunks) == int(np.ceil(7 / chunk_size))
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    assert_frame_equal(pd.concat(chunks), experiments.fillna(np.nan))
+    with pytest.raises(ValueError):
+        next(stored.iter_chunks(0))
+
+
+def test_memmap_experiments_pickle(tmp_path, experiments):
+    stored = MemmapExperiments.write(experiments, tmp_path)
+    stored.to_frame()
+    # only the path is pickled, not the mapped data
+    unpickled = pickle.loads(pickle.dumps(stored))
+    assert unpickled._arrays == {}
+    assert_frame_equal(unpickled.to_frame(), stored.to_frame())
+
+
+def test_memmap_experiments_invalid_values(tmp_path):
+    with pytest.raises(ValueError, match="cannot be stored"):
+        MemmapExperiments.write(pd.DataFrame({"a": [object(), object()]}), tmp_path)